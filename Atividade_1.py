@@ -1,9 +1,30 @@
 # atividade_1.py
 # Construcao e visualizacao de arvores de expressoes aritmeticas
 # Requisitos: pip install graphviz  + Graphviz instalado no sistema
+# Opcional: pip install numpy (avaliacao em lote da expressao compilada)
 
+import gc
 import random
-from graphviz import Digraph
+import re
+import sys
+import time
+from array import array
+
+# numpy e graphviz sao carregados sob demanda: importar o modulo para usar so
+# o parser e as arvores fica rapido
+np = None
+
+
+def _numpy(quem):
+    # numpy so e necessario para CompiledExpression.evaluate e seu benchmark
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError(f"{quem} requer numpy (pip install numpy)") from None
+        np = numpy
+    return np
 
 # Nodo da arvore
 class Node:
@@ -11,69 +32,617 @@ class Node:
         self.value = value
         self.left = left
         self.right = right
+        # usados apenas por IncrementalExpression
+        self.parent = None
+        self.cached = None
+        self.dirty = False
 
     def is_leaf(self):
         return self.left is None and self.right is None
 
-# Tokenizer: transforma string em lista de tokens (numeros, operadores, parenteses)
+# Tokenizer: transforma string em lista de tokens (numeros, variaveis, operadores, parenteses)
 def tokenize(s):
-    tokens = []
-    i = 0
-    while i < len(s):
-        c = s[i]
-        if c.isspace():
-            i += 1
+    return list(iter_tokens(s))
+
+# Um token por match; qualquer outro caracter cai no grupo "bad"
+_TOKEN_RE = re.compile(r"\s*(?:(\d+|[A-Za-z_]\w*)|([()+\-*/])|(\S))")
+
+# Tokenizer em streaming: aceita uma string ou um iteravel de pedacos
+# (ex.: um arquivo aberto) e gera os tokens sob demanda
+def iter_tokens(source):
+    if isinstance(source, str):
+        source = (source,)
+    pending = ''
+    for chunk in source:
+        buf = pending + chunk
+        pending = ''
+        for m in _TOKEN_RE.finditer(buf):
+            word, sym, bad = m.groups()
+            if bad is not None:
+                raise ValueError(f"Caracter invalido no input: '{bad}'")
+            if word is not None:
+                if m.end() == len(buf):
+                    # numero/nome pode continuar no proximo pedaco
+                    pending = word
+                    break
+                yield word
+            elif sym is not None:
+                yield sym
+    if pending:
+        yield pending
+
+# Precedencia dos operadores binarios (todos associativos a esquerda)
+_PRECEDENCE = {'+': 1, '-': 1, '*': 2, '/': 2}
+
+# Parser iterativo (shunting-yard): aceita expressoes com ou sem parenteses,
+# respeitando a precedencia. Usa pilhas explicitas, sem recursao.
+def parse_tokens(tokens):
+    operands = []   # nodos ja construidos
+    operators = []  # operadores e '(' pendentes
+    expect_operand = True
+
+    def reduce():
+        op = operators.pop()
+        right = operands.pop()
+        left = operands.pop()
+        operands.append(Node(op, left, right))
+
+    for token in tokens:
+        if expect_operand:
+            if token == '(':
+                operators.append(token)
+            elif token[0].isalpha() or token[0] == '_':
+                operands.append(Node(token))
+                expect_operand = False
+            else:
+                try:
+                    val = int(token)
+                except ValueError:
+                    raise ValueError(f"Token inesperado ao ler numero: {token}")
+                operands.append(Node(val))
+                expect_operand = False
+        elif token == ')':
+            while operators and operators[-1] != '(':
+                reduce()
+            if not operators:
+                raise ValueError("Parentese ')' sem '(' correspondente")
+            operators.pop()
+        elif token in _PRECEDENCE:
+            prec = _PRECEDENCE[token]
+            while operators and operators[-1] != '(' and _PRECEDENCE[operators[-1]] >= prec:
+                reduce()
+            operators.append(token)
+            expect_operand = True
+        else:
+            raise ValueError(f"Operador invalido: {token}")
+
+    if expect_operand:
+        raise ValueError("Expressao incompleta: operando esperado")
+    while operators:
+        if operators[-1] == '(':
+            raise ValueError("Expressao incompleta: falta ')'")
+        reduce()
+    return operands[0]
+
+# Avaliacao recursiva ingenua (uma linha por vez; referencia para o benchmark)
+def evaluate_tree(node, variables=None):
+    if node.is_leaf():
+        if isinstance(node.value, str):
+            return variables[node.value]
+        return node.value
+    a = evaluate_tree(node.left, variables)
+    b = evaluate_tree(node.right, variables)
+    return _apply_op(node.value, a, b)
+
+# Hash-consing: subexpressoes estruturalmente iguais passam a compartilhar
+# um unico nodo, transformando a arvore em um DAG. `table` pode ser reutilizada
+# entre varias arvores para compartilhar subexpressoes entre elas.
+def intern_tree(root: Node, table=None):
+    if table is None:
+        table = {}
+    interned = {}  # id(nodo original) -> nodo compartilhado
+    stack = [(root, False)]
+    while stack:
+        node, visited = stack.pop()
+        if id(node) in interned:
             continue
-        if c in '()+-*/':
-            tokens.append(c)
-            i += 1
-        elif c.isdigit():
-            j = i
-            while j < len(s) and s[j].isdigit():
-                j += 1
-            tokens.append(s[i:j])
-            i = j
+        if node.is_leaf():
+            key = (type(node.value), node.value)
+        elif visited:
+            key = (node.value, id(interned[id(node.left)]), id(interned[id(node.right)]))
         else:
-            # aceitar sinal negativo apenas como parte do numero se necessario
-            raise ValueError(f"Caracter invalido no input: '{c}'")
-    return tokens
+            stack.append((node, True))
+            stack.append((node.right, False))
+            stack.append((node.left, False))
+            continue
+        shared = table.get(key)
+        if shared is None:
+            if node.is_leaf():
+                shared = Node(node.value)
+            else:
+                shared = Node(node.value, interned[id(node.left)], interned[id(node.right)])
+            table[key] = shared
+        interned[id(node)] = shared
+    return interned[id(root)]
 
-# Parser recursivo (assume expressao totalmente parentizada)
-def parse_tokens(tokens):
-    # parse retorna (node, proximo_indice)
-    def parse_expr(i):
-        if tokens[i] == '(':
-            i += 1
-            left_node, i = parse_expr(i)
-            if i >= len(tokens):
-                raise ValueError("Expressao incompleta: operador esperado")
-            op = tokens[i]
-            if op not in '+-*/':
-                raise ValueError(f"Operador invalido: {op}")
-            i += 1
-            right_node, i = parse_expr(i)
-            if i >= len(tokens) or tokens[i] != ')':
-                raise ValueError("Expressao incompleta: falta ')'")
-            node = Node(op, left_node, right_node)
-            return node, i + 1
+# Marcador de subexpressao ainda nao avaliada
+_PENDING = object()
+
+# Avaliacao memoizada: cada nodo distinto do DAG e calculado uma unica vez.
+# Funciona com escalares e com colunas numpy como valores das variaveis.
+def evaluate_dag(root: Node, variables=None, memo=None):
+    if memo is None:
+        memo = {}
+    stack = [root]
+    while stack:
+        node = stack[-1]
+        if id(node) in memo:
+            stack.pop()
+            continue
+        if node.is_leaf():
+            memo[id(node)] = variables[node.value] if isinstance(node.value, str) else node.value
+            stack.pop()
+            continue
+        left = memo.get(id(node.left), _PENDING)
+        right = memo.get(id(node.right), _PENDING)
+        if left is _PENDING or right is _PENDING:
+            if right is _PENDING:
+                stack.append(node.right)
+            if left is _PENDING:
+                stack.append(node.left)
+            continue
+        stack.pop()
+        memo[id(node)] = _apply_op(node.value, left, right)
+    return memo[id(root)]
+
+# Nodos alcancaveis a partir da raiz (cada nodo compartilhado conta uma vez)
+def _unique_nodes(root: Node):
+    seen = {}
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen[id(node)] = node
+        if node.left:
+            stack.append(node.left)
+        if node.right:
+            stack.append(node.right)
+    return list(seen.values())
+
+# Compara a arvore original com o DAG: quantidade de nodos e memoria
+def dag_stats(tree_root: Node, dag_root: Node):
+    def footprint(nodes):
+        return sum(sys.getsizeof(n) + sys.getsizeof(n.__dict__) for n in nodes)
+    tree_nodes = _unique_nodes(tree_root)
+    dag_nodes = _unique_nodes(dag_root)
+    tree_bytes = footprint(tree_nodes)
+    dag_bytes = footprint(dag_nodes)
+    return {
+        'tree_nodes': len(tree_nodes),
+        'dag_nodes': len(dag_nodes),
+        'tree_bytes': tree_bytes,
+        'dag_bytes': dag_bytes,
+        'bytes_saved': tree_bytes - dag_bytes,
+    }
+
+# Regra unica de divisao por zero para todos os avaliadores (evaluate_tree,
+# evaluate_dag, IncrementalExpression e CompiledExpression): x / 0 vale nan,
+# como uma celula de erro numa planilha, em vez de inf ou ZeroDivisionError,
+# e o nan se propaga ate a raiz sem interromper o calculo
+def _divide(a, b):
+    if getattr(a, 'ndim', 0) or getattr(b, 'ndim', 0):
+        # colunas numpy: divide so onde b != 0, o resto fica nan
+        _numpy("divisao de colunas")
+        nonzero = np.not_equal(b, 0)
+        out = np.full(np.broadcast(a, b).shape, np.nan)
+        return np.divide(a, b, out=out, where=nonzero)
+    if b == 0:
+        return float('nan')
+    return a / b
+
+# Aplica um operador binario (divisao segundo _divide)
+def _apply_op(op, a, b):
+    if op == '+':
+        return a + b
+    if op == '-':
+        return a - b
+    if op == '*':
+        return a * b
+    return _divide(a, b)
+
+class IncrementalExpression:
+    """
+    Arvore de expressao usada como formula de planilha: cada nodo guarda o
+    valor da sua subarvore (`cached`) e um link para o pai. Alterar uma folha
+    recalcula apenas o caminho ate a raiz, O(profundidade) em vez de O(n).
+    A arvore nao pode ter nodos compartilhados (use a arvore, nao o DAG).
+    """
+    def __init__(self, root: Node, variables=None):
+        self.root = root
+        self.variables = dict(variables or {})
+        self.var_leaves = {}   # nome da variavel -> folhas que a referenciam
+        self.recomputed = 0    # nodos internos recalculados (para medicao)
+        self._attach()
+
+    def _attach(self):
+        # liga os pais e calcula todos os valores (pos-ordem iterativa)
+        self.root.parent = None
+        seen = set()
+        stack = [(self.root, False)]
+        while stack:
+            node, visited = stack.pop()
+            node.dirty = False
+            if node.is_leaf():
+                if id(node) in seen:
+                    raise ValueError("Nodo compartilhado: IncrementalExpression exige uma arvore")
+                seen.add(id(node))
+                if isinstance(node.value, str):
+                    if node.value not in self.variables:
+                        raise ValueError(f"Variavel sem valor: {node.value}")
+                    self.var_leaves.setdefault(node.value, []).append(node)
+                    node.cached = self.variables[node.value]
+                else:
+                    node.cached = node.value
+            elif visited:
+                node.cached = _apply_op(node.value, node.left.cached, node.right.cached)
+            else:
+                if id(node) in seen:
+                    raise ValueError("Nodo compartilhado: IncrementalExpression exige uma arvore")
+                seen.add(id(node))
+                node.left.parent = node
+                node.right.parent = node
+                stack.append((node, True))
+                stack.append((node.right, False))
+                stack.append((node.left, False))
+
+    @property
+    def value(self):
+        return self.root.cached
+
+    # Altera o valor de uma folha (a folha passa a ser uma constante)
+    def set_leaf(self, leaf: Node, value):
+        if not leaf.is_leaf():
+            raise ValueError("set_leaf espera uma folha")
+        self._detach_variable(leaf)
+        leaf.value = value
+        leaf.cached = value
+        self._propagate(leaf.parent)
+        return self.root.cached
+
+    # Altera uma variavel e todas as folhas que a referenciam
+    def set_variable(self, name, value):
+        return self.update_many([(name, value)])
+
+    # Aplica varias alteracoes (folha ou nome de variavel, novo valor) com uma
+    # unica passada de propagacao: cada ancestral afetado e recalculado uma vez
+    def update_many(self, edits):
+        touched = []
+        for target, value in edits:
+            if isinstance(target, Node):
+                if not target.is_leaf():
+                    raise ValueError("update_many espera folhas ou nomes de variaveis")
+                self._detach_variable(target)
+                target.value = value
+                target.cached = value
+                touched.append(target)
+            else:
+                if target not in self.var_leaves:
+                    raise ValueError(f"Variavel inexistente na expressao: {target}")
+                self.variables[target] = value
+                for leaf in self.var_leaves[target]:
+                    leaf.cached = value
+                    touched.append(leaf)
+        # marca os ancestrais; para ao encontrar um caminho ja marcado
+        for leaf in touched:
+            node = leaf.parent
+            while node is not None and not node.dirty:
+                node.dirty = True
+                node = node.parent
+        # recalcula em pos-ordem descendo apenas por nodos marcados
+        if self.root.dirty:
+            stack = [(self.root, False)]
+            while stack:
+                node, visited = stack.pop()
+                if visited:
+                    node.cached = _apply_op(node.value, node.left.cached, node.right.cached)
+                    node.dirty = False
+                    self.recomputed += 1
+                    continue
+                stack.append((node, True))
+                if node.right.dirty:
+                    stack.append((node.right, False))
+                if node.left.dirty:
+                    stack.append((node.left, False))
+        return self.root.cached
+
+    def _detach_variable(self, leaf):
+        if isinstance(leaf.value, str) and leaf.value in self.var_leaves:
+            leaves = self.var_leaves[leaf.value]
+            leaves.remove(leaf)
+            if not leaves:
+                del self.var_leaves[leaf.value]
+
+    def _propagate(self, node):
+        # sobe recalculando; para cedo se o valor de um nodo nao mudou
+        while node is not None:
+            new = _apply_op(node.value, node.left.cached, node.right.cached)
+            self.recomputed += 1
+            if new == node.cached and type(new) is type(node.cached):
+                break
+            node.cached = new
+            node = node.parent
+
+# Codigos de operacao do bytecode pos-fixo
+OP_CONST = 0  # empilha consts[arg]
+OP_VAR = 1    # empilha a coluna names[arg]
+OP_ADD = 2
+OP_SUB = 3
+OP_MUL = 4
+OP_DIV = 5
+
+_BINARY_OPCODES = {'+': OP_ADD, '-': OP_SUB, '*': OP_MUL, '/': OP_DIV}
+
+class CompiledExpression:
+    """
+    Expressao compilada para um vetor plano de instrucoes em notacao pos-fixa.
+    `code` intercala pares (opcode, argumento); `consts` e `names` guardam os
+    operandos referenciados por OP_CONST e OP_VAR.
+    """
+    def __init__(self, code, consts, names):
+        self.code = code
+        self.consts = consts
+        self.names = names
+
+    def __len__(self):
+        return len(self.code) // 2
+
+    def evaluate(self, variables=None, batch_size=65536):
+        """
+        Avalia a expressao sobre colunas numpy (uma linha por posicao).
+        As linhas sao processadas em blocos de `batch_size` para que os
+        temporarios caibam no cache; cada instrucao opera sobre o bloco inteiro.
+        """
+        _numpy("CompiledExpression.evaluate")
+        variables = variables or {}
+        columns = []
+        for name in self.names:
+            if name not in variables:
+                raise ValueError(f"Variavel sem valor: {name}")
+            columns.append(np.asarray(variables[name], dtype=np.float64))
+        if not columns:
+            # so constantes: o resultado e um escalar
+            return float(self._run([], 0, 1)[0])
+        n = len(columns[0])
+        for col in columns:
+            if len(col) != n:
+                raise ValueError("Todas as colunas devem ter o mesmo tamanho")
+        if batch_size is None or batch_size >= n:
+            return self._run(columns, 0, n)
+        out = np.empty(n, dtype=np.float64)
+        for start in range(0, n, batch_size):
+            stop = min(start + batch_size, n)
+            out[start:stop] = self._run(columns, start, stop)
+        return out
+
+    def _run(self, columns, start, stop):
+        code = self.code
+        consts = self.consts
+        size = stop - start
+        # cada entrada da pilha: (valor, proprio) -- "proprio" indica um
+        # temporario que pode ser sobrescrito in-place sem copiar
+        stack = []
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for pc in range(0, len(code), 2):
+                op = code[pc]
+                arg = code[pc + 1]
+                if op == OP_CONST:
+                    stack.append((consts[arg], False))
+                    continue
+                if op == OP_VAR:
+                    stack.append((columns[arg][start:stop], False))
+                    continue
+                b, _ = stack.pop()
+                a, own_a = stack.pop()
+                if own_a:
+                    out = a
+                else:
+                    out = np.empty(size, dtype=np.float64)
+                if op == OP_ADD:
+                    np.add(a, b, out=out)
+                elif op == OP_SUB:
+                    np.subtract(a, b, out=out)
+                elif op == OP_MUL:
+                    np.multiply(a, b, out=out)
+                else:
+                    # x / 0 -> nan, como em _divide
+                    nonzero = np.not_equal(b, 0)
+                    np.true_divide(a, b, out=out, where=nonzero)
+                    np.copyto(out, np.nan, where=~nonzero)
+                stack.append((out, True))
+        result, own = stack.pop()
+        if not own:
+            result = np.broadcast_to(np.asarray(result, dtype=np.float64), (size,)).copy()
+        return result
+
+# Compila a arvore para bytecode pos-fixo (percurso pos-ordem iterativo)
+def compile_tree(root: Node):
+    code = array('i')
+    consts = []
+    names = []
+    const_index = {}
+    name_index = {}
+    stack = [(root, False)]
+    while stack:
+        node, visited = stack.pop()
+        if node.is_leaf():
+            if isinstance(node.value, str):
+                if node.value not in name_index:
+                    name_index[node.value] = len(names)
+                    names.append(node.value)
+                code.append(OP_VAR)
+                code.append(name_index[node.value])
+            else:
+                if node.value not in const_index:
+                    const_index[node.value] = len(consts)
+                    consts.append(node.value)
+                code.append(OP_CONST)
+                code.append(const_index[node.value])
+        elif visited:
+            code.append(_BINARY_OPCODES[node.value])
+            code.append(0)
         else:
-            # deve ser numero
-            token = tokens[i]
-            # converte para inteiro
-            try:
-                val = int(token)
-            except:
-                raise ValueError(f"Token inesperado ao ler numero: {token}")
-            node = Node(val)
-            return node, i + 1
-
-    node, next_i = parse_expr(0)
-    if next_i != len(tokens):
-        raise ValueError("Sobra de tokens apos o parse")
-    return node
+            stack.append((node, True))
+            stack.append((node.right, False))
+            stack.append((node.left, False))
+    return CompiledExpression(code, consts, names)
+
+# Benchmark: avaliacao recursiva linha a linha x bytecode vetorizado
+def benchmark_compiled(num_rows=200000, num_operands=32, seed=0):
+    _numpy("benchmark_compiled")
+    random.seed(seed)
+    expr = generate_random_expression(num_operands=num_operands)
+    # troca metade dos numeros por variaveis
+    tokens = tokenize(expr)
+    var_names = []
+    for i, tok in enumerate(tokens):
+        if tok.isdigit() and random.random() < 0.5:
+            tokens[i] = f"x{len(var_names)}"
+            var_names.append(tokens[i])
+    root = parse_tokens(tokens)
+
+    rng = np.random.default_rng(seed)
+    columns = {name: rng.uniform(1.0, 100.0, num_rows) for name in var_names}
+
+    t0 = time.perf_counter()
+    compiled = compile_tree(root)
+    t_compile = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    fast = compiled.evaluate(columns)
+    t_fast = time.perf_counter() - t0
+
+    naive_rows = min(num_rows, 20000)
+    python_columns = {name: col[:naive_rows].tolist() for name, col in columns.items()}
+    t0 = time.perf_counter()
+    slow = []
+    for r in range(naive_rows):
+        row = {name: col[r] for name, col in python_columns.items()}
+        slow.append(evaluate_tree(root, row))
+    t_slow = (time.perf_counter() - t0) * num_rows / naive_rows
+
+    ok = np.allclose(fast[:naive_rows], slow, equal_nan=True)
+    print(f"Operandos: {num_operands}  variaveis: {len(var_names)}  linhas: {num_rows}")
+    print(f"Instrucoes: {len(compiled)}  compilacao: {t_compile * 1e3:.3f} ms")
+    print(f"Recursiva (estimado p/ {num_rows} linhas): {t_slow:.3f} s")
+    print(f"Bytecode + numpy: {t_fast:.4f} s  ({t_slow / t_fast:.1f}x)")
+    print("Resultados iguais:", ok)
+
+    # divisao por zero: nan nas mesmas linhas em todos os avaliadores
+    zero_root = parse_tokens(tokenize("( ( x0 / ( x1 - 2 ) ) + ( 1 / x0 ) )"))
+    xs = np.array([1.0, 4.0, 0.0, 6.0])
+    ys = np.array([2.0, 3.0, 5.0, 2.0])
+    esperado = [float('nan'), 4.25, float('nan'), float('nan')]
+    resultados = [
+        compile_tree(zero_root).evaluate({'x0': xs, 'x1': ys}),
+        evaluate_dag(intern_tree(zero_root), {'x0': xs, 'x1': ys}),
+        [evaluate_tree(zero_root, {'x0': a, 'x1': b}) for a, b in zip(xs.tolist(), ys.tolist())],
+        [IncrementalExpression(zero_root, {'x0': a, 'x1': b}).value
+         for a, b in zip(xs.tolist(), ys.tolist())],
+    ]
+    print("Divisao por zero (nan em todos):",
+          all(np.array_equal(np.asarray(r, dtype=np.float64), esperado, equal_nan=True)
+              for r in resultados))
+
+# Benchmark: arvore x DAG com eliminacao de subexpressoes comuns
+def benchmark_dag(num_operands=20000, max_val=5, seed=0):
+    random.seed(seed)
+    # sem divisao: com operandos pequenos a divisao por zero seria frequente
+    text = generate_random_expression(num_operands, 1, max_val).replace('/', '-')
+    root = parse_tokens(tokenize(text))
+    for node in _unique_nodes(root):
+        if node.is_leaf():
+            node.value = float(node.value)  # evita inteiros gigantes
+    t0 = time.perf_counter()
+    dag = intern_tree(root)
+    t_intern = time.perf_counter() - t0
+    stats = dag_stats(root, dag)
+    t0 = time.perf_counter()
+    v_tree = evaluate_dag(root)
+    t_tree = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    v_dag = evaluate_dag(dag)
+    t_dag = time.perf_counter() - t0
+    print(f"Nodos: arvore {stats['tree_nodes']}  DAG {stats['dag_nodes']}"
+          f"  ({100 * (1 - stats['dag_nodes'] / stats['tree_nodes']):.1f}% a menos)")
+    print(f"Memoria: arvore {stats['tree_bytes']} B  DAG {stats['dag_bytes']} B"
+          f"  economia {stats['bytes_saved']} B")
+    print(f"Interning {t_intern * 1e3:.1f} ms  avaliacao arvore {t_tree * 1e3:.1f} ms"
+          f"  DAG {t_dag * 1e3:.1f} ms  iguais: {repr(v_tree) == repr(v_dag)}")
+
+# Benchmark: recalculo completo x atualizacao incremental de uma folha
+def benchmark_incremental(num_operands=2**17, num_updates=2000, batch=500, seed=0):
+    rng = random.Random(seed)
+    leaves = []
+    root = generate_random_tree(num_operands, shape='balanced', rng=rng)
+    for node in _unique_nodes(root):
+        if node.is_leaf():
+            node.value = float(node.value)
+            leaves.append(node)
+    t0 = time.perf_counter()
+    expr = IncrementalExpression(root)
+    t_full = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in range(num_updates):
+        expr.set_leaf(rng.choice(leaves), rng.uniform(1, 99))
+    t_single = (time.perf_counter() - t0) / num_updates
+    expr.recomputed = 0
+    t0 = time.perf_counter()
+    expr.update_many((rng.choice(leaves), rng.uniform(1, 99)) for _ in range(batch))
+    t_batch = time.perf_counter() - t0
+    check = IncrementalExpression(root).value
+    print(f"Operandos: {num_operands}  recalculo completo {t_full * 1e3:.1f} ms")
+    print(f"set_leaf: {t_single * 1e6:.1f} us por alteracao ({t_full / t_single:.0f}x)")
+    print(f"update_many({batch}): {t_batch * 1e3:.2f} ms, {expr.recomputed} nodos recalculados")
+    print("Valor consistente:", repr(check) == repr(expr.value))
+
+# Gera texto de expressao com num_operands operandos sem concatenacao quadratica:
+# "flat" usa precedencia, "nested" aninha parenteses a esquerda (profundidade n)
+def _benchmark_expression_text(num_operands, shape):
+    ops = '+-*/'
+    if shape == 'flat':
+        parts = ['1']
+        for i in range(1, num_operands):
+            parts.append(ops[i % 4])
+            parts.append(str(i % 97 + 1))
+        return ' '.join(parts)
+    parts = ['( ' * (num_operands - 1), '1']
+    for i in range(1, num_operands):
+        parts.append(f" {ops[i % 4]} {i % 97 + 1} )")
+    return ''.join(parts)
+
+# Benchmark: vazao do tokenizer e do parser em expressoes grandes
+def benchmark_parser(sizes=(10**4, 10**5, 10**6)):
+    for shape in ('flat', 'nested'):
+        for n in sizes:
+            text = _benchmark_expression_text(n, shape)
+            t0 = time.perf_counter()
+            tokens = tokenize(text)
+            t_tok = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            parse_tokens(tokens)
+            t_parse = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            parse_tokens(iter_tokens(iter(text[i:i + 65536] for i in range(0, len(text), 65536))))
+            t_stream = time.perf_counter() - t0
+            k = len(tokens)
+            print(f"{shape:6s} tokens={k:>8d}  tokenize {k / t_tok / 1e6:6.2f} Mtok/s"
+                  f"  parse {k / t_parse / 1e6:6.2f} Mtok/s"
+                  f"  streaming {k / t_stream / 1e6:6.2f} Mtok/s")
 
 # Visualizacao usando graphviz
 def visualize_tree(root: Node, filename: str):
+    from graphviz import Digraph
     dot = Digraph(format='png')
     counter = {'i': 0}
 
@@ -97,24 +666,116 @@ def visualize_tree(root: Node, filename: str):
     output_path = dot.render(filename=filename, cleanup=True)
     print(f"Arvore salva em: {output_path}")
 
-# Gerador de expressao aleatoria totalmente parentizada
-def generate_random_expression(num_operands=3, min_val=1, max_val=99):
+# Formatos de arvore aceitos pelo gerador
+TREE_SHAPES = ('random', 'balanced', 'left', 'right')
+
+# Gerador de arvore aleatoria em O(n), construida direto como Node (sem texto).
+# shape: 'random' (forma aleatoria), 'balanced', 'left' (left-deep) ou 'right'.
+# rng: instancia de random.Random; se omitido usa `seed` ou o modulo random.
+def generate_random_tree(num_operands=3, min_val=1, max_val=99, shape='random',
+                         rng=None, seed=None):
     if num_operands < 2:
         raise ValueError("num_operands deve ser >= 2")
-    ops = ['+', '-', '*', '/']
-    operands = [str(random.randint(min_val, max_val)) for _ in range(num_operands)]
-    # combinar aleatoriamente pares adjacentes ate sobrar 1 token
-    while len(operands) > 1:
-        i = random.randrange(len(operands) - 1)  # escolhe um par adjacente
-        left = operands[i]
-        right = operands[i+1]
-        op = random.choice(ops)
-        new = f"( {left} {op} {right} )"
-        operands[i:i+2] = [new]
-    return operands[0]
+    if shape not in TREE_SHAPES:
+        raise ValueError(f"Formato invalido: {shape} (use um de {TREE_SHAPES})")
+    if rng is None:
+        rng = random.Random(seed) if seed is not None else random
+    ops = ('+', '-', '*', '/')
+    randint = rng.randint
+    choice = rng.choice
+
+    if shape == 'left':
+        node = Node(randint(min_val, max_val))
+        for _ in range(num_operands - 1):
+            node = Node(choice(ops), node, Node(randint(min_val, max_val)))
+        return node
+    if shape == 'right':
+        node = Node(randint(min_val, max_val))
+        for _ in range(num_operands - 1):
+            node = Node(choice(ops), Node(randint(min_val, max_val)), node)
+        return node
+    if shape == 'balanced':
+        # junta pares adjacentes nivel a nivel: n + n/2 + n/4 + ... = O(n)
+        level = [Node(randint(min_val, max_val)) for _ in range(num_operands)]
+        while len(level) > 1:
+            nxt = [Node(choice(ops), level[i], level[i + 1])
+                   for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                nxt.append(level[-1])
+            level = nxt
+        return level[0]
+
+    # 'random': gera uma sequencia pos-fixa valida, decidindo a cada passo
+    # entre empilhar um operando ou combinar os dois do topo
+    stack = []
+    remaining = num_operands
+    rand = rng.random
+    while remaining or len(stack) > 1:
+        if remaining and (len(stack) < 2 or rand() < 0.5):
+            stack.append(Node(randint(min_val, max_val)))
+            remaining -= 1
+        else:
+            right = stack.pop()
+            left = stack.pop()
+            stack.append(Node(choice(ops), left, right))
+    return stack[0]
+
+# Gera `count` arvores sob demanda (count=None gera indefinidamente).
+# Com `seed` a sequencia inteira e reproduzivel.
+def iter_random_trees(count=None, num_operands=3, min_val=1, max_val=99,
+                      shape='random', seed=None):
+    rng = random.Random(seed)
+    produced = 0
+    while count is None or produced < count:
+        yield generate_random_tree(num_operands, min_val, max_val, shape, rng=rng)
+        produced += 1
+
+# Converte a arvore para texto totalmente parentizado (iterativo, O(n))
+def tree_to_expression(root: Node):
+    parts = []
+    stack = [root]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            parts.append(item)
+        elif item.is_leaf():
+            parts.append(str(item.value))
+        else:
+            stack.append(' )')
+            stack.append(item.right)
+            stack.append(f" {item.value} ")
+            stack.append(item.left)
+            stack.append('( ')
+    return ''.join(parts)
+
+# Gerador de expressao aleatoria totalmente parentizada
+def generate_random_expression(num_operands=3, min_val=1, max_val=99, shape='random', seed=None):
+    return tree_to_expression(generate_random_tree(num_operands, min_val, max_val, shape, seed=seed))
+
+# Benchmark: geracao direta de arvores em cada formato
+def benchmark_generator(sizes=(10**4, 10**5, 10**6), seed=0):
+    for shape in TREE_SHAPES:
+        for n in sizes:
+            root = None  # libera a arvore anterior fora da medicao
+            gc.collect()
+            t0 = time.perf_counter()
+            root = generate_random_tree(n, shape=shape, seed=seed)
+            t_tree = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            tree_to_expression(root)
+            t_text = time.perf_counter() - t0
+            print(f"{shape:8s} operandos={n:>8d}  arvore {n / t_tree / 1e6:5.2f} Mop/s"
+                  f"  texto {n / t_text / 1e6:5.2f} Mop/s")
 
 # Exemplo de uso: arvore fixa e arvore aleatoria
-if __name__ == "__main__":
+# (python atividade_1.py --bench executa os benchmarks)
+if __name__ == "__main__" and "--bench" in sys.argv:
+    benchmark_compiled()
+    benchmark_parser()
+    benchmark_dag()
+    benchmark_generator()
+    benchmark_incremental()
+elif __name__ == "__main__":
     # EXPRESSAO FIXA (interpretacao: multiplicacao entre os dois primeiros grupos)
     fixed_expr = "( ( ( 7 + 3 ) * ( 5 - 2 ) ) / ( 10 * 20 ) )"
     print("Expressao fixa (entrada):", fixed_expr)
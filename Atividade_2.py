@@ -3,7 +3,8 @@
 # Requisitos: pip install graphviz + Graphviz instalado no Windows
 
 import random
-from graphviz import Digraph
+import sys
+import time
 
 # Nodo da BST
 class Node:
@@ -11,126 +12,283 @@ class Node:
         self.value = value
         self.left = None
         self.right = None
+        self.size = 1    # nodos na subarvore (estatisticas de ordem)
+        self.height = 0  # altura da subarvore (folha = 0)
+
+# Variante com __slots__: sem __dict__ por nodo, bem menos memoria
+class SlotNode:
+    __slots__ = ("value", "left", "right", "size", "height")
+
+    def __init__(self, value):
+        self.value = value
+        self.left = None
+        self.right = None
+        self.size = 1
+        self.height = 0
+
+# Tamanho e altura de uma subarvore possivelmente vazia
+def _size(node):
+    return node.size if node is not None else 0
+
+def _subtree_height(node):
+    return node.height if node is not None else -1
+
+# Recalcula size/height de um nodo a partir dos filhos
+def _update(node):
+    node.size = 1 + _size(node.left) + _size(node.right)
+    hl = _subtree_height(node.left)
+    hr = _subtree_height(node.right)
+    node.height = 1 + (hl if hl > hr else hr)
 
 # Classe Binary Search Tree
 class BinarySearchTree:
+    # classe usada para criar nodos (ex.: SlotNode para economizar memoria)
+    node_class = Node
+
     def __init__(self):
         self.root = None
 
-    # Insercao
+    # Constroi uma arvore perfeitamente balanceada a partir de valores ja
+    # ordenados em O(n) (duplicados consecutivos sao descartados)
+    @classmethod
+    def from_sorted(cls, values):
+        tree = cls()
+        vals = []
+        for v in values:
+            if vals and not vals[-1] < v:
+                if v == vals[-1]:
+                    continue
+                raise ValueError("from_sorted espera valores em ordem crescente")
+            vals.append(v)
+        if not vals:
+            return tree
+        # pilha explicita de (inicio, fim, pai, lado); meio de cada faixa vira raiz
+        mid = (len(vals) - 1) // 2
+        tree.root = cls.node_class(vals[mid])
+        tree.root.size = len(vals)
+        tree.root.height = len(vals).bit_length() - 1
+        stack = [(0, mid - 1, tree.root, 'left'), (mid + 1, len(vals) - 1, tree.root, 'right')]
+        while stack:
+            lo, hi, parent, side = stack.pop()
+            if lo > hi:
+                continue
+            mid = (lo + hi) // 2
+            node = cls.node_class(vals[mid])
+            # faixa com n valores dividida ao meio: altura = floor(log2 n)
+            node.size = hi - lo + 1
+            node.height = node.size.bit_length() - 1
+            if side == 'left':
+                parent.left = node
+            else:
+                parent.right = node
+            stack.append((lo, mid - 1, node, 'left'))
+            stack.append((mid + 1, hi, node, 'right'))
+        return tree
+
+    # Igual a from_sorted, mas aceita valores em qualquer ordem (ordena antes)
+    @classmethod
+    def bulk_load(cls, values):
+        return cls.from_sorted(sorted(values))
+
+    # Insercao (iterativa: nao estoura a pilha em arvores degeneradas)
     def insert(self, value):
         if self.root is None:
-            self.root = Node(value)
+            self.root = self.node_class(value)
         else:
             self._insert(self.root, value)
 
     def _insert(self, node, value):
-        if value < node.value:
-            if node.left is None:
-                node.left = Node(value)
-            else:
-                self._insert(node.left, value)
-        elif value > node.value:
-            if node.right is None:
-                node.right = Node(value)
+        path = []
+        while True:
+            path.append(node)
+            node.size += 1
+            if value < node.value:
+                if node.left is None:
+                    node.left = self.node_class(value)
+                    break
+                node = node.left
+            elif value > node.value:
+                if node.right is None:
+                    node.right = self.node_class(value)
+                    break
+                node = node.right
             else:
-                self._insert(node.right, value)
-        # se valor igual, nao insere (evita duplicados)
+                # se valor igual, nao insere (evita duplicados)
+                for anc in path:
+                    anc.size -= 1
+                return
+        # sobe atualizando alturas; para quando uma altura nao muda
+        altura = 0
+        for node in reversed(path):
+            if node.height > altura:
+                break
+            node.height = altura + 1
+            altura += 1
 
     # Busca
     def search(self, value):
         return self._search(self.root, value)
 
     def _search(self, node, value):
-        if node is None:
-            return None
-        if node.value == value:
-            return node
-        elif value < node.value:
-            return self._search(node.left, value)
-        else:
-            return self._search(node.right, value)
+        while node is not None:
+            if node.value == value:
+                return node
+            elif value < node.value:
+                node = node.left
+            else:
+                node = node.right
+        return None
 
     # Remocao
     def delete(self, value):
         self.root = self._delete(self.root, value)
 
     def _delete(self, node, value):
+        # localiza o nodo e o pai; retorna a (nova) raiz da subarvore
+        root = node
+        path = []  # ancestrais do nodo removido fisicamente
+        while node is not None and node.value != value:
+            path.append(node)
+            node = node.left if value < node.value else node.right
         if node is None:
-            return None
-        if value < node.value:
-            node.left = self._delete(node.left, value)
-        elif value > node.value:
-            node.right = self._delete(node.right, value)
+            return root
+        # Caso 3: dois filhos -> copia o sucessor e remove o sucessor
+        if node.left is not None and node.right is not None:
+            path.append(node)
+            sucessor = node.right
+            while sucessor.left is not None:
+                path.append(sucessor)
+                sucessor = sucessor.left
+            node.value = sucessor.value
+            node = sucessor
+        # Casos 1 e 2: sem filhos ou um filho
+        child = node.left if node.left is not None else node.right
+        if not path:
+            return child
+        parent = path[-1]
+        if parent.left is node:
+            parent.left = child
         else:
-            # Caso 1: sem filhos
-            if node.left is None and node.right is None:
-                return None
-            # Caso 2: um filho
-            elif node.left is None:
-                return node.right
-            elif node.right is None:
-                return node.left
-            # Caso 3: dois filhos
-            else:
-                sucessor = self._min_value_node(node.right)
-                node.value = sucessor.value
-                node.right = self._delete(node.right, sucessor.value)
-        return node
-
-    def _min_value_node(self, node):
-        atual = node
-        while atual.left is not None:
-            atual = atual.left
-        return atual
-
-    # Altura da arvore
+            parent.right = child
+        for anc in reversed(path):
+            _update(anc)
+        return root
+
+    # Altura da arvore (O(1): mantida em cada nodo)
     def height(self):
         return self._height(self.root)
 
     def _height(self, node):
-        if node is None:
-            return -1  # altura de arvore vazia
-        return 1 + max(self._height(node.left), self._height(node.right))
+        return _subtree_height(node)
+
+    # Quantidade de valores (O(1))
+    def __len__(self):
+        return _size(self.root)
+
+    # k-esimo menor valor (k a partir de 0), O(h)
+    def select(self, k):
+        if not 0 <= k < _size(self.root):
+            raise IndexError("select: k fora do intervalo")
+        node = self.root
+        while True:
+            esq = _size(node.left)
+            if k < esq:
+                node = node.left
+            elif k == esq:
+                return node.value
+            else:
+                k -= esq + 1
+                node = node.right
+
+    # Quantidade de valores menores que `value`, O(h)
+    def rank(self, value):
+        node = self.root
+        menores = 0
+        while node is not None:
+            if value <= node.value:
+                node = node.left
+            else:
+                menores += _size(node.left) + 1
+                node = node.right
+        return menores
+
+    # Snapshot imutavel em layout de Eytzinger para consultas em lote
+    # (requer numpy; ver arvore_congelada.FrozenTree)
+    def freeze(self):
+        from arvore_congelada import FrozenTree
+        keys = []
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            keys.append(node.value)
+            node = node.right
+        return FrozenTree(keys)
 
     # Profundidade de um valor
     def depth(self, value):
         return self._depth(self.root, value, 0)
 
     def _depth(self, node, value, nivel):
-        if node is None:
-            return -1
-        if node.value == value:
-            return nivel
-        elif value < node.value:
-            return self._depth(node.left, value, nivel + 1)
-        else:
-            return self._depth(node.right, value, nivel + 1)
+        while node is not None:
+            if node.value == value:
+                return nivel
+            node = node.left if value < node.value else node.right
+            nivel += 1
+        return -1
 
-    # Visualizacao com Graphviz
-    def visualize(self, filename):
-        dot = Digraph(format="png")
-        counter = {"i": 0}
-
-        def add_nodes(node, parent_id=None):
-            if node is None:
-                return
-            nid = f"n{counter['i']}"
-            counter["i"] += 1
-            dot.node(nid, str(node.value), shape="circle")
-            if parent_id is not None:
-                dot.edge(parent_id, nid)
-            add_nodes(node.left, nid)
-            add_nodes(node.right, nid)
-
-        add_nodes(self.root)
-        output_path = dot.render(filename=filename, cleanup=True)
+    # Visualizacao com Graphviz: DOT escrito sem recursao (ver escritor_dot),
+    # entao arvores degeneradas tambem podem ser desenhadas; `detalhe` aceita
+    # profundidade_maxima, amostra e max_nos para arvores grandes
+    def visualize(self, filename, **detalhe):
+        from escritor_dot import renderizar_dot  # graphviz so e carregado aqui
+        output_path = renderizar_dot(self.root, filename, **detalhe)
         print(f"Arvore salva em: {output_path}")
 
+# --------------------------
+# Benchmark: ordem de insercao x bulk_load
+# --------------------------
+def benchmark_insert_orders(sizes=(10**3, 10**4, 10**5), seed=0):
+    rng = random.Random(seed)
+    for n in sizes:
+        orders = {
+            "ordenada": list(range(n)),
+            "reversa": list(range(n - 1, -1, -1)),
+            "aleatoria": rng.sample(range(n * 10), n),
+        }
+        for nome, valores in orders.items():
+            # insercao em ordem ordenada/reversa e O(n^2): limita o tamanho
+            if nome != "aleatoria" and n > 10**4:
+                t_insert = None
+            else:
+                bst = BinarySearchTree()
+                t0 = time.perf_counter()
+                for v in valores:
+                    bst.insert(v)
+                t_insert = time.perf_counter() - t0
+                altura_insert = bst.height()
+            t0 = time.perf_counter()
+            bulk = BinarySearchTree.bulk_load(valores)
+            t_bulk = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            for v in valores:
+                bulk.search(v)
+            t_search = time.perf_counter() - t0
+            insert_txt = (f"insert {t_insert * 1e3:9.1f} ms (altura {altura_insert:6d})"
+                          if t_insert is not None else "insert        (omitido)          ")
+            print(f"n={n:>7d} {nome:9s} {insert_txt}  bulk_load {t_bulk * 1e3:7.1f} ms"
+                  f" (altura {bulk.height():2d})  busca {n / t_search / 1e6:5.2f} Mop/s")
+
 # --------------------------
 # Testes das duas arvores
+# (python atividade_2.py --bench executa os benchmarks)
 # --------------------------
-if __name__ == "__main__":
+if __name__ == "__main__" and "--bench" in sys.argv:
+    benchmark_insert_orders()
+elif __name__ == "__main__":
     # -------- Arvore fixa --------
     print("=== Arvore Fixa ===")
     bst = BinarySearchTree()
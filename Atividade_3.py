@@ -1,7 +1,9 @@
 # atividade_3.py
 
 import random
-from graphviz import Digraph
+import sys
+import time
+import tracemalloc
 
 
 # -------------------------------
@@ -14,85 +16,234 @@ class Node:
         self.right = None
 
 
+# Variante com __slots__: sem __dict__ por nó, bem menos memória
+class SlotNode:
+    __slots__ = ("value", "left", "right")
+
+    def __init__(self, value):
+        self.value = value
+        self.left = None
+        self.right = None
+
+
 # -------------------------------
 # Classe Árvore Binária de Busca
 # -------------------------------
 class BinarySearchTree:
+    # classe usada para criar nós (ex.: SlotNode para economizar memória)
+    node_class = Node
+
     def __init__(self):
         self.root = None
 
     # Inserção
     def insert(self, value):
         if self.root is None:
-            self.root = Node(value)
+            self.root = self.node_class(value)
         else:
             self._insert(self.root, value)
 
     def _insert(self, current, value):
-        if value < current.value:
-            if current.left is None:
-                current.left = Node(value)
-            else:
-                self._insert(current.left, value)
-        else:
-            if current.right is None:
-                current.right = Node(value)
+        # iterativo: árvores degeneradas não estouram a pilha
+        while True:
+            if value < current.value:
+                if current.left is None:
+                    current.left = self.node_class(value)
+                    return
+                current = current.left
             else:
-                self._insert(current.right, value)
+                if current.right is None:
+                    current.right = self.node_class(value)
+                    return
+                current = current.right
 
-    # Travessias
+    # Travessias (listas completas, montadas a partir dos geradores)
     def inorder(self):
-        return self._inorder(self.root, [])
-
-    def _inorder(self, node, result):
-        if node:
-            self._inorder(node.left, result)
-            result.append(node.value)
-            self._inorder(node.right, result)
-        return result
+        return list(self.iter_inorder())
 
     def preorder(self):
-        return self._preorder(self.root, [])
-
-    def _preorder(self, node, result):
-        if node:
-            result.append(node.value)
-            self._preorder(node.left, result)
-            self._preorder(node.right, result)
-        return result
+        return list(self.iter_preorder())
 
     def postorder(self):
-        return self._postorder(self.root, [])
+        return list(self.iter_postorder())
+
+    # Travessias preguiçosas: geradores com pilha explícita, O(h) de memória,
+    # sem limite de recursão e com parada antecipada
+    def iter_inorder(self):
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.value
+            node = node.right
+
+    def iter_preorder(self):
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            yield node.value
+            if node.right:
+                stack.append(node.right)
+            if node.left:
+                stack.append(node.left)
 
-    def _postorder(self, node, result):
-        if node:
-            self._postorder(node.left, result)
-            self._postorder(node.right, result)
-            result.append(node.value)
-        return result
+    def iter_postorder(self):
+        stack = []
+        node = self.root
+        last = None  # último nó emitido
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            top = stack[-1]
+            if top.right and top.right is not last:
+                node = top.right
+            else:
+                stack.pop()
+                yield top.value
+                last = top
+
+    # In-order a partir da primeira chave >= key (paginação sem percorrer o prefixo)
+    def iter_from(self, key):
+        stack = []
+        node = self.root
+        while node:
+            if node.value >= key:
+                stack.append(node)
+                node = node.left
+            else:
+                node = node.right
+        while stack:
+            node = stack.pop()
+            yield node.value
+            node = node.right
+            while node:
+                stack.append(node)
+                node = node.left
+
+    # In-order de Morris: O(1) de memória extra. Usa ponteiros temporários
+    # (threads) nos nós; a árvore não pode ser alterada durante o percurso.
+    # Se o gerador for abandonado no meio, as threads restantes são desfeitas.
+    def morris_inorder(self):
+        node = self.root
+        emitting = True
+        try:
+            while node:
+                if node.left is None:
+                    if emitting:
+                        yield node.value
+                    node = node.right
+                    continue
+                pred = node.left
+                while pred.right and pred.right is not node:
+                    pred = pred.right
+                if pred.right is None:
+                    pred.right = node  # cria a thread
+                    node = node.left
+                else:
+                    pred.right = None  # desfaz a thread
+                    if emitting:
+                        yield node.value
+                    node = node.right
+        finally:
+            if node:
+                # encerrado antes do fim: termina o percurso só para restaurar
+                emitting = False
+                while node:
+                    if node.left is None:
+                        node = node.right
+                        continue
+                    pred = node.left
+                    while pred.right and pred.right is not node:
+                        pred = pred.right
+                    if pred.right is None:
+                        pred.right = node
+                        node = node.left
+                    else:
+                        pred.right = None
+                        node = node.right
 
     # Visualização da árvore com Graphviz
-    def visualize(self, filename="tree"):
-        dot = Digraph()
-        self._add_nodes(dot, self.root)
-        dot.render(filename, format="png", cleanup=True)
+    # DOT escrito direto em arquivo, sem recursão e com ids únicos. Para
+    # árvores grandes: profundidade_maxima, amostra e max_nos resumem
+    # subárvores em nós com tamanho e altura (ver escritor_dot)
+    def visualize(self, filename="tree", **detalhe):
+        from escritor_dot import renderizar_dot
+        renderizar_dot(self.root, filename, forma="ellipse", **detalhe)
         print(f"Árvore salva como {filename}.png")
 
+    # Preenche um Digraph em memória (iterativo; ids únicos, então valores
+    # repetidos não se fundem)
     def _add_nodes(self, dot, node):
-        if node:
-            dot.node(str(node.value))
-            if node.left:
-                dot.edge(str(node.value), str(node.left.value))
-                self._add_nodes(dot, node.left)
+        stack = [(node, None)] if node else []
+        count = 0
+        while stack:
+            node, parent_id = stack.pop()
+            nid = f"n{count}"
+            count += 1
+            dot.node(nid, str(node.value))
+            if parent_id is not None:
+                dot.edge(parent_id, nid)
             if node.right:
-                dot.edge(str(node.value), str(node.right.value))
-                self._add_nodes(dot, node.right)
+                stack.append((node.right, nid))
+            if node.left:
+                stack.append((node.left, nid))
+
+
+# -------------------------------
+# Benchmark das travessias
+# -------------------------------
+def benchmark_traversals(n=200000, page=100, seed=0):
+    rng = random.Random(seed)
+    valores = rng.sample(range(n * 10), n)
+    bst = BinarySearchTree()
+    for v in valores:
+        bst.insert(v)
+    skewed = BinarySearchTree()
+    for v in range(n // 10):
+        skewed.insert(v)
+
+    casos = [
+        ("inorder() lista", lambda t: t.inorder()),
+        ("iter_inorder", lambda t: sum(1 for _ in t.iter_inorder())),
+        ("morris_inorder", lambda t: sum(1 for _ in t.morris_inorder())),
+        ("iter_preorder", lambda t: sum(1 for _ in t.iter_preorder())),
+        ("iter_postorder", lambda t: sum(1 for _ in t.iter_postorder())),
+    ]
+    for nome_arvore, arvore in (("aleatória", bst), ("degenerada", skewed)):
+        print(f"--- árvore {nome_arvore} ---")
+        for nome, fn in casos:
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            fn(arvore)
+            elapsed = time.perf_counter() - t0
+            pico = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{nome:16s} {elapsed * 1e3:8.1f} ms  pico {pico / 1024:9.1f} KiB")
+
+    # paginação: página do meio com iter_from x fatiar a lista completa
+    chave = sorted(valores)[n // 2]
+    t0 = time.perf_counter()
+    pagina = bst.inorder()[n // 2:n // 2 + page]
+    t_lista = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    it = bst.iter_from(chave)
+    pagina2 = [next(it) for _ in range(page)]
+    t_from = time.perf_counter() - t0
+    print(f"página de {page} no meio: lista {t_lista * 1e3:.1f} ms  iter_from {t_from * 1e3:.3f} ms"
+          f"  iguais: {pagina == pagina2}")
 
 
 # -------------------------------
 # Demonstração
+# (python atividade_3.py --bench executa os benchmarks)
 # -------------------------------
-if __name__ == "__main__":
+if __name__ == "__main__" and "--bench" in sys.argv:
+    benchmark_traversals()
+elif __name__ == "__main__":
     # ---- Árvore com valores fixos ----
     print("\n=== Árvore com Valores Fixos ===")
     valores_fixos = [55, 30, 80, 20, 45, 70, 90]
@@ -1,7 +1,9 @@
 # atividade_4.py
 
 import random
-from graphviz import Digraph
+import sys
+import time
+from collections import Counter
 
 
 # -------------------------------
@@ -15,12 +17,78 @@ class Node:
         self.height = 1  # usado para calcular balanceamento
 
 
+# Variante com __slots__: sem __dict__ por nó, bem menos memória
+class SlotNode:
+    __slots__ = ("value", "left", "right", "height")
+
+    def __init__(self, value):
+        self.value = value
+        self.left = None
+        self.right = None
+        self.height = 1
+
+
+# -------------------------------
+# Listeners de instrumentação
+# -------------------------------
+# Um listener recebe:
+#   on_rotation(direction, value)  -> direction é "right" ou "left"
+#   on_operation(op, path_length, comparisons, rotations, rebalances)
+#   on_value(op, value)            -> opcional: valor da operação, avisado
+#                                     no início (antes das rotações)
+# Sem listener (padrão) a árvore não paga nada além de um teste de None.
+
+class AVLMetrics:
+    """Agrega contadores e histogramas das operações da árvore."""
+    def __init__(self):
+        self.counters = Counter()
+        self.path_lengths = Counter()   # comprimento do caminho -> ocorrências
+        self.rebalances = Counter()     # nós rebalanceados por operação -> ocorrências
+
+    def on_rotation(self, direction, value):
+        self.counters[f"rotations_{direction}"] += 1
+
+    def on_operation(self, op, path_length, comparisons, rotations, rebalances):
+        self.counters[op] += 1
+        self.counters["comparisons"] += comparisons
+        self.counters["rotations"] += rotations
+        self.path_lengths[path_length] += 1
+        self.rebalances[rebalances] += 1
+
+    def summary(self):
+        ops = sum(self.path_lengths.values()) or 1
+        return {
+            "counters": dict(self.counters),
+            "mean_path_length": sum(k * v for k, v in self.path_lengths.items()) / ops,
+            "max_path_length": max(self.path_lengths, default=0),
+            "path_length_histogram": dict(sorted(self.path_lengths.items())),
+            "rebalance_histogram": dict(sorted(self.rebalances.items())),
+        }
+
+
+class RotationPrinter:
+    """Imprime cada rotação (comportamento antigo da demonstração)."""
+    def on_rotation(self, direction, value):
+        lado = "direita" if direction == "right" else "esquerda"
+        print(f"Rotação à {lado} em {value}")
+
+    def on_operation(self, op, path_length, comparisons, rotations, rebalances):
+        pass
+
+
 # -------------------------------
 # Classe Árvore AVL
 # -------------------------------
 class AVLTree:
-    def __init__(self):
+    # classe usada para criar nós (ex.: SlotNode para economizar memória)
+    node_class = Node
+
+    def __init__(self, listener=None):
         self.root = None
+        self.listener = listener
+        # estatísticas da operação em andamento (só quando há listener):
+        # [path_length, comparisons, rotations, rebalances]
+        self._op = None
 
     # ---------------------------
     # Funções auxiliares
@@ -42,7 +110,8 @@ class AVLTree:
     # Rotações
     # ---------------------------
     def rotate_right(self, y):
-        print(f"Rotação à direita em {y.value}")
+        if self.listener is not None:
+            self._on_rotation("right", y.value)
         x = y.left
         T2 = x.right
 
@@ -57,7 +126,8 @@ class AVLTree:
         return x
 
     def rotate_left(self, x):
-        print(f"Rotação à esquerda em {x.value}")
+        if self.listener is not None:
+            self._on_rotation("left", x.value)
         y = x.right
         T2 = y.left
 
@@ -71,14 +141,30 @@ class AVLTree:
 
         return y
 
+    def _start_op(self, op, value):
+        # só chamado com listener
+        self._op = [0, 0, 0, 0]
+        on_value = getattr(self.listener, "on_value", None)
+        if on_value is not None:
+            on_value(op, value)
+
+    def _on_rotation(self, direction, value):
+        if self._op is not None:
+            self._op[2] += 1
+        self.listener.on_rotation(direction, value)
+
     # ---------------------------
     # Inserção com balanceamento
     # ---------------------------
     def insert(self, root, value):
+        op = self._op
         # Inserção normal de BST
         if not root:
-            return Node(value)
-        elif value < root.value:
+            return self.node_class(value)
+        if op is not None:
+            op[0] += 1
+            op[1] += 1
+        if value < root.value:
             root.left = self.insert(root.left, value)
         else:
             root.right = self.insert(root.right, value)
@@ -88,6 +174,9 @@ class AVLTree:
 
         # Verificar balanceamento
         balance = self.get_balance(root)
+        if op is not None and (balance > 1 or balance < -1):
+            op[1] += 1  # comparação que escolhe o caso
+            op[3] += 1
 
         # Caso 1: Left Left
         if balance > 1 and value < root.left.value:
@@ -110,40 +199,441 @@ class AVLTree:
         return root
 
     def insert_value(self, value):
-        self.root = self.insert(self.root, value)
+        if self.listener is None:
+            self.root = self.insert(self.root, value)
+            return
+        self._start_op("insert", value)
+        try:
+            self.root = self.insert(self.root, value)
+        finally:
+            op, self._op = self._op, None
+        self.listener.on_operation("insert", *op)
+
+    # ---------------------------
+    # Motor iterativo: inserção, remoção e busca com pilha de caminho
+    # (sem recursão; duplicados não são inseridos)
+    # ---------------------------
+    def _rebalance(self, node):
+        # escolhe o caso pelo fator de balanceamento do filho mais alto
+        balance = self.get_balance(node)
+        if balance > 1:
+            if self.get_balance(node.left) < 0:
+                node.left = self.rotate_left(node.left)
+            return self.rotate_right(node)
+        if balance < -1:
+            if self.get_balance(node.right) > 0:
+                node.right = self.rotate_right(node.right)
+            return self.rotate_left(node)
+        return node
+
+    def _replace_child(self, parent, old, new):
+        if parent is None:
+            self.root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+
+    # Sobe pelo caminho ajustando alturas e rotacionando. Para assim que a
+    # altura de uma subárvore volta a ser a mesma de antes da operação.
+    def _retrace(self, path, stop_after_rotation):
+        rebalances = 0
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            old_height = node.height
+            self.update_height(node)
+            balance = self.get_balance(node)
+            if balance > 1 or balance < -1:
+                rebalances += 1
+                new_root = self._rebalance(node)
+                self._replace_child(path[i - 1] if i else None, node, new_root)
+                # na inserção uma rotação sempre restaura a altura anterior
+                if stop_after_rotation or new_root.height == old_height:
+                    break
+            elif node.height == old_height:
+                break
+        return rebalances
+
+    def _report(self, op, path_length, rebalances):
+        # no motor iterativo há uma comparação de chave por nó do caminho
+        if self._op is not None:
+            rotations = self._op[2]
+            self._op = None
+            self.listener.on_operation(op, path_length, path_length, rotations, rebalances)
+
+    def insert_iterative(self, value):
+        """Insere `value`; retorna False se já existia."""
+        if self.listener is not None:
+            self._start_op("insert", value)
+        path = []
+        node = self.root
+        while node:
+            path.append(node)
+            if value < node.value:
+                node = node.left
+            elif value > node.value:
+                node = node.right
+            else:
+                self._report("insert", len(path), 0)
+                return False
+        new = self.node_class(value)
+        if not path:
+            self.root = new
+            self._report("insert", 0, 0)
+            return True
+        parent = path[-1]
+        if value < parent.value:
+            parent.left = new
+        else:
+            parent.right = new
+        rebalances = self._retrace(path, True)
+        self._report("insert", len(path), rebalances)
+        return True
+
+    def delete(self, value):
+        """Remove `value`; retorna False se não existia."""
+        if self.listener is not None:
+            self._start_op("delete", value)
+        path = []
+        node = self.root
+        while node and node.value != value:
+            path.append(node)
+            node = node.left if value < node.value else node.right
+        if node is None:
+            self._report("delete", len(path), 0)
+            return False
+        if node.left and node.right:
+            # copia o sucessor e remove o nó do sucessor
+            path.append(node)
+            target = node
+            node = node.right
+            while node.left:
+                path.append(node)
+                node = node.left
+            target.value = node.value
+        child = node.left if node.left else node.right
+        self._replace_child(path[-1] if path else None, node, child)
+        rebalances = self._retrace(path, False)
+        self._report("delete", len(path), rebalances)
+        return True
+
+    def search(self, value):
+        """Retorna o nó com `value` ou None."""
+        node = self.root
+        while node:
+            if value < node.value:
+                node = node.left
+            elif value > node.value:
+                node = node.right
+            else:
+                return node
+        return None
+
+    # ---------------------------
+    # Junção, divisão e operações de conjunto
+    # (reaproveitam os nós: as árvores de entrada ficam vazias)
+    # ---------------------------
+    def _join(self, left, node, right):
+        # une left < node.value < right usando `node` como ponte
+        hl = self.get_height(left)
+        hr = self.get_height(right)
+        if hl > hr + 1:
+            return self._join_right(left, node, right)
+        if hr > hl + 1:
+            return self._join_left(left, node, right)
+        node.left = left
+        node.right = right
+        self.update_height(node)
+        return node
+
+    def _join_right(self, left, node, right):
+        c = left.right
+        if self.get_height(c) <= self.get_height(right) + 1:
+            node.left = c
+            node.right = right
+            self.update_height(node)
+            if node.height <= self.get_height(left.left) + 1:
+                left.right = node
+                self.update_height(left)
+                return left
+            left.right = self.rotate_right(node)
+            return self.rotate_left(left)
+        left.right = self._join_right(c, node, right)
+        self.update_height(left)
+        if self.get_balance(left) >= -1:
+            return left
+        return self.rotate_left(left)
+
+    def _join_left(self, left, node, right):
+        c = right.left
+        if self.get_height(c) <= self.get_height(left) + 1:
+            node.left = left
+            node.right = c
+            self.update_height(node)
+            if node.height <= self.get_height(right.right) + 1:
+                right.left = node
+                self.update_height(right)
+                return right
+            right.left = self.rotate_left(node)
+            return self.rotate_right(right)
+        right.left = self._join_left(left, node, c)
+        self.update_height(right)
+        if self.get_balance(right) <= 1:
+            return right
+        return self.rotate_right(right)
+
+    def _split(self, node, value):
+        # retorna (menores, nó com value ou None, maiores)
+        if not node:
+            return None, None, None
+        left, right = node.left, node.right
+        if value == node.value:
+            node.left = node.right = None
+            self.update_height(node)
+            return left, node, right
+        if value < node.value:
+            less, found, greater = self._split(left, value)
+            return less, found, self._join(greater, node, right)
+        less, found, greater = self._split(right, value)
+        return self._join(left, node, less), found, greater
+
+    def _split_last(self, node):
+        if not node.right:
+            return node.left, node
+        rest, last = self._split_last(node.right)
+        return self._join(node.left, node, rest), last
+
+    def _join2(self, left, right):
+        if not left:
+            return right
+        if not right:
+            return left
+        rest, last = self._split_last(left)
+        return self._join(rest, last, right)
+
+    def _union(self, a, b):
+        if not a:
+            return b
+        if not b:
+            return a
+        left, right = a.left, a.right
+        less, _, greater = self._split(b, a.value)
+        return self._join(self._union(left, less), a, self._union(right, greater))
+
+    def _intersection(self, a, b):
+        if not a or not b:
+            return None
+        left, right = a.left, a.right
+        less, found, greater = self._split(b, a.value)
+        l = self._intersection(left, less)
+        r = self._intersection(right, greater)
+        return self._join(l, a, r) if found else self._join2(l, r)
+
+    def _difference(self, a, b):
+        if not a or not b:
+            return a
+        left, right = b.left, b.right
+        less, _, greater = self._split(a, b.value)
+        return self._join2(self._difference(less, left), self._difference(greater, right))
+
+    def _take_root(self):
+        root = self.root
+        self.root = None
+        return root
+
+    def _new_tree(self, root):
+        tree = type(self)(self.listener)
+        tree.node_class = self.node_class
+        tree.root = root
+        return tree
+
+    def split(self, value):
+        """Divide em O(log n): (árvore < value, nó com value ou None, árvore > value)."""
+        less, found, greater = self._split(self._take_root(), value)
+        return self._new_tree(less), found, self._new_tree(greater)
+
+    @classmethod
+    def join(cls, less, value, greater):
+        """Junta less < value < greater em O(diferença de alturas + 1)."""
+        if less.root and not less._max_node().value < value:
+            raise ValueError("join: valores de `less` devem ser < value")
+        if greater.root and not value < greater._min_node().value:
+            raise ValueError("join: valores de `greater` devem ser > value")
+        tree = less._new_tree(None)
+        tree.root = tree._join(less._take_root(), less.node_class(value), greater._take_root())
+        return tree
+
+    def _min_node(self):
+        node = self.root
+        while node.left:
+            node = node.left
+        return node
+
+    def _max_node(self):
+        node = self.root
+        while node.right:
+            node = node.right
+        return node
+
+    def union(self, other):
+        """União em O(m log(n/m + 1)); consome as duas árvores."""
+        return self._new_tree(self._union(self._take_root(), other._take_root()))
+
+    def intersection(self, other):
+        """Interseção em O(m log(n/m + 1)); consome as duas árvores."""
+        return self._new_tree(self._intersection(self._take_root(), other._take_root()))
+
+    def difference(self, other):
+        """Valores de self ausentes em other, O(m log(n/m + 1)); consome as duas."""
+        return self._new_tree(self._difference(self._take_root(), other._take_root()))
+
+    @classmethod
+    def from_sorted(cls, values, listener=None, node_class=None):
+        """
+        Árvore perfeitamente balanceada em O(n) a partir de valores
+        estritamente crescentes (`node_class` substitui a classe de nó padrão).
+        """
+        values = list(values)
+        for i in range(1, len(values)):
+            if not values[i - 1] < values[i]:
+                raise ValueError("from_sorted espera valores em ordem estritamente crescente")
+        tree = cls(listener)
+        if node_class is not None:
+            tree.node_class = node_class
+
+        def build(lo, hi):
+            if lo > hi:
+                return None
+            mid = (lo + hi) // 2
+            node = tree.node_class(values[mid])
+            node.left = build(lo, mid - 1)
+            node.right = build(mid + 1, hi)
+            tree.update_height(node)
+            return node
+
+        tree.root = build(0, len(values) - 1)
+        return tree
+
+    def merge_sorted(self, values):
+        """Mescla um lote grande já ordenado: monta em O(k) e faz uma única união."""
+        batch = type(self).from_sorted(values, node_class=self.node_class)
+        self.root = self._union(self._take_root(), batch._take_root())
 
     # ---------------------------
     # Visualização com Graphviz
     # ---------------------------
-    def visualize(self, filename="avl_tree"):
-        dot = Digraph()
-        self._add_nodes(dot, self.root)
-        dot.render(filename, format="png", cleanup=True)
+    # DOT escrito direto em arquivo, sem recursão e com ids únicos. Para
+    # árvores grandes: profundidade_maxima, amostra e max_nos resumem
+    # subárvores em nós com tamanho e altura (ver escritor_dot)
+    def visualize(self, filename="avl_tree", **detalhe):
+        from escritor_dot import renderizar_dot
+        renderizar_dot(self.root, filename, forma="ellipse", **detalhe)
         print(f"Árvore salva como {filename}.png")
 
+    # Preenche um Digraph em memória (iterativo; ids únicos, então valores
+    # repetidos não se fundem)
     def _add_nodes(self, dot, node):
-        if node:
-            dot.node(str(node.value))
-            if node.left:
-                dot.edge(str(node.value), str(node.left.value))
-                self._add_nodes(dot, node.left)
+        stack = [(node, None)] if node else []
+        count = 0
+        while stack:
+            node, parent_id = stack.pop()
+            nid = f"n{count}"
+            count += 1
+            dot.node(nid, str(node.value))
+            if parent_id is not None:
+                dot.edge(parent_id, nid)
             if node.right:
-                dot.edge(str(node.value), str(node.right.value))
-                self._add_nodes(dot, node.right)
+                stack.append((node.right, nid))
+            if node.left:
+                stack.append((node.left, nid))
+
+
+# -------------------------------
+# Benchmark: custo da instrumentação
+# -------------------------------
+def benchmark_listeners(n=100000, seed=0):
+    valores = random.Random(seed).sample(range(n * 10), n)
+    for nome, listener in (("sem listener", None), ("AVLMetrics", AVLMetrics())):
+        avl = AVLTree(listener)
+        t0 = time.perf_counter()
+        for v in valores:
+            avl.insert_value(v)
+        elapsed = time.perf_counter() - t0
+        print(f"{nome:14s} {n / elapsed / 1e3:8.1f} mil inserções/s")
+        if listener is not None:
+            resumo = listener.summary()
+            print("  contadores:", resumo["counters"])
+            print(f"  caminho médio {resumo['mean_path_length']:.2f}"
+                  f"  máximo {resumo['max_path_length']}")
+            print("  rebalanceamentos por operação:", resumo["rebalance_histogram"])
+
+
+# -------------------------------
+# Benchmark: motor iterativo x inserção recursiva x Atividade_5
+# -------------------------------
+def benchmark_engines(n=100000, seed=0):
+    from Atividade_5 import ArvoreAVL
+
+    rng = random.Random(seed)
+    for ordem, valores in (("aleatória", rng.sample(range(n * 10), n)),
+                           ("ordenada", list(range(n)))):
+        resultados = []
+
+        avl = AVLTree()
+        t0 = time.perf_counter()
+        for v in valores:
+            avl.insert_value(v)
+        resultados.append(("AVLTree.insert_value", time.perf_counter() - t0))
+
+        avl_it = AVLTree()
+        t0 = time.perf_counter()
+        for v in valores:
+            avl_it.insert_iterative(v)
+        resultados.append(("AVLTree.insert_iterative", time.perf_counter() - t0))
+
+        arvore = ArvoreAVL()
+        t0 = time.perf_counter()
+        for v in valores:
+            arvore.inserir(v)
+        resultados.append(("ArvoreAVL.inserir", time.perf_counter() - t0))
+
+        t0 = time.perf_counter()
+        for v in valores:
+            avl_it.search(v)
+        resultados.append(("AVLTree.search", time.perf_counter() - t0))
+
+        t0 = time.perf_counter()
+        for v in valores[::2]:
+            avl_it.delete(v)
+        t_del = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for v in valores[::2]:
+            arvore.deletar(v)
+        t_deletar = time.perf_counter() - t0
+
+        print(f"--- n={n}, ordem {ordem} ---")
+        for nome, t in resultados:
+            print(f"{nome:26s} {n / t / 1e3:8.1f} mil ops/s")
+        print(f"{'AVLTree.delete':26s} {len(valores[::2]) / t_del / 1e3:8.1f} mil ops/s")
+        print(f"{'ArvoreAVL.deletar':26s} {len(valores[::2]) / t_deletar / 1e3:8.1f} mil ops/s")
 
 
 # -------------------------------
 # Demonstração
+# (python atividade_4.py --bench executa os benchmarks)
 # -------------------------------
-if __name__ == "__main__":
+if __name__ == "__main__" and "--bench" in sys.argv:
+    benchmark_listeners()
+    benchmark_engines()
+elif __name__ == "__main__":
     print("\n=== Árvore AVL com Rotações Simples ===")
-    avl1 = AVLTree()
+    avl1 = AVLTree(RotationPrinter())
     for v in [10, 20, 30]:
         avl1.insert_value(v)
         avl1.visualize(f"avl_rotacao_simples_{v}")
 
     print("\n=== Árvore AVL com Rotação Dupla ===")
-    avl2 = AVLTree()
+    avl2 = AVLTree(RotationPrinter())
     for v in [10, 30, 20]:
         avl2.insert_value(v)
         avl2.visualize(f"avl_rotacao_dupla_{v}")
@@ -152,7 +642,7 @@ if __name__ == "__main__":
     valores_random = random.sample(range(1, 100), 20)
     print("Valores gerados:", valores_random)
 
-    avl_random = AVLTree()
+    avl_random = AVLTree(RotationPrinter())
     for v in valores_random:
         avl_random.insert_value(v)
 
@@ -1,21 +1,48 @@
 # -*- coding: utf-8 -*-
 
+import random
+import sys
+import time
+
 class No:
     """
     Representa um nó na Árvore AVL.
-    Cada nó armazena uma chave, referências para os filhos e sua altura.
+    Cada nó armazena uma chave, um valor associado (por padrão a própria
+    chave), referências para os filhos, sua altura e o tamanho da subárvore
+    (usado nas estatísticas de ordem).
     """
-    def __init__(self, chave):
+    def __init__(self, chave, valor=None):
         self.chave = chave
+        self.valor = chave if valor is None else valor
         self.esquerda = None
         self.direita = None
         self.altura = 1 # A altura de um novo nó (folha) é sempre 1
+        self.tamanho = 1 # Quantidade de nós na subárvore
+
+
+class NoCompacto:
+    """
+    Variante de `No` com __slots__: sem __dict__ por instância, ocupa bem
+    menos memória. Use com `ArvoreAVL.classe_no = NoCompacto` ou subclasse.
+    """
+    __slots__ = ("chave", "valor", "esquerda", "direita", "altura", "tamanho")
+
+    def __init__(self, chave, valor=None):
+        self.chave = chave
+        self.valor = chave if valor is None else valor
+        self.esquerda = None
+        self.direita = None
+        self.altura = 1
+        self.tamanho = 1
 
 
 class ArvoreAVL:
     """
     Implementa a estrutura e as operações de uma Árvore AVL.
     """
+    # Classe usada para criar nós (No ou NoCompacto)
+    classe_no = No
+
     def __init__(self):
         self.raiz = None
 
@@ -35,10 +62,18 @@ class ArvoreAVL:
             return 0
         return self.obter_altura(no.esquerda) - self.obter_altura(no.direita)
 
+    def obter_tamanho(self, no):
+        """Quantidade de nós na subárvore. Se o nó for nulo, o tamanho é 0."""
+        if not no:
+            return 0
+        return no.tamanho
+
     def _atualizar_altura(self, no):
-        """Atualiza a altura do nó com base nos filhos."""
-        no.altura = 1 + max(self.obter_altura(no.esquerda),
-                            self.obter_altura(no.direita))
+        """Atualiza a altura e o tamanho do nó com base nos filhos."""
+        esquerda = no.esquerda
+        direita = no.direita
+        no.altura = 1 + max(self.obter_altura(esquerda), self.obter_altura(direita))
+        no.tamanho = 1 + self.obter_tamanho(esquerda) + self.obter_tamanho(direita)
 
     def obter_no_valor_minimo(self, no):
         """Retorna o nó com o menor valor em uma subárvore (mais à esquerda)."""
@@ -81,18 +116,21 @@ class ArvoreAVL:
     # INSERÇÃO
     # ===============================================================
 
-    def inserir(self, chave):
-        """Método público para inserir uma chave na árvore."""
-        self.raiz = self._inserir_recursivo(self.raiz, chave)
+    def inserir(self, chave, valor=None):
+        """
+        Método público para inserir uma chave na árvore. `valor` é o dado
+        associado usado nas agregações por intervalo (padrão: a chave).
+        """
+        self.raiz = self._inserir_recursivo(self.raiz, chave, valor)
 
-    def _inserir_recursivo(self, no_atual, chave):
+    def _inserir_recursivo(self, no_atual, chave, valor=None):
         # Inserção padrão de BST
         if not no_atual:
-            return No(chave)
+            return self.classe_no(chave, valor)
         elif chave < no_atual.chave:
-            no_atual.esquerda = self._inserir_recursivo(no_atual.esquerda, chave)
+            no_atual.esquerda = self._inserir_recursivo(no_atual.esquerda, chave, valor)
         elif chave > no_atual.chave:
-            no_atual.direita = self._inserir_recursivo(no_atual.direita, chave)
+            no_atual.direita = self._inserir_recursivo(no_atual.direita, chave, valor)
         else:
             raise ValueError("Chave duplicada não permitida na AVL.")
 
@@ -130,6 +168,11 @@ class ArvoreAVL:
         """Método público para deletar uma chave da árvore."""
         self.raiz = self._deletar_recursivo(self.raiz, chave)
 
+    def _copiar_conteudo(self, destino, origem):
+        """Copia os dados (não os filhos) do sucessor para o nó removido."""
+        destino.chave = origem.chave
+        destino.valor = origem.valor
+
     def _deletar_recursivo(self, no_atual, chave):
         # 1. Deleção padrão BST
         if not no_atual:
@@ -147,7 +190,7 @@ class ArvoreAVL:
                 return no_atual.esquerda
             else:
                 sucessor = self.obter_no_valor_minimo(no_atual.direita)
-                no_atual.chave = sucessor.chave
+                self._copiar_conteudo(no_atual, sucessor)
                 no_atual.direita = self._deletar_recursivo(no_atual.direita, sucessor.chave)
 
         if not no_atual:
@@ -185,19 +228,118 @@ class ArvoreAVL:
 
     def encontrar_nos_intervalo(self, chave1, chave2):
         """Retorna todas as chaves no intervalo [chave1, chave2]."""
-        resultado = []
-        self._buscar_intervalo(self.raiz, chave1, chave2, resultado)
-        return resultado
+        return list(self.iterar_intervalo(chave1, chave2))
 
-    def _buscar_intervalo(self, no, chave1, chave2, resultado):
-        if not no:
-            return
-        if chave1 < no.chave:
-            self._buscar_intervalo(no.esquerda, chave1, chave2, resultado)
-        if chave1 <= no.chave <= chave2:
-            resultado.append(no.chave)
-        if chave2 > no.chave:
-            self._buscar_intervalo(no.direita, chave1, chave2, resultado)
+    def iterar_intervalo(self, chave1, chave2, com_valores=False):
+        """
+        Gera, em ordem e sob demanda, as chaves do intervalo [chave1, chave2]
+        (ou pares (chave, valor) se `com_valores`). Usa uma pilha de O(log n):
+        desce direto à primeira chave >= chave1, sem visitar o prefixo.
+        """
+        pilha = []
+        no = self.raiz
+        while no:
+            if no.chave >= chave1:
+                pilha.append(no)
+                no = no.esquerda
+            else:
+                no = no.direita
+        while pilha:
+            no = pilha.pop()
+            if no.chave > chave2:
+                return
+            yield (no.chave, no.valor) if com_valores else no.chave
+            no = no.direita
+            while no:
+                pilha.append(no)
+                no = no.esquerda
+
+    def contar_intervalo(self, chave1, chave2):
+        """Quantidade de chaves em [chave1, chave2], O(log n)."""
+        if chave2 < chave1:
+            return 0
+        return self._contar_ate(chave2) - self.posto(chave1)
+
+    def _contar_ate(self, chave):
+        # quantidade de chaves <= `chave`
+        no = self.raiz
+        total = 0
+        while no:
+            if chave < no.chave:
+                no = no.esquerda
+            else:
+                total += self.obter_tamanho(no.esquerda) + self._ocorrencias(no)
+                no = no.direita
+        return total
+
+    def _ocorrencias(self, no):
+        """Quantas vezes a chave do nó ocorre (1 fora do multiconjunto)."""
+        return 1
+
+
+    # ===============================================================
+    # ESTATÍSTICAS DE ORDEM
+    # ===============================================================
+
+    def __len__(self):
+        """Quantidade de chaves na árvore, O(1)."""
+        return self.obter_tamanho(self.raiz)
+
+    def altura(self):
+        """Altura da árvore, O(1) (árvore vazia = 0)."""
+        return self.obter_altura(self.raiz)
+
+    def selecionar(self, k):
+        """Retorna a k-ésima menor chave (k a partir de 0), O(log n)."""
+        if not 0 <= k < self.obter_tamanho(self.raiz):
+            raise IndexError("selecionar: k fora do intervalo")
+        no = self.raiz
+        while True:
+            tamanho_esq = self.obter_tamanho(no.esquerda)
+            if k < tamanho_esq:
+                no = no.esquerda
+            elif k == tamanho_esq:
+                return no.chave
+            else:
+                k -= tamanho_esq + 1
+                no = no.direita
+
+    def posto(self, chave):
+        """Quantidade de chaves menores que `chave`, O(log n)."""
+        no = self.raiz
+        menores = 0
+        while no:
+            if chave <= no.chave:
+                no = no.esquerda
+            else:
+                menores += self.obter_tamanho(no.esquerda) + 1
+                no = no.direita
+        return menores
+
+    def congelar(self):
+        """
+        Exporta um snapshot imutável em layout de Eytzinger (numpy), com
+        busca em lote vetorizada: ver arvore_congelada.FrozenTree.
+        """
+        from arvore_congelada import FrozenTree
+        chaves = []
+        valores = []
+        pilha = []
+        no = self.raiz
+        while pilha or no:
+            while no:
+                pilha.append(no)
+                no = no.esquerda
+            no = pilha.pop()
+            chaves.append(no.chave)
+            valores.append(no.valor)
+            no = no.direita
+        return FrozenTree(chaves, valores)
+
+    # Nomes usuais em inglês
+    select = selecionar
+    rank = posto
+    freeze = congelar
 
     def obter_profundidade_no(self, chave):
         """Calcula a profundidade de um nó com a chave dada."""
@@ -213,9 +355,937 @@ class ArvoreAVL:
         else:
             return self._profundidade_recursiva(no.direita, chave, nivel + 1)
 
+    # ===============================================================
+    # JUNÇÃO, DIVISÃO E OPERAÇÕES DE CONJUNTO
+    # ===============================================================
+    # As operações abaixo reaproveitam os nós das árvores de entrada: as
+    # árvores passadas (incluindo a própria) ficam vazias depois da chamada.
+
+    def _juntar(self, esquerda, no, direita):
+        """Une `esquerda` < no.chave < `direita` usando `no` como raiz/ponte."""
+        he = self.obter_altura(esquerda)
+        hd = self.obter_altura(direita)
+        if he > hd + 1:
+            return self._juntar_direita(esquerda, no, direita)
+        if hd > he + 1:
+            return self._juntar_esquerda(esquerda, no, direita)
+        no.esquerda = esquerda
+        no.direita = direita
+        self._atualizar_altura(no)
+        return no
+
+    def _juntar_direita(self, esquerda, no, direita):
+        # desce pela espinha direita de `esquerda` até a altura de `direita`
+        c = esquerda.direita
+        if self.obter_altura(c) <= self.obter_altura(direita) + 1:
+            no.esquerda = c
+            no.direita = direita
+            self._atualizar_altura(no)
+            if self.obter_altura(no) <= self.obter_altura(esquerda.esquerda) + 1:
+                esquerda.direita = no
+                self._atualizar_altura(esquerda)
+                return esquerda
+            esquerda.direita = self._rotacao_direita(no)
+            return self._rotacao_esquerda(esquerda)
+        esquerda.direita = self._juntar_direita(c, no, direita)
+        self._atualizar_altura(esquerda)
+        if self.obter_fator_balanceamento(esquerda) >= -1:
+            return esquerda
+        return self._rotacao_esquerda(esquerda)
+
+    def _juntar_esquerda(self, esquerda, no, direita):
+        # simétrico: desce pela espinha esquerda de `direita`
+        c = direita.esquerda
+        if self.obter_altura(c) <= self.obter_altura(esquerda) + 1:
+            no.esquerda = esquerda
+            no.direita = c
+            self._atualizar_altura(no)
+            if self.obter_altura(no) <= self.obter_altura(direita.direita) + 1:
+                direita.esquerda = no
+                self._atualizar_altura(direita)
+                return direita
+            direita.esquerda = self._rotacao_esquerda(no)
+            return self._rotacao_direita(direita)
+        direita.esquerda = self._juntar_esquerda(esquerda, no, c)
+        self._atualizar_altura(direita)
+        if self.obter_fator_balanceamento(direita) <= 1:
+            return direita
+        return self._rotacao_direita(direita)
+
+    def _dividir(self, no, chave):
+        """Retorna (menores, nó com a chave ou None, maiores)."""
+        if not no:
+            return None, None, None
+        esquerda, direita = no.esquerda, no.direita
+        if chave == no.chave:
+            no.esquerda = no.direita = None
+            self._atualizar_altura(no)
+            return esquerda, no, direita
+        if chave < no.chave:
+            menores, achado, maiores = self._dividir(esquerda, chave)
+            return menores, achado, self._juntar(maiores, no, direita)
+        menores, achado, maiores = self._dividir(direita, chave)
+        return self._juntar(esquerda, no, menores), achado, maiores
+
+    def _separar_ultimo(self, no):
+        """Remove o maior nó da subárvore; retorna (resto, maior)."""
+        if not no.direita:
+            return no.esquerda, no
+        resto, ultimo = self._separar_ultimo(no.direita)
+        return self._juntar(no.esquerda, no, resto), ultimo
+
+    def _concatenar(self, esquerda, direita):
+        if not esquerda:
+            return direita
+        if not direita:
+            return esquerda
+        resto, ultimo = self._separar_ultimo(esquerda)
+        return self._juntar(resto, ultimo, direita)
+
+    def _uniao(self, a, b):
+        # em chaves repetidas o nó de `a` prevalece
+        if not a:
+            return b
+        if not b:
+            return a
+        esquerda, direita = a.esquerda, a.direita
+        menores, _, maiores = self._dividir(b, a.chave)
+        return self._juntar(self._uniao(esquerda, menores), a, self._uniao(direita, maiores))
+
+    def _intersecao(self, a, b):
+        if not a or not b:
+            return None
+        esquerda, direita = a.esquerda, a.direita
+        menores, achado, maiores = self._dividir(b, a.chave)
+        e = self._intersecao(esquerda, menores)
+        d = self._intersecao(direita, maiores)
+        if achado:
+            return self._juntar(e, a, d)
+        return self._concatenar(e, d)
+
+    def _diferenca(self, a, b):
+        if not a or not b:
+            return a
+        esquerda, direita = b.esquerda, b.direita
+        menores, _, maiores = self._dividir(a, b.chave)
+        return self._concatenar(self._diferenca(menores, esquerda),
+                                self._diferenca(maiores, direita))
+
+    def _tomar_raiz(self):
+        raiz = self.raiz
+        self.raiz = None
+        return raiz
+
+    def _nova_arvore(self, raiz):
+        arvore = type(self)()
+        arvore.classe_no = self.classe_no
+        arvore.raiz = raiz
+        return arvore
+
+    @classmethod
+    def juntar(cls, menores, chave, maiores, valor=None):
+        """
+        Junta duas árvores e uma chave, exigindo menores < chave < maiores,
+        em O(|altura(menores) - altura(maiores)| + 1).
+        """
+        if menores.raiz and not menores._maximo_no().chave < chave:
+            raise ValueError("juntar: chaves de `menores` devem ser < chave")
+        if maiores.raiz and not chave < maiores.obter_no_valor_minimo(maiores.raiz).chave:
+            raise ValueError("juntar: chaves de `maiores` devem ser > chave")
+        arvore = menores._nova_arvore(None)
+        no = menores.classe_no(chave, valor)
+        arvore.raiz = arvore._juntar(menores._tomar_raiz(), no, maiores._tomar_raiz())
+        return arvore
+
+    def _maximo_no(self):
+        no = self.raiz
+        while no.direita:
+            no = no.direita
+        return no
+
+    def dividir(self, chave):
+        """
+        Divide a árvore em O(log n). Retorna (menores, no, maiores): duas
+        árvores com as chaves < e > `chave`, e o nó com a chave (ou None).
+        """
+        menores, achado, maiores = self._dividir(self._tomar_raiz(), chave)
+        return self._nova_arvore(menores), achado, self._nova_arvore(maiores)
+
+    def uniao(self, outra):
+        """União em O(m log(n/m + 1)); em chaves repetidas vale o valor de self."""
+        return self._nova_arvore(self._uniao(self._tomar_raiz(), outra._tomar_raiz()))
+
+    def intersecao(self, outra):
+        """Interseção em O(m log(n/m + 1)), com os valores de self."""
+        return self._nova_arvore(self._intersecao(self._tomar_raiz(), outra._tomar_raiz()))
+
+    def diferenca(self, outra):
+        """Chaves de self que não estão em `outra`, em O(m log(n/m + 1))."""
+        return self._nova_arvore(self._diferenca(self._tomar_raiz(), outra._tomar_raiz()))
+
+    @classmethod
+    def de_ordenados(cls, chaves, valores=None, classe_no=None):
+        """
+        Constrói uma árvore perfeitamente balanceada em O(n) a partir de
+        chaves em ordem estritamente crescente (e valores opcionais).
+        `classe_no` substitui a classe de nó padrão.
+        """
+        chaves = list(chaves)
+        valores = list(valores) if valores is not None else [None] * len(chaves)
+        if len(valores) != len(chaves):
+            raise ValueError("de_ordenados: chaves e valores com tamanhos diferentes")
+        for i in range(1, len(chaves)):
+            if not chaves[i - 1] < chaves[i]:
+                raise ValueError("de_ordenados espera chaves em ordem estritamente crescente")
+        arvore = cls()
+        if classe_no is not None:
+            arvore.classe_no = classe_no
+
+        def construir(inicio, fim):
+            if inicio > fim:
+                return None
+            meio = (inicio + fim) // 2
+            no = arvore.classe_no(chaves[meio], valores[meio])
+            no.esquerda = construir(inicio, meio - 1)
+            no.direita = construir(meio + 1, fim)
+            arvore._atualizar_altura(no)
+            return no
+
+        arvore.raiz = construir(0, len(chaves) - 1)
+        return arvore
+
+    def mesclar_ordenados(self, chaves, valores=None):
+        """
+        Caminho rápido para mesclar um lote grande já ordenado: monta o lote
+        em O(k) e faz uma única união com a árvore. Em chaves repetidas o
+        valor do lote substitui o antigo.
+        """
+        lote = type(self).de_ordenados(chaves, valores, classe_no=self.classe_no)
+        self.raiz = self._uniao(lote._tomar_raiz(), self._tomar_raiz())
+
+
+# ===============================================================
+# AGREGAÇÕES POR INTERVALO (soma/mínimo/máximo por subárvore)
+# ===============================================================
+
+class NoAgregado:
+    """
+    Nó da ArvoreAVLAgregada: além do tamanho, guarda a soma, o mínimo e o
+    máximo dos valores da subárvore. Os valores precisam suportar + e <.
+    """
+    __slots__ = ("chave", "valor", "esquerda", "direita", "altura", "tamanho",
+                 "soma", "minimo", "maximo")
+
+    def __init__(self, chave, valor=None):
+        self.chave = chave
+        self.valor = chave if valor is None else valor
+        self.esquerda = None
+        self.direita = None
+        self.altura = 1
+        self.tamanho = 1
+        self.soma = self.minimo = self.maximo = self.valor
+
+
+class ArvoreAVLAgregada(ArvoreAVL):
+    """
+    ArvoreAVL com resumos de soma/mínimo/máximo dos valores em cada nó,
+    recalculados em cada rotação, inserção e deleção, que permitem agregar
+    um intervalo de chaves em O(log n). Use com valores numéricos; a
+    ArvoreAVL simples aceita chaves e valores de qualquer tipo comparável.
+    """
+    classe_no = NoAgregado
+
+    def _atualizar_altura(self, no):
+        """Atualiza altura, tamanho e resumos (soma/mínimo/máximo) do nó."""
+        esquerda = no.esquerda
+        direita = no.direita
+        no.altura = 1 + max(self.obter_altura(esquerda), self.obter_altura(direita))
+        no.tamanho = 1 + self.obter_tamanho(esquerda) + self.obter_tamanho(direita)
+        soma = minimo = maximo = no.valor
+        for filho in (esquerda, direita):
+            if filho:
+                soma = soma + filho.soma
+                if filho.minimo < minimo:
+                    minimo = filho.minimo
+                if filho.maximo > maximo:
+                    maximo = filho.maximo
+        no.soma = soma
+        no.minimo = minimo
+        no.maximo = maximo
+
+    def agregar_intervalo(self, chave1, chave2):
+        """
+        Retorna (quantidade, soma, mínimo, máximo) dos valores associados às
+        chaves em [chave1, chave2], em O(log n), combinando os resumos das
+        subárvores inteiramente contidas no intervalo. Para intervalo vazio
+        retorna (0, 0, None, None).
+        """
+        # 1. Desce até o nó onde os caminhos de chave1 e chave2 se separam
+        no = self.raiz
+        while no and not (chave1 <= no.chave <= chave2):
+            no = no.esquerda if chave2 < no.chave else no.direita
+        if not no:
+            return (0, 0, None, None)
+        qtd, soma = self._resumo_no(no)
+        acumulado = [qtd, soma, no.valor, no.valor]
+
+        def somar(n, subarvore):
+            # soma ao acumulado um nó isolado ou sua subárvore inteira
+            if subarvore:
+                qtd, soma, minimo, maximo = n.tamanho, n.soma, n.minimo, n.maximo
+            else:
+                qtd, soma = self._resumo_no(n)
+                minimo = maximo = n.valor
+            acumulado[0] += qtd
+            acumulado[1] = acumulado[1] + soma
+            if minimo < acumulado[2]:
+                acumulado[2] = minimo
+            if maximo > acumulado[3]:
+                acumulado[3] = maximo
+
+        # 2. Lado esquerdo: chaves >= chave1 na subárvore esquerda
+        x = no.esquerda
+        while x:
+            if x.chave >= chave1:
+                somar(x, False)
+                if x.direita:
+                    somar(x.direita, True)
+                x = x.esquerda
+            else:
+                x = x.direita
+        # 3. Lado direito: chaves <= chave2 na subárvore direita
+        x = no.direita
+        while x:
+            if x.chave <= chave2:
+                somar(x, False)
+                if x.esquerda:
+                    somar(x.esquerda, True)
+                x = x.direita
+            else:
+                x = x.esquerda
+        return tuple(acumulado)
+
+    def _resumo_no(self, no):
+        """(quantidade, soma) do próprio nó, sem os filhos."""
+        return 1, no.valor
+
+    def soma_intervalo(self, chave1, chave2):
+        """Soma dos valores associados às chaves em [chave1, chave2]."""
+        return self.agregar_intervalo(chave1, chave2)[1]
+
+    def minimo_intervalo(self, chave1, chave2):
+        """Menor valor associado a uma chave em [chave1, chave2] (ou None)."""
+        return self.agregar_intervalo(chave1, chave2)[2]
+
+    def maximo_intervalo(self, chave1, chave2):
+        """Maior valor associado a uma chave em [chave1, chave2] (ou None)."""
+        return self.agregar_intervalo(chave1, chave2)[3]
+
+
+# ===============================================================
+# MULTICONJUNTO (contagem por nó)
+# ===============================================================
+
+class NoContado:
+    """
+    Nó do multiconjunto: `contagem` guarda quantas vezes a chave ocorre.
+    `tamanho` conta ocorrências, não nós.
+    """
+    __slots__ = ("chave", "valor", "contagem", "esquerda", "direita", "altura",
+                 "tamanho")
+
+    def __init__(self, chave, valor=None):
+        self.chave = chave
+        self.valor = chave if valor is None else valor
+        self.contagem = 1
+        self.esquerda = None
+        self.direita = None
+        self.altura = 1
+        self.tamanho = 1
+
+
+class MultiConjuntoAVL(ArvoreAVL):
+    """
+    Modo multiconjunto da ArvoreAVL: chaves repetidas incrementam a contagem
+    do nó existente em vez de criar nós novos (ou lançar ValueError), então
+    o número de nós acompanha as chaves distintas. len, intervalos,
+    contar_intervalo, selecionar e posto contam cada ocorrência. As operações de
+    junção/conjunto herdadas mantêm a contagem do nó que prevalece.
+    """
+    classe_no = NoContado
+
+    def _atualizar_altura(self, no):
+        super()._atualizar_altura(no)
+        no.tamanho += no.contagem - 1
+
+    def _copiar_conteudo(self, destino, origem):
+        super()._copiar_conteudo(destino, origem)
+        destino.contagem = origem.contagem
+
+    def _ocorrencias(self, no):
+        return no.contagem
+
+    def _caminho(self, chave):
+        # caminho da raiz até o nó com a chave (vazio se ausente)
+        caminho = []
+        no = self.raiz
+        while no:
+            caminho.append(no)
+            if chave == no.chave:
+                return caminho
+            no = no.esquerda if chave < no.chave else no.direita
+        return []
+
+    def _ajustar_contagem(self, caminho, delta):
+        caminho[-1].contagem += delta
+        for no in reversed(caminho):
+            self._atualizar_altura(no)
+
+    def inserir(self, chave, valor=None, vezes=1):
+        """
+        Acrescenta `vezes` ocorrências da chave. Se ela já existe só a
+        contagem muda (o valor associado continua o da primeira inserção).
+        """
+        if vezes < 1:
+            raise ValueError("inserir: `vezes` deve ser >= 1")
+        caminho = self._caminho(chave)
+        if caminho:
+            self._ajustar_contagem(caminho, vezes)
+            return
+        super().inserir(chave, valor)
+        if vezes > 1:
+            self._ajustar_contagem(self._caminho(chave), vezes - 1)
+
+    def deletar(self, chave, vezes=1):
+        """
+        Remove até `vezes` ocorrências da chave (todas se `vezes` for None);
+        o nó só sai da árvore quando a contagem chega a zero.
+        """
+        caminho = self._caminho(chave)
+        if not caminho:
+            return
+        if vezes is not None and caminho[-1].contagem > vezes:
+            self._ajustar_contagem(caminho, -vezes)
+        else:
+            super().deletar(chave)
+
+    def contagem(self, chave):
+        """Ocorrências da chave (0 se ausente), O(log n)."""
+        caminho = self._caminho(chave)
+        return caminho[-1].contagem if caminho else 0
+
+    def distintas(self):
+        """Quantidade de chaves distintas (nós), O(n)."""
+        return sum(1 for _ in self._nos())
+
+    def _nos(self):
+        pilha = []
+        no = self.raiz
+        while pilha or no:
+            while no:
+                pilha.append(no)
+                no = no.esquerda
+            no = pilha.pop()
+            yield no
+            no = no.direita
+
+    def iterar_intervalo(self, chave1, chave2, com_valores=False):
+        """Como em ArvoreAVL, repetindo cada chave `contagem` vezes."""
+        pilha = []
+        no = self.raiz
+        while no:
+            if no.chave >= chave1:
+                pilha.append(no)
+                no = no.esquerda
+            else:
+                no = no.direita
+        while pilha:
+            no = pilha.pop()
+            if no.chave > chave2:
+                return
+            item = (no.chave, no.valor) if com_valores else no.chave
+            for _ in range(no.contagem):
+                yield item
+            no = no.direita
+            while no:
+                pilha.append(no)
+                no = no.esquerda
+
+    def selecionar(self, k):
+        """k-ésima menor ocorrência (k a partir de 0), O(log n)."""
+        if not 0 <= k < self.obter_tamanho(self.raiz):
+            raise IndexError("selecionar: k fora do intervalo")
+        no = self.raiz
+        while True:
+            tamanho_esq = self.obter_tamanho(no.esquerda)
+            if k < tamanho_esq:
+                no = no.esquerda
+            elif k < tamanho_esq + no.contagem:
+                return no.chave
+            else:
+                k -= tamanho_esq + no.contagem
+                no = no.direita
+
+    def posto(self, chave):
+        """Ocorrências de chaves menores que `chave`, O(log n)."""
+        no = self.raiz
+        menores = 0
+        while no:
+            if chave <= no.chave:
+                no = no.esquerda
+            else:
+                menores += self.obter_tamanho(no.esquerda) + no.contagem
+                no = no.direita
+        return menores
+
+    select = selecionar
+    rank = posto
+
+
+# ===============================================================
+# MAPA ORDENADO (SortedMap)
+# ===============================================================
+
+class NoMapa:
+    """
+    Nó do SortedMap: `chave` é a chave de ordenação já calculada (cache) e
+    `valor` é o par (elemento original, valor associado), que não é
+    copiado para um atributo próprio.
+    """
+    __slots__ = ("chave", "valor", "esquerda", "direita", "altura", "tamanho")
+
+    def __init__(self, chave, valor=None):
+        self.chave = chave
+        self.valor = valor
+        self.esquerda = None
+        self.direita = None
+        self.altura = 1
+        self.tamanho = 1
+
+
+class _ArvoreMapa(ArvoreAVL):
+    classe_no = NoMapa
+
+
+class SortedMap:
+    """
+    Dicionário ordenado sobre a ArvoreAVL. `key` (padrão: identidade) é
+    chamada uma única vez por elemento inserido e uma vez por consulta; as
+    descidas comparam apenas as chaves de ordenação guardadas nos nós.
+    Elementos com a mesma chave de ordenação são considerados iguais.
+
+    floor/ceiling/predecessor/successor retornam o par (elemento, valor) ou
+    None, em O(log n); nearest(x, k) retorna os k pares mais próximos em
+    O(log n + k).
+    """
+    def __init__(self, itens=(), key=None):
+        self._key = key
+        self._arvore = _ArvoreMapa()
+        itens = itens.items() if hasattr(itens, "items") else itens
+        for elemento, valor in itens:
+            self[elemento] = valor
+
+    def _chave(self, elemento):
+        return elemento if self._key is None else self._key(elemento)
+
+    def _no(self, k):
+        no = self._arvore.raiz
+        while no:
+            if k == no.chave:
+                return no
+            no = no.esquerda if k < no.chave else no.direita
+        return None
+
+    # ---------------- interface de dicionário ----------------
+
+    def __setitem__(self, elemento, valor):
+        k = self._chave(elemento)
+        no = self._no(k)
+        if no:
+            no.valor = (elemento, valor)
+        else:
+            self._arvore.inserir(k, (elemento, valor))
+
+    def __getitem__(self, elemento):
+        no = self._no(self._chave(elemento))
+        if not no:
+            raise KeyError(elemento)
+        return no.valor[1]
+
+    def __delitem__(self, elemento):
+        k = self._chave(elemento)
+        if not self._no(k):
+            raise KeyError(elemento)
+        self._arvore.deletar(k)
+
+    def get(self, elemento, padrao=None):
+        no = self._no(self._chave(elemento))
+        return no.valor[1] if no else padrao
+
+    def pop(self, elemento, *padrao):
+        k = self._chave(elemento)
+        no = self._no(k)
+        if not no:
+            if padrao:
+                return padrao[0]
+            raise KeyError(elemento)
+        valor = no.valor[1]
+        self._arvore.deletar(k)
+        return valor
+
+    def __contains__(self, elemento):
+        return self._no(self._chave(elemento)) is not None
+
+    def __len__(self):
+        return len(self._arvore)
+
+    def __iter__(self):
+        for _, (elemento, _) in self._itens(self._arvore.raiz):
+            yield elemento
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [valor for _, (_, valor) in self._itens(self._arvore.raiz)]
+
+    def items(self):
+        return [par for _, par in self._itens(self._arvore.raiz)]
+
+    def _itens(self, raiz):
+        # (chave de ordenação, par) em ordem crescente, pilha de O(log n)
+        pilha = []
+        no = raiz
+        while pilha or no:
+            while no:
+                pilha.append(no)
+                no = no.esquerda
+            no = pilha.pop()
+            yield no.chave, no.valor
+            no = no.direita
+
+    def irange(self, minimo, maximo):
+        """Pares (elemento, valor) com minimo <= elemento <= maximo, em ordem."""
+        for _, par in self._arvore.iterar_intervalo(self._chave(minimo), self._chave(maximo),
+                                                    com_valores=True):
+            yield par
+
+    def peekitem(self, indice=-1):
+        """Par na posição `indice` da ordem (aceita negativos), O(log n)."""
+        n = len(self)
+        if indice < 0:
+            indice += n
+        if not 0 <= indice < n:
+            raise IndexError("peekitem: índice fora do intervalo")
+        no = self._arvore.raiz
+        while True:
+            tamanho_esq = self._arvore.obter_tamanho(no.esquerda)
+            if indice < tamanho_esq:
+                no = no.esquerda
+            elif indice == tamanho_esq:
+                return no.valor
+            else:
+                indice -= tamanho_esq + 1
+                no = no.direita
+
+    def index(self, elemento):
+        """Quantidade de elementos menores que `elemento`, O(log n)."""
+        return self._arvore.posto(self._chave(elemento))
+
+    # ---------------- consultas de vizinhança ----------------
+
+    def _abaixo(self, k, inclusivo):
+        # nó de maior chave < k (ou <= k se inclusivo)
+        melhor = None
+        no = self._arvore.raiz
+        while no:
+            if no.chave < k or (inclusivo and no.chave == k):
+                melhor = no
+                no = no.direita
+            else:
+                no = no.esquerda
+        return melhor
+
+    def _acima(self, k, inclusivo):
+        # nó de menor chave > k (ou >= k se inclusivo)
+        melhor = None
+        no = self._arvore.raiz
+        while no:
+            if no.chave > k or (inclusivo and no.chave == k):
+                melhor = no
+                no = no.esquerda
+            else:
+                no = no.direita
+        return melhor
+
+    def floor(self, elemento):
+        """Maior elemento <= `elemento`."""
+        no = self._abaixo(self._chave(elemento), True)
+        return no.valor if no else None
+
+    def ceiling(self, elemento):
+        """Menor elemento >= `elemento`."""
+        no = self._acima(self._chave(elemento), True)
+        return no.valor if no else None
+
+    def predecessor(self, elemento):
+        """Maior elemento estritamente menor que `elemento`."""
+        no = self._abaixo(self._chave(elemento), False)
+        return no.valor if no else None
+
+    def successor(self, elemento):
+        """Menor elemento estritamente maior que `elemento`."""
+        no = self._acima(self._chave(elemento), False)
+        return no.valor if no else None
+
+    def _descendo(self, k):
+        # nós com chave <= k em ordem decrescente
+        pilha = []
+        no = self._arvore.raiz
+        while no:
+            if no.chave <= k:
+                pilha.append(no)
+                no = no.direita
+            else:
+                no = no.esquerda
+        while pilha:
+            no = pilha.pop()
+            yield no
+            no = no.esquerda
+            while no:
+                pilha.append(no)
+                no = no.direita
+
+    def _subindo(self, k):
+        # nós com chave > k em ordem crescente
+        pilha = []
+        no = self._arvore.raiz
+        while no:
+            if no.chave > k:
+                pilha.append(no)
+                no = no.esquerda
+            else:
+                no = no.direita
+        while pilha:
+            no = pilha.pop()
+            yield no
+            no = no.direita
+            while no:
+                pilha.append(no)
+                no = no.esquerda
+
+    def nearest(self, elemento, k=1, distancia=None):
+        """
+        Os k pares mais próximos de `elemento`, do mais próximo ao mais
+        distante. `distancia(a, b)` recebe chaves de ordenação e deve crescer
+        com a distância na ordem; o padrão é abs(a - b). Em empate vence o
+        menor elemento.
+        """
+        if distancia is None:
+            distancia = lambda a, b: abs(a - b)
+        alvo = self._chave(elemento)
+        esquerda = self._descendo(alvo)
+        direita = self._subindo(alvo)
+        a = next(esquerda, None)
+        b = next(direita, None)
+        resultado = []
+        while len(resultado) < k and (a or b):
+            if b is None or (a is not None and distancia(a.chave, alvo) <= distancia(b.chave, alvo)):
+                resultado.append(a.valor)
+                a = next(esquerda, None)
+            else:
+                resultado.append(b.valor)
+                b = next(direita, None)
+        return resultado
+
+
+# --- Benchmark: agregação por intervalo x coleta das chaves ---
+def benchmark_intervalos(n=200000, consultas=200, seed=0):
+    rng = random.Random(seed)
+    arvore = ArvoreAVLAgregada()
+    for chave in rng.sample(range(n * 10), n):
+        arvore.inserir(chave, rng.randint(1, 1000))
+    limites = [sorted(rng.sample(range(n * 10), 2)) for _ in range(consultas)]
+
+    t0 = time.perf_counter()
+    lista = [sum(v for _, v in arvore.iterar_intervalo(a, b, com_valores=True))
+             for a, b in limites]
+    t_lista = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    agregado = [arvore.soma_intervalo(a, b) for a, b in limites]
+    t_agreg = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for a, b in limites:
+        arvore.contar_intervalo(a, b)
+    t_contar = time.perf_counter() - t0
+    print(f"n={n}  {consultas} consultas de intervalo (largura média ~{n // 3} chaves)")
+    print(f"iterar + somar    {t_lista / consultas * 1e3:8.3f} ms/consulta")
+    print(f"soma_intervalo    {t_agreg / consultas * 1e3:8.3f} ms/consulta  ({t_lista / t_agreg:.0f}x)")
+    print(f"contar_intervalo  {t_contar / consultas * 1e3:8.3f} ms/consulta")
+    print("Resultados iguais:", lista == agregado)
+
+
+# --- Benchmark: união por split/join x reinserção chave a chave ---
+def benchmark_conjuntos(n=200000, tamanhos=(100, 10000, 100000), seed=0):
+    rng = random.Random(seed)
+    base = sorted(rng.sample(range(n * 10), n))
+    for m in tamanhos:
+        outras = sorted(rng.sample(range(n * 10), m))
+
+        grande = ArvoreAVL.de_ordenados(base)
+        t0 = time.perf_counter()
+        for chave in outras:
+            try:
+                grande.inserir(chave)
+            except ValueError:
+                pass  # chave já presente
+        t_reinserir = time.perf_counter() - t0
+
+        grande = ArvoreAVL.de_ordenados(base)
+        pequena = ArvoreAVL.de_ordenados(outras)
+        t0 = time.perf_counter()
+        uniao = grande.uniao(pequena)
+        t_uniao = time.perf_counter() - t0
+
+        grande = ArvoreAVL.de_ordenados(base)
+        t0 = time.perf_counter()
+        grande.mesclar_ordenados(outras)
+        t_mesclar = time.perf_counter() - t0
+
+        print(f"n={n} m={m:>7d}  reinserção {t_reinserir * 1e3:9.1f} ms"
+              f"  uniao {t_uniao * 1e3:8.1f} ms  mesclar_ordenados {t_mesclar * 1e3:8.1f} ms"
+              f"  (tamanhos {len(uniao)} / {len(grande)})")
+
+
+# --- Benchmark: SortedMap x varredura em ordem (chave cara de calcular) ---
+def benchmark_mapa(n=50000, consultas=500, seed=0):
+    rng = random.Random(seed)
+    chamadas = [0]
+
+    def chave(registro):
+        # simula uma chave custosa: conta as chamadas
+        chamadas[0] += 1
+        return registro[1] * 1.0
+
+    registros = [(f"id{i}", x) for i, x in enumerate(rng.sample(range(n * 10), n))]
+    alvos = [(None, rng.randrange(n * 10)) for _ in range(consultas)]
+
+    t0 = time.perf_counter()
+    mapa = SortedMap(((r, i) for i, r in enumerate(registros)), key=chave)
+    t_construir = time.perf_counter() - t0
+    chamadas_construir = chamadas[0]
+
+    # linha de base: árvore de chaves nuas + varredura em ordem chamando a
+    # chave em cada passo
+    ordenados = [(r, i) for i, r in sorted(enumerate(registros), key=lambda p: p[1][1])]
+
+    def piso_varredura(alvo):
+        k = chave(alvo)
+        melhor = None
+        for r, v in ordenados:
+            if chave(r) > k:
+                break
+            melhor = (r, v)
+        return melhor
+
+    chamadas[0] = 0
+    t0 = time.perf_counter()
+    esperado = [piso_varredura(a) for a in alvos]
+    t_varredura = time.perf_counter() - t0
+    chamadas_varredura = chamadas[0]
+
+    chamadas[0] = 0
+    t0 = time.perf_counter()
+    achados = [mapa.floor(a) for a in alvos]
+    t_mapa = time.perf_counter() - t0
+    chamadas_mapa = chamadas[0]
+
+    t0 = time.perf_counter()
+    for a in alvos:
+        mapa.nearest(a, 10)
+    t_vizinhos = time.perf_counter() - t0
+
+    print(f"n={n}  construção {t_construir:.2f} s ({chamadas_construir} chamadas de key)")
+    print(f"floor por varredura  {t_varredura / consultas * 1e3:8.3f} ms/consulta"
+          f"  {chamadas_varredura / consultas:9.0f} chamadas de key")
+    print(f"SortedMap.floor      {t_mapa / consultas * 1e3:8.3f} ms/consulta"
+          f"  {chamadas_mapa / consultas:9.0f} chamadas de key  ({t_varredura / t_mapa:.0f}x)")
+    print(f"SortedMap.nearest(10) {t_vizinhos / consultas * 1e3:7.3f} ms/consulta")
+    print("Resultados iguais:", achados == esperado)
+
+
+# --- Benchmark: multiconjunto x nós duplicados (BST da Atividade_3) ---
+def benchmark_multiconjunto(eventos=50000, distintas=2000, consultas=200, seed=0):
+    import tracemalloc
+    import Atividade_3
+
+    rng = random.Random(seed)
+    # fluxo enviesado: poucas chaves concentram a maior parte dos eventos
+    universo = rng.sample(range(distintas * 10), distintas)
+    pesos = [1 / (i + 1) for i in range(distintas)]
+    fluxo = rng.choices(universo, weights=pesos, k=eventos)
+    limites = [sorted(rng.sample(range(distintas * 10), 2)) for _ in range(consultas)]
+
+    def construir_bst():
+        arvore = Atividade_3.BinarySearchTree()
+        for chave in fluxo:
+            arvore.insert(chave)
+        return arvore
+
+    def construir_multi():
+        arvore = MultiConjuntoAVL()
+        for chave in fluxo:
+            arvore.inserir(chave)
+        return arvore
+
+    resultados = {}
+    for nome, construir in (("BST duplicados (Atividade_3)", construir_bst),
+                            ("MultiConjuntoAVL", construir_multi)):
+        tracemalloc.start()
+        arvore = construir()
+        memoria = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del arvore
+        t0 = time.perf_counter()
+        arvore = construir()
+        t_construir = time.perf_counter() - t0
+        resultados[nome] = (arvore, memoria, t_construir)
+
+    bst = resultados["BST duplicados (Atividade_3)"][0]
+    multi = resultados["MultiConjuntoAVL"][0]
+
+    def contar_bst(a, b):
+        total = 0
+        for v in bst.iter_from(a):
+            if v > b:
+                break
+            total += 1
+        return total
+
+    t0 = time.perf_counter()
+    esperado = [contar_bst(a, b) for a, b in limites]
+    t_bst = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    achados = [multi.contar_intervalo(a, b) for a, b in limites]
+    t_multi = time.perf_counter() - t0
+
+    print(f"{eventos} eventos, {distintas} chaves distintas")
+    for nome, (arvore, memoria, t_construir) in resultados.items():
+        nos = len(arvore.inorder()) if arvore is bst else arvore.distintas()
+        print(f"{nome:30s} {nos:8d} nós  {memoria / 2**20:7.1f} MiB  inserção {t_construir:.2f} s")
+    print(f"contagem por intervalo: varredura {t_bst / consultas * 1e3:.3f} ms,"
+          f" contar_intervalo {t_multi / consultas * 1e3:.3f} ms por consulta")
+    print("Resultados iguais:", achados == esperado)
+
 
 # --- Bloco de Teste e Demonstração da Atividade AVL ---
-if __name__ == "__main__":
+# (python Atividade_5.py --bench executa os benchmarks)
+if __name__ == "__main__" and "--bench" in sys.argv:
+    benchmark_intervalos()
+    benchmark_conjuntos()
+    benchmark_mapa()
+    benchmark_multiconjunto()
+elif __name__ == "__main__":
     arvore_avl = ArvoreAVL()
     
     print("\n--- ATIVIDADE PRÁTICA: ÁRVORE AVL ---")
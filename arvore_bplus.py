@@ -0,0 +1,453 @@
+# -*- coding: utf-8 -*-
+# arvore_bplus.py
+# Árvore B+ em disco com a mesma interface da ArvoreAVL (Atividade_5):
+# inserir, deletar, encontrar_nos_intervalo e obter_profundidade_no.
+# As páginas têm tamanho fixo num arquivo local; um cache LRU de tamanho
+# configurável guarda as páginas mais usadas e as folhas são encadeadas para
+# varreduras de intervalo sequenciais.
+
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+MAGIC = b"BMAI"
+VERSAO = 1
+
+_META = struct.Struct("<4sHxxIIIQII")  # magic, versao, tam_pagina, raiz, niveis, n, livre, total
+_CAB_PAGINA = struct.Struct("<BxHI")     # tipo, quantidade de chaves, próxima folha/livre
+_FOLHA = 0
+_INTERNA = 1
+_LIVRE = 2
+_NENHUMA = 0  # página 0 é a de metadados: serve como "ponteiro nulo"
+
+
+class _Pagina:
+    """Página em memória: chaves, filhos (internas) e próxima folha."""
+    __slots__ = ("id", "folha", "chaves", "filhos", "proxima", "suja")
+
+    def __init__(self, id, folha, chaves=None, filhos=None, proxima=_NENHUMA):
+        self.id = id
+        self.folha = folha
+        self.chaves = chaves if chaves is not None else []
+        self.filhos = filhos if filhos is not None else []
+        self.proxima = proxima
+        self.suja = True
+
+
+class ArvoreBMais:
+    """
+    Árvore B+ persistente. Se `caminho` já existir, a árvore é reaberta;
+    `tamanho_pagina` e `tipo_chave` ('q' inteiros, 'd' floats) valem só na
+    criação. `paginas_cache` é o número máximo de páginas mantidas em memória.
+    Os contadores `leituras` e `escritas` registram as páginas lidas e
+    gravadas no arquivo.
+
+    Durabilidade: páginas alteradas ficam no cache até serem despejadas ou
+    até `sincronizar`/`fechar`. Quando a raiz muda (divisão ou colapso) a
+    árvore é sincronizada, para que os metadados no disco nunca apontem para
+    uma raiz que ainda não foi gravada. Fora isso a árvore não é à prova de
+    falhas: um processo interrompido perde as alterações desde a última
+    sincronização, e o arquivo pode ficar inconsistente se a queda ocorrer
+    no meio de um despejo.
+    """
+    def __init__(self, caminho, tamanho_pagina=4096, paginas_cache=256, tipo_chave="q"):
+        if paginas_cache < 4:
+            raise ValueError("paginas_cache deve ser >= 4")
+        self.caminho = caminho
+        self.paginas_cache = paginas_cache
+        self.tipo_chave = tipo_chave
+        self._cache = OrderedDict()
+        self.leituras = 0
+        self.escritas = 0
+        if os.path.exists(caminho) and os.path.getsize(caminho) > 0:
+            self._arquivo = open(caminho, "r+b")
+            self._ler_meta()
+        else:
+            if tamanho_pagina < 64:
+                raise ValueError("tamanho_pagina deve ser >= 64")
+            self._arquivo = open(caminho, "w+b")
+            self.tamanho_pagina = tamanho_pagina
+            self.n = 0
+            self.niveis = 1
+            self.livre = _NENHUMA
+            self.total_paginas = 1
+            raiz = self._nova_pagina(folha=True)
+            self.raiz = raiz.id
+            self._gravar_meta()
+        cabecalho = _CAB_PAGINA.size
+        self._max_folha = (self.tamanho_pagina - cabecalho) // 8
+        self._max_interna = (self.tamanho_pagina - cabecalho - 4) // 12
+
+    # ===============================================================
+    # ARQUIVO E CACHE DE PÁGINAS
+    # ===============================================================
+
+    def _ler_meta(self):
+        self._arquivo.seek(0)
+        dados = self._arquivo.read(_META.size + 1)
+        magic, versao, tam, raiz, niveis, n, livre, total = _META.unpack_from(dados, 0)
+        if magic != MAGIC:
+            raise ValueError("Arquivo não é uma árvore B+ deste formato")
+        if versao != VERSAO:
+            raise ValueError(f"Versão de formato não suportada: {versao}")
+        self.tipo_chave = chr(dados[_META.size]) if len(dados) > _META.size else "q"
+        self.tamanho_pagina = tam
+        self.raiz = raiz
+        self.niveis = niveis
+        self.n = n
+        self.livre = livre
+        self.total_paginas = total
+
+    def _gravar_meta(self):
+        dados = _META.pack(MAGIC, VERSAO, self.tamanho_pagina, self.raiz, self.niveis,
+                           self.n, self.livre, self.total_paginas) + self.tipo_chave.encode()
+        self._arquivo.seek(0)
+        self._arquivo.write(dados.ljust(self.tamanho_pagina, b"\0"))
+
+    def _ler_pagina(self, pid):
+        self._arquivo.seek(pid * self.tamanho_pagina)
+        dados = self._arquivo.read(self.tamanho_pagina)
+        self.leituras += 1
+        tipo, qtd, proxima = _CAB_PAGINA.unpack_from(dados, 0)
+        if tipo == _LIVRE:
+            raise ValueError(f"Página {pid} está na lista livre")
+        pos = _CAB_PAGINA.size
+        chaves = array(self.tipo_chave)
+        chaves.frombytes(dados[pos:pos + 8 * qtd])
+        if sys.byteorder != "little":
+            chaves.byteswap()
+        pagina = _Pagina(pid, tipo == _FOLHA, chaves.tolist(), proxima=proxima)
+        if tipo == _INTERNA:
+            pos += 8 * qtd
+            filhos = array("I")
+            filhos.frombytes(dados[pos:pos + 4 * (qtd + 1)])
+            if sys.byteorder != "little":
+                filhos.byteswap()
+            pagina.filhos = filhos.tolist()
+        pagina.suja = False
+        return pagina
+
+    def _gravar_pagina(self, pagina):
+        chaves = array(self.tipo_chave, pagina.chaves)
+        partes = [_CAB_PAGINA.pack(_FOLHA if pagina.folha else _INTERNA,
+                                   len(pagina.chaves), pagina.proxima)]
+        filhos = array("I", pagina.filhos) if not pagina.folha else None
+        if sys.byteorder != "little":
+            chaves.byteswap()
+            if filhos is not None:
+                filhos.byteswap()
+        partes.append(chaves.tobytes())
+        if filhos is not None:
+            partes.append(filhos.tobytes())
+        self._arquivo.seek(pagina.id * self.tamanho_pagina)
+        self._arquivo.write(b"".join(partes).ljust(self.tamanho_pagina, b"\0"))
+        self.escritas += 1
+        pagina.suja = False
+
+    def _obter(self, pid):
+        pagina = self._cache.get(pid)
+        if pagina is not None:
+            self._cache.move_to_end(pid)
+            return pagina
+        pagina = self._ler_pagina(pid)
+        self._cache[pid] = pagina
+        return pagina
+
+    def _ajustar_cache(self):
+        # só roda entre operações (ou entre folhas de uma varredura): as
+        # páginas do caminho atual nunca são despejadas no meio de uma alteração
+        while len(self._cache) > self.paginas_cache:
+            _, pagina = self._cache.popitem(last=False)
+            if pagina.suja:
+                self._gravar_pagina(pagina)
+
+    def _nova_pagina(self, folha):
+        if self.livre != _NENHUMA:
+            pid = self.livre
+            self._arquivo.seek(pid * self.tamanho_pagina)
+            dados = self._arquivo.read(_CAB_PAGINA.size)
+            self.leituras += 1
+            self.livre = _CAB_PAGINA.unpack(dados)[2]
+        else:
+            pid = self.total_paginas
+            self.total_paginas += 1
+        pagina = _Pagina(pid, folha)
+        self._cache[pid] = pagina
+        return pagina
+
+    def _liberar_pagina(self, pagina):
+        self._cache.pop(pagina.id, None)
+        self._arquivo.seek(pagina.id * self.tamanho_pagina)
+        self._arquivo.write(_CAB_PAGINA.pack(_LIVRE, 0, self.livre).ljust(self.tamanho_pagina, b"\0"))
+        self.escritas += 1
+        self.livre = pagina.id
+
+    def sincronizar(self):
+        """Grava páginas sujas e metadados no arquivo."""
+        for pagina in self._cache.values():
+            if pagina.suja:
+                self._gravar_pagina(pagina)
+        self._gravar_meta()
+        self._arquivo.flush()
+
+    def fechar(self):
+        if not self._arquivo.closed:
+            self.sincronizar()
+            self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    # ===============================================================
+    # BUSCA
+    # ===============================================================
+
+    def _descer(self, chave):
+        """Retorna o caminho [(página, índice do filho)] e a folha da chave."""
+        caminho = []
+        pagina = self._obter(self.raiz)
+        while not pagina.folha:
+            i = bisect_right(pagina.chaves, chave)
+            caminho.append((pagina, i))
+            pagina = self._obter(pagina.filhos[i])
+        return caminho, pagina
+
+    def __len__(self):
+        return self.n
+
+    def __contains__(self, chave):
+        _, folha = self._descer(chave)
+        i = bisect_left(folha.chaves, chave)
+        achou = i < len(folha.chaves) and folha.chaves[i] == chave
+        self._ajustar_cache()
+        return achou
+
+    buscar = __contains__
+
+    def iterar_intervalo(self, chave1, chave2):
+        """Gera as chaves de [chave1, chave2] percorrendo as folhas encadeadas."""
+        _, folha = self._descer(chave1)
+        i = bisect_left(folha.chaves, chave1)
+        while True:
+            chaves = folha.chaves
+            while i < len(chaves):
+                if chaves[i] > chave2:
+                    self._ajustar_cache()
+                    return
+                yield chaves[i]
+                i += 1
+            if folha.proxima == _NENHUMA:
+                self._ajustar_cache()
+                return
+            folha = self._obter(folha.proxima)
+            # despeja a cada folha: a atual acabou de ir para o fim da LRU e
+            # é a única que a varredura precisa manter em memória
+            self._ajustar_cache()
+            i = 0
+
+    def encontrar_nos_intervalo(self, chave1, chave2):
+        """Retorna todas as chaves no intervalo [chave1, chave2]."""
+        return list(self.iterar_intervalo(chave1, chave2))
+
+    def obter_profundidade_no(self, chave):
+        """
+        Profundidade da folha que contém a chave (todas as folhas ficam no
+        mesmo nível numa árvore B+), ou -1 se a chave não existir.
+        """
+        return self.niveis - 1 if chave in self else -1
+
+    # ===============================================================
+    # INSERÇÃO
+    # ===============================================================
+
+    def inserir(self, chave):
+        """Insere uma chave; chaves duplicadas geram ValueError (como a AVL)."""
+        raiz_antes = self.raiz
+        caminho, folha = self._descer(chave)
+        i = bisect_left(folha.chaves, chave)
+        if i < len(folha.chaves) and folha.chaves[i] == chave:
+            self._ajustar_cache()
+            raise ValueError("Chave duplicada não permitida na árvore B+.")
+        folha.chaves.insert(i, chave)
+        folha.suja = True
+        self.n += 1
+
+        # divide páginas cheias de baixo para cima
+        pagina = folha
+        while True:
+            if pagina.folha and len(pagina.chaves) <= self._max_folha:
+                break
+            if not pagina.folha and len(pagina.chaves) <= self._max_interna:
+                break
+            nova = self._nova_pagina(pagina.folha)
+            meio = len(pagina.chaves) // 2
+            if pagina.folha:
+                nova.chaves = pagina.chaves[meio:]
+                del pagina.chaves[meio:]
+                nova.proxima = pagina.proxima
+                pagina.proxima = nova.id
+                separador = nova.chaves[0]
+            else:
+                separador = pagina.chaves[meio]
+                nova.chaves = pagina.chaves[meio + 1:]
+                nova.filhos = pagina.filhos[meio + 1:]
+                del pagina.chaves[meio:]
+                del pagina.filhos[meio + 1:]
+            pagina.suja = True
+            if not caminho:
+                raiz = self._nova_pagina(folha=False)
+                raiz.chaves = [separador]
+                raiz.filhos = [pagina.id, nova.id]
+                self.raiz = raiz.id
+                self.niveis += 1
+                break
+            pai, j = caminho.pop()
+            pai.chaves.insert(j, separador)
+            pai.filhos.insert(j + 1, nova.id)
+            pai.suja = True
+            pagina = pai
+        if self.raiz != raiz_antes:
+            self.sincronizar()
+        self._ajustar_cache()
+
+    # ===============================================================
+    # DELEÇÃO
+    # ===============================================================
+
+    def deletar(self, chave):
+        """Remove a chave, se existir (como ArvoreAVL.deletar)."""
+        raiz_antes = self.raiz
+        caminho, folha = self._descer(chave)
+        i = bisect_left(folha.chaves, chave)
+        if i == len(folha.chaves) or folha.chaves[i] != chave:
+            self._ajustar_cache()
+            return
+        del folha.chaves[i]
+        folha.suja = True
+        self.n -= 1
+
+        # corrige páginas abaixo da ocupação mínima emprestando de um irmão
+        # ou fundindo com ele; sobe enquanto o pai ficar pequeno demais
+        pagina = folha
+        while caminho:
+            minimo = (self._max_folha if pagina.folha else self._max_interna) // 2
+            if len(pagina.chaves) >= minimo:
+                break
+            pai, j = caminho.pop()
+            if j > 0:
+                esquerda = self._obter(pai.filhos[j - 1])
+                if len(esquerda.chaves) > minimo:
+                    self._emprestar_da_esquerda(pai, j, esquerda, pagina)
+                    break
+                self._fundir(pai, j - 1, esquerda, pagina)
+            else:
+                direita = self._obter(pai.filhos[j + 1])
+                if len(direita.chaves) > minimo:
+                    self._emprestar_da_direita(pai, j, pagina, direita)
+                    break
+                self._fundir(pai, j, pagina, direita)
+            pagina = pai
+
+        raiz = self._obter(self.raiz)
+        if not raiz.folha and not raiz.chaves:
+            # raiz interna sem chaves: o único filho vira a raiz
+            self.raiz = raiz.filhos[0]
+            self.niveis -= 1
+            self._liberar_pagina(raiz)
+        if self.raiz != raiz_antes:
+            self.sincronizar()
+        self._ajustar_cache()
+
+    def _emprestar_da_esquerda(self, pai, j, esquerda, pagina):
+        if pagina.folha:
+            pagina.chaves.insert(0, esquerda.chaves.pop())
+            pai.chaves[j - 1] = pagina.chaves[0]
+        else:
+            pagina.chaves.insert(0, pai.chaves[j - 1])
+            pai.chaves[j - 1] = esquerda.chaves.pop()
+            pagina.filhos.insert(0, esquerda.filhos.pop())
+        esquerda.suja = pagina.suja = pai.suja = True
+
+    def _emprestar_da_direita(self, pai, j, pagina, direita):
+        if pagina.folha:
+            pagina.chaves.append(direita.chaves.pop(0))
+            pai.chaves[j] = direita.chaves[0]
+        else:
+            pagina.chaves.append(pai.chaves[j])
+            pai.chaves[j] = direita.chaves.pop(0)
+            pagina.filhos.append(direita.filhos.pop(0))
+        direita.suja = pagina.suja = pai.suja = True
+
+    def _fundir(self, pai, j, esquerda, direita):
+        # junta `direita` (filho j + 1) em `esquerda` (filho j)
+        if esquerda.folha:
+            esquerda.chaves.extend(direita.chaves)
+            esquerda.proxima = direita.proxima
+        else:
+            esquerda.chaves.append(pai.chaves[j])
+            esquerda.chaves.extend(direita.chaves)
+            esquerda.filhos.extend(direita.filhos)
+        del pai.chaves[j]
+        del pai.filhos[j + 1]
+        esquerda.suja = pai.suja = True
+        self._liberar_pagina(direita)
+
+
+# --- Benchmark: E/S por operação x ArvoreAVL em memória ---
+def benchmark_bplus(n=100000, consultas=10000, caches=(16, 1024), seed=0):
+    from Atividade_5 import ArvoreAVL
+
+    rng = random.Random(seed)
+    chaves = rng.sample(range(n * 10), n)
+    buscas = [rng.randrange(n * 10) for _ in range(consultas)]
+    intervalos = [(a, a + n // 10) for a in (rng.randrange(n * 10) for _ in range(100))]
+
+    avl = ArvoreAVL()
+    t0 = time.perf_counter()
+    for c in chaves:
+        avl.inserir(c)
+    t_ins = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for q in buscas:
+        avl.obter_profundidade_no(q)
+    t_busca = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for a, b in intervalos:
+        avl.encontrar_nos_intervalo(a, b)
+    t_int = time.perf_counter() - t0
+    print(f"n={n}  ArvoreAVL em memória: inserir {n / t_ins / 1e3:.1f} mil/s,"
+          f" busca {consultas / t_busca / 1e3:.1f} mil/s, intervalo {t_int / 100 * 1e3:.2f} ms")
+
+    for paginas in caches:
+        with tempfile.TemporaryDirectory() as pasta:
+            with ArvoreBMais(os.path.join(pasta, "arvore.bpt"), paginas_cache=paginas) as arvore:
+                medidas = []
+                for nome, operacoes, fn in (
+                        ("inserir", n, lambda: [arvore.inserir(c) for c in chaves]),
+                        ("busca", consultas, lambda: [arvore.obter_profundidade_no(q) for q in buscas]),
+                        ("intervalo", len(intervalos),
+                         lambda: [arvore.encontrar_nos_intervalo(a, b) for a, b in intervalos]),
+                        ("deletar", n // 2, lambda: [arvore.deletar(c) for c in chaves[::2]])):
+                    l0, e0 = arvore.leituras, arvore.escritas
+                    t0 = time.perf_counter()
+                    fn()
+                    dt = time.perf_counter() - t0
+                    medidas.append(f"{nome:9s} {operacoes / dt / 1e3:7.1f} mil/s"
+                                   f" ({(arvore.leituras - l0) / operacoes:5.2f} leit."
+                                   f" {(arvore.escritas - e0) / operacoes:5.2f} escr./op)")
+                print(f"ArvoreBMais cache={paginas:5d} páginas, {arvore.niveis} níveis:")
+                for m in medidas:
+                    print("   ", m)
+
+
+if __name__ == "__main__":
+    benchmark_bplus(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
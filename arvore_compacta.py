@@ -0,0 +1,350 @@
+# arvore_compacta.py
+# Arvores BST e AVL com armazenamento "struct-of-arrays": em vez de um objeto
+# por nodo, chaves, filhos e alturas ficam em buffers do modulo `array`.
+# Um nodo e apenas um indice (slot); NIL (-1) representa filho ausente.
+# Slots de nodos removidos entram numa lista livre encadeada pelo vetor
+# `left` e sao reutilizados nas proximas insercoes.
+
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+
+NIL = -1
+
+
+class ArrayBST:
+    """
+    Arvore Binaria de Busca (sem duplicados, como Atividade_2) sobre vetores.
+    `typecode` define o tipo das chaves: 'q' (inteiros de 64 bits) ou 'd'.
+    """
+    def __init__(self, typecode="q"):
+        self.keys = array(typecode)
+        self.left = array("i")
+        self.right = array("i")
+        self.root = NIL
+        self.free = NIL   # primeiro slot livre (encadeado por `left`)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    # Aloca um slot, reaproveitando a lista livre quando possivel
+    def _new_node(self, value):
+        slot = self.free
+        if slot != NIL:
+            self.free = self.left[slot]
+            self.keys[slot] = value
+            self.left[slot] = NIL
+            self.right[slot] = NIL
+        else:
+            slot = len(self.keys)
+            self.keys.append(value)
+            self.left.append(NIL)
+            self.right.append(NIL)
+        self.size += 1
+        return slot
+
+    def _free_node(self, slot):
+        self.left[slot] = self.free
+        self.right[slot] = NIL
+        self.free = slot
+        self.size -= 1
+
+    # Insercao iterativa; duplicados sao ignorados
+    def insert(self, value):
+        keys, left, right = self.keys, self.left, self.right
+        node = self.root
+        if node == NIL:
+            self.root = self._new_node(value)
+            return
+        while True:
+            k = keys[node]
+            if value < k:
+                if left[node] == NIL:
+                    left[node] = self._new_node(value)
+                    return
+                node = left[node]
+            elif value > k:
+                if right[node] == NIL:
+                    right[node] = self._new_node(value)
+                    return
+                node = right[node]
+            else:
+                return
+
+    # Busca: retorna o slot do valor ou None
+    def search(self, value):
+        keys, left, right = self.keys, self.left, self.right
+        node = self.root
+        while node != NIL:
+            k = keys[node]
+            if value == k:
+                return node
+            node = left[node] if value < k else right[node]
+        return None
+
+    def __contains__(self, value):
+        return self.search(value) is not None
+
+    # Remocao iterativa; o slot liberado vai para a lista livre
+    def delete(self, value):
+        keys, left, right = self.keys, self.left, self.right
+        parent = NIL
+        node = self.root
+        while node != NIL and keys[node] != value:
+            parent = node
+            node = left[node] if value < keys[node] else right[node]
+        if node == NIL:
+            return
+        if left[node] != NIL and right[node] != NIL:
+            succ_parent = node
+            succ = right[node]
+            while left[succ] != NIL:
+                succ_parent = succ
+                succ = left[succ]
+            keys[node] = keys[succ]
+            parent, node = succ_parent, succ
+        child = left[node] if left[node] != NIL else right[node]
+        if parent == NIL:
+            self.root = child
+        elif left[parent] == node:
+            left[parent] = child
+        else:
+            right[parent] = child
+        self._free_node(node)
+
+    # Altura (arvore vazia = -1, como Atividade_2)
+    def height(self):
+        if self.root == NIL:
+            return -1
+        left, right = self.left, self.right
+        altura = -1
+        nivel = [self.root]
+        while nivel:
+            altura += 1
+            nivel = [f for n in nivel for f in (left[n], right[n]) if f != NIL]
+        return altura
+
+    # Percurso em ordem (gerador com pilha explicita)
+    def inorder(self):
+        keys, left, right = self.keys, self.left, self.right
+        stack = []
+        node = self.root
+        while stack or node != NIL:
+            while node != NIL:
+                stack.append(node)
+                node = left[node]
+            node = stack.pop()
+            yield keys[node]
+            node = right[node]
+
+    # Bytes ocupados pelos buffers (sem contar a lista livre de objetos Python)
+    def nbytes(self):
+        return sum(buf.itemsize * len(buf) for buf in (self.keys, self.left, self.right))
+
+
+class ArrayAVL(ArrayBST):
+    """
+    Arvore AVL sobre vetores. Alturas ficam em `heights` (folha = 1, NIL = 0,
+    mesma convencao de Atividade_4/5). Insercao e remocao sao iterativas,
+    guardando o caminho percorrido numa pilha de slots.
+    """
+    def __init__(self, typecode="q"):
+        super().__init__(typecode)
+        self.heights = array("b")
+
+    def _new_node(self, value):
+        slot = super()._new_node(value)
+        if slot == len(self.heights):
+            self.heights.append(1)
+        else:
+            self.heights[slot] = 1
+        return slot
+
+    def _h(self, node):
+        return 0 if node == NIL else self.heights[node]
+
+    def _update(self, node):
+        hl = self._h(self.left[node])
+        hr = self._h(self.right[node])
+        self.heights[node] = 1 + (hl if hl > hr else hr)
+
+    def _rotate_right(self, y):
+        x = self.left[y]
+        self.left[y] = self.right[x]
+        self.right[x] = y
+        self._update(y)
+        self._update(x)
+        return x
+
+    def _rotate_left(self, x):
+        y = self.right[x]
+        self.right[x] = self.left[y]
+        self.left[y] = x
+        self._update(x)
+        self._update(y)
+        return y
+
+    # Rebalanceia um nodo e retorna a nova raiz da subarvore
+    def _rebalance(self, node):
+        self._update(node)
+        balance = self._h(self.left[node]) - self._h(self.right[node])
+        if balance > 1:
+            child = self.left[node]
+            if self._h(self.left[child]) < self._h(self.right[child]):
+                self.left[node] = self._rotate_left(child)
+            return self._rotate_right(node)
+        if balance < -1:
+            child = self.right[node]
+            if self._h(self.right[child]) < self._h(self.left[child]):
+                self.right[node] = self._rotate_right(child)
+            return self._rotate_left(node)
+        return node
+
+    # Sobe pelo caminho rebalanceando e religando cada subarvore ao pai
+    def _fix_path(self, path):
+        left = self.left
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            new_root = self._rebalance(node)
+            if i == 0:
+                self.root = new_root
+            elif new_root != node:
+                parent = path[i - 1]
+                if left[parent] == node:
+                    left[parent] = new_root
+                else:
+                    self.right[parent] = new_root
+
+    def insert(self, value):
+        keys, left, right = self.keys, self.left, self.right
+        if self.root == NIL:
+            self.root = self._new_node(value)
+            return
+        path = []
+        node = self.root
+        while node != NIL:
+            path.append(node)
+            k = keys[node]
+            if value < k:
+                node = left[node]
+            elif value > k:
+                node = right[node]
+            else:
+                return
+        parent = path[-1]
+        if value < keys[parent]:
+            left[parent] = self._new_node(value)
+        else:
+            right[parent] = self._new_node(value)
+        self._fix_path(path)
+
+    def delete(self, value):
+        keys, left, right = self.keys, self.left, self.right
+        path = []
+        node = self.root
+        while node != NIL and keys[node] != value:
+            path.append(node)
+            node = left[node] if value < keys[node] else right[node]
+        if node == NIL:
+            return
+        if left[node] != NIL and right[node] != NIL:
+            # copia o sucessor e remove o slot dele
+            path.append(node)
+            target = node
+            node = right[node]
+            while left[node] != NIL:
+                path.append(node)
+                node = left[node]
+            keys[target] = keys[node]
+        child = left[node] if left[node] != NIL else right[node]
+        if not path:
+            self.root = child
+        elif left[path[-1]] == node:
+            left[path[-1]] = child
+        else:
+            right[path[-1]] = child
+        self._free_node(node)
+        if path:
+            self._fix_path(path)
+
+    # Altura O(1) a partir da raiz (arvore vazia = 0, como Atividade_4/5)
+    def height(self):
+        return self._h(self.root)
+
+    def nbytes(self):
+        return super().nbytes() + self.heights.itemsize * len(self.heights)
+
+
+# -------------------------------
+# Benchmark de memoria (tracemalloc)
+# -------------------------------
+def _measure(build):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = build()
+    current = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return obj, current
+
+
+def benchmark_memory(n=200000, seed=0):
+    # as arvores de referencia so entram no benchmark: importar este modulo
+    # continua leve
+    import Atividade_2
+    import Atividade_5
+
+    valores = random.Random(seed).sample(range(n * 10), n)
+
+    def bst(node_class):
+        def build():
+            t = Atividade_2.BinarySearchTree()
+            t.node_class = node_class
+            for v in valores:
+                t.insert(v)
+            return t
+        return build
+
+    def avl(classe_no):
+        def build():
+            t = Atividade_5.ArvoreAVL()
+            t.classe_no = classe_no
+            for v in valores:
+                t.inserir(v)
+            return t
+        return build
+
+    def compact(cls):
+        def build():
+            t = cls()
+            for v in valores:
+                t.insert(v)
+            return t
+        return build
+
+    cases = [
+        ("BST Node (Atividade_2)", bst(Atividade_2.Node)),
+        ("BST SlotNode", bst(Atividade_2.SlotNode)),
+        ("ArrayBST", compact(ArrayBST)),
+        ("AVL No (Atividade_5)", avl(Atividade_5.No)),
+        ("AVL NoCompacto", avl(Atividade_5.NoCompacto)),
+        ("ArrayAVL", compact(ArrayAVL)),
+    ]
+    # os objetos int ja existem em `valores` e nao entram na conta
+    print(f"n = {n} chaves inteiras")
+    for nome, build in cases:
+        tree, mem = _measure(build)
+        del tree
+        # tempo medido sem tracemalloc, que encarece cada alocacao
+        t0 = time.perf_counter()
+        tree = build()
+        elapsed = time.perf_counter() - t0
+        print(f"{nome:24s} {mem / 2**20:8.1f} MiB  {mem / n:6.1f} B/chave  insercao {elapsed:.2f} s")
+        del tree
+
+
+if __name__ == "__main__":
+    benchmark_memory(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,410 @@
+# arvore_concorrente.py
+# Mapa ordenado seguro para threads sobre a ArvoreAVL (Atividade_5).
+# Leituras compartilham uma trava de leitores-escritor; escritas entram numa
+# fila e sao aplicadas em lote, varias de uma vez, sob uma unica aquisicao
+# exclusiva da trava. A trava conta quantas aquisicoes precisaram esperar.
+
+import random
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from Atividade_5 import ArvoreAVL, NoMapa
+
+
+class _ArvoreValores(ArvoreAVL):
+    # nos sem resumos de soma/minimo/maximo: os valores do mapa podem ser
+    # objetos quaisquer (dict, str, None...), guardados como vieram
+    classe_no = NoMapa
+
+
+class TravaLeituraEscrita:
+    """
+    Trava de leitores-escritor com preferencia para escritores: um leitor
+    novo espera se ha escritor ativo ou aguardando, evitando que um fluxo
+    continuo de leituras bloqueie as escritas para sempre.
+    """
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._leitores = 0
+        self._escritor = False
+        self._escritores_esperando = 0
+        # metricas de contencao
+        self.aquisicoes = 0
+        self.esperas = 0          # aquisicoes que nao foram imediatas
+        self.tempo_espera = 0.0   # segundos somados de espera
+
+    def _registrar_espera(self, t0):
+        self.esperas += 1
+        self.tempo_espera += time.perf_counter() - t0
+
+    def adquirir_leitura(self):
+        with self._cond:
+            self.aquisicoes += 1
+            if self._escritor or self._escritores_esperando:
+                t0 = time.perf_counter()
+                while self._escritor or self._escritores_esperando:
+                    self._cond.wait()
+                self._registrar_espera(t0)
+            self._leitores += 1
+
+    def liberar_leitura(self):
+        with self._cond:
+            self._leitores -= 1
+            if not self._leitores and self._escritores_esperando:
+                self._cond.notify_all()
+
+    def adquirir_escrita(self):
+        with self._cond:
+            self.aquisicoes += 1
+            if self._escritor or self._leitores:
+                t0 = time.perf_counter()
+                self._escritores_esperando += 1
+                try:
+                    while self._escritor or self._leitores:
+                        self._cond.wait()
+                finally:
+                    self._escritores_esperando -= 1
+                self._registrar_espera(t0)
+            self._escritor = True
+
+    def liberar_escrita(self):
+        with self._cond:
+            self._escritor = False
+            self._cond.notify_all()
+
+    @contextmanager
+    def leitura(self):
+        self.adquirir_leitura()
+        try:
+            yield
+        finally:
+            self.liberar_leitura()
+
+    @contextmanager
+    def escrita(self):
+        self.adquirir_escrita()
+        try:
+            yield
+        finally:
+            self.liberar_escrita()
+
+    def contencao(self):
+        """Fracao das aquisicoes que precisaram esperar."""
+        return self.esperas / self.aquisicoes if self.aquisicoes else 0.0
+
+
+_INSERIR = 0
+_DELETAR = 1
+
+
+class MapaConcorrente:
+    """
+    Mapa chave -> valor ordenado, seguro para varias threads.
+
+    `inserir`/`deletar` apenas enfileiram a operacao; a fila e aplicada
+    quando atinge `tamanho_lote` ou em `aplicar_pendentes()`. Com
+    `ler_pendentes=True` (padrao) toda leitura drena a fila antes, de modo
+    que uma thread sempre le as proprias escritas; com False as leituras
+    veem apenas lotes ja aplicados e as escritas rendem lotes maiores.
+    Inserir uma chave existente substitui o valor no proprio no. Os valores
+    podem ser objetos quaisquer; `agregar_intervalo` so existe passando
+    `arvore=ArvoreAVLAgregada()` (valores numericos).
+
+    Chaves que nao se comparam com as do mapa (ex.: str num mapa de int)
+    geram TypeError ja em `inserir`/`deletar`, na thread que as enviou, em
+    vez de falharem depois em quem drenar a fila.
+    """
+    def __init__(self, arvore=None, tamanho_lote=256, ler_pendentes=True):
+        self.arvore = arvore if arvore is not None else _ArvoreValores()
+        self.trava = TravaLeituraEscrita()
+        self.tamanho_lote = tamanho_lote
+        self.ler_pendentes = ler_pendentes
+        self._fila = deque()  # append/popleft de deque sao atomicos
+        self.lotes = 0
+        self.operacoes_em_lote = 0
+        # uma chave ja aceita, para testar se as novas se comparam com ela
+        self._exemplo = self.arvore.raiz.chave if self.arvore.raiz else None
+        self._trava_exemplo = threading.Lock()
+
+    # ---------------- escrita ----------------
+
+    def _validar_chave(self, chave):
+        exemplo = self._exemplo
+        if exemplo is None:
+            with self._trava_exemplo:
+                if self._exemplo is None:
+                    self._exemplo = chave
+                    return
+                exemplo = self._exemplo
+        try:
+            chave < exemplo
+        except TypeError:
+            raise TypeError(f"Chave {chave!r} ({type(chave).__name__}) não é comparável com"
+                            f" as chaves do mapa ({type(exemplo).__name__})") from None
+
+    def inserir(self, chave, valor=None):
+        self._validar_chave(chave)
+        self._fila.append((_INSERIR, chave, valor))
+        if len(self._fila) >= self.tamanho_lote:
+            self.aplicar_pendentes()
+
+    def deletar(self, chave):
+        self._validar_chave(chave)
+        self._fila.append((_DELETAR, chave, None))
+        if len(self._fila) >= self.tamanho_lote:
+            self.aplicar_pendentes()
+
+    def aplicar_lote(self, operacoes):
+        """
+        Aplica uma sequencia de ("inserir", chave, valor) / ("deletar", chave)
+        numa unica aquisicao da trava, depois do que ja estiver na fila. Uma
+        operacao invalida rejeita o lote inteiro antes de qualquer escrita.
+        """
+        lote = []
+        for op in operacoes:
+            if op[0] == "inserir":
+                self._validar_chave(op[1])
+                lote.append((_INSERIR, op[1], op[2] if len(op) > 2 else None))
+            elif op[0] == "deletar":
+                self._validar_chave(op[1])
+                lote.append((_DELETAR, op[1], None))
+            else:
+                raise ValueError(f"Operação desconhecida: {op[0]!r}")
+        with self.trava.escrita():
+            # fila e lote na mesma secao critica: nenhum aplicar_pendentes
+            # concorrente intercala escritas no meio do lote
+            self._drenar(lote)
+
+    def aplicar_pendentes(self):
+        """Drena a fila sob uma unica aquisicao exclusiva da trava."""
+        if not self._fila:
+            return
+        with self.trava.escrita():
+            self._drenar(())
+
+    def _drenar(self, lote):
+        # chamado com a trava de escrita: so quem a tem retira da fila
+        fila = self._fila
+        aplicadas = 0
+        try:
+            while fila:
+                self._aplicar(*fila.popleft())
+                aplicadas += 1
+            for op in lote:
+                self._aplicar(*op)
+                aplicadas += 1
+        finally:
+            if aplicadas:
+                self.lotes += 1
+                self.operacoes_em_lote += aplicadas
+
+    def _aplicar(self, op, chave, valor):
+        arvore = self.arvore
+        if op == _DELETAR:
+            arvore.deletar(chave)
+            return
+        # chave existente: troca o valor no no e refaz os resumos do caminho
+        # (ArvoreAVLAgregada), sem deletar e reinserir
+        caminho = []
+        no = arvore.raiz
+        while no:
+            caminho.append(no)
+            if chave == no.chave:
+                no.valor = valor
+                for no in reversed(caminho):
+                    arvore._atualizar_altura(no)
+                return
+            no = no.esquerda if chave < no.chave else no.direita
+        arvore.inserir(chave, valor)
+
+    # ---------------- leitura ----------------
+
+    # cada leitura drena a fila antes e segura a trava compartilhada
+    def _entrar_leitura(self):
+        if self.ler_pendentes and self._fila:
+            self.aplicar_pendentes()
+        self.trava.adquirir_leitura()
+
+    def obter(self, chave, padrao=None):
+        self._entrar_leitura()
+        try:
+            no = self.arvore.raiz
+            while no:
+                if chave == no.chave:
+                    return no.valor
+                no = no.esquerda if chave < no.chave else no.direita
+            return padrao
+        finally:
+            self.trava.liberar_leitura()
+
+    def __contains__(self, chave):
+        self._entrar_leitura()
+        try:
+            return self.arvore.obter_profundidade_no(chave) >= 0
+        finally:
+            self.trava.liberar_leitura()
+
+    def __len__(self):
+        self._entrar_leitura()
+        try:
+            return len(self.arvore)
+        finally:
+            self.trava.liberar_leitura()
+
+    def encontrar_nos_intervalo(self, chave1, chave2):
+        self._entrar_leitura()
+        try:
+            return self.arvore.encontrar_nos_intervalo(chave1, chave2)
+        finally:
+            self.trava.liberar_leitura()
+
+    def agregar_intervalo(self, chave1, chave2):
+        self._entrar_leitura()
+        try:
+            return self.arvore.agregar_intervalo(chave1, chave2)
+        finally:
+            self.trava.liberar_leitura()
+
+    def metricas(self):
+        """Contencao da trava e tamanho medio dos lotes aplicados."""
+        trava = self.trava
+        return {
+            "aquisicoes": trava.aquisicoes,
+            "esperas": trava.esperas,
+            "contencao": trava.contencao(),
+            "tempo_espera": trava.tempo_espera,
+            "lotes": self.lotes,
+            "media_lote": self.operacoes_em_lote / self.lotes if self.lotes else 0.0,
+        }
+
+    def zerar_metricas(self):
+        trava = self.trava
+        trava.aquisicoes = trava.esperas = 0
+        trava.tempo_espera = 0.0
+        self.lotes = self.operacoes_em_lote = 0
+
+
+class _MapaTravaGlobal:
+    # linha de base: cada operacao sob o mesmo threading.Lock
+    def __init__(self):
+        self.arvore = _ArvoreValores()
+        self.trava = threading.Lock()
+
+    def inserir(self, chave, valor=None):
+        with self.trava:
+            try:
+                self.arvore.inserir(chave, valor)
+            except ValueError:
+                self.arvore.deletar(chave)
+                self.arvore.inserir(chave, valor)
+
+    def deletar(self, chave):
+        with self.trava:
+            self.arvore.deletar(chave)
+
+    def __contains__(self, chave):
+        with self.trava:
+            return self.arvore.obter_profundidade_no(chave) >= 0
+
+
+# -------------------------------
+# Benchmark: vazao com varias threads variando a proporcao de leituras
+# -------------------------------
+def _carga(mapa, ops, fracao_leitura, universo, seed, barreira):
+    rng = random.Random(seed)
+    plano = [(rng.random() < fracao_leitura, rng.random() < 0.5, rng.randrange(universo))
+             for _ in range(ops)]
+    barreira.wait()
+    for leitura, insere, chave in plano:
+        if leitura:
+            chave in mapa
+        elif insere:
+            mapa.inserir(chave)
+        else:
+            mapa.deletar(chave)
+
+
+def _vazao(fabrica, threads, ops, fracao_leitura, universo):
+    mapa = fabrica()
+    for c in range(0, universo, 2):
+        mapa.inserir(c)
+    if hasattr(mapa, "aplicar_pendentes"):
+        mapa.aplicar_pendentes()
+        mapa.zerar_metricas()
+    barreira = threading.Barrier(threads + 1)
+    trabalhadores = [threading.Thread(target=_carga,
+                                      args=(mapa, ops, fracao_leitura, universo, i, barreira))
+                     for i in range(threads)]
+    for t in trabalhadores:
+        t.start()
+    barreira.wait()
+    t0 = time.perf_counter()
+    for t in trabalhadores:
+        t.join()
+    if hasattr(mapa, "aplicar_pendentes"):
+        mapa.aplicar_pendentes()
+    return threads * ops / (time.perf_counter() - t0), mapa
+
+
+def _verificar_valores(threads=4, chaves=500):
+    # valores nao numericos atravessam os lotes sem serem somados
+    mapa = MapaConcorrente(tamanho_lote=16)
+
+    def escrever(i):
+        for c in range(chaves):
+            mapa.inserir(c, {"thread": i, "chave": c} if c % 2 else f"valor {c}")
+
+    trabalhadores = [threading.Thread(target=escrever, args=(i,)) for i in range(threads)]
+    for t in trabalhadores:
+        t.start()
+    for t in trabalhadores:
+        t.join()
+    mapa.inserir(chaves)  # sem valor: fica None, nao vira a chave
+    assert len(mapa) == chaves + 1 and mapa.obter(chaves) is None
+    assert all(mapa.obter(c)["chave"] == c if c % 2 else mapa.obter(c) == f"valor {c}"
+               for c in range(chaves))
+    # chave incomparavel recusada ja no envio; as demais escritas seguem
+    try:
+        mapa.inserir("x", "b")
+        return False
+    except TypeError:
+        pass
+    mapa.aplicar_lote([("inserir", 0, "novo"), ("deletar", chaves)])
+    assert mapa.obter(0) == "novo" and chaves not in mapa
+    # substituir o valor no no mantem os resumos da arvore agregada
+    from Atividade_5 import ArvoreAVLAgregada
+    agregado = MapaConcorrente(arvore=ArvoreAVLAgregada(), tamanho_lote=8)
+    for c in range(100):
+        agregado.inserir(c, c)
+    for c in range(0, 100, 3):
+        agregado.inserir(c, -c)
+    esperado = sum(-c if c % 3 == 0 else c for c in range(100))
+    assert agregado.agregar_intervalo(0, 99)[1] == esperado
+    return True
+
+
+def benchmark_concorrencia(threads=(1, 2, 4, 8), fracoes=(0.99, 0.9, 0.5, 0.1),
+                           ops=20000, universo=100000):
+    print(f"valores nao numericos (dict/str/None): {_verificar_valores()}")
+    modos = [("concorrente", lambda: MapaConcorrente()),
+             ("lote", lambda: MapaConcorrente(ler_pendentes=False))]
+    print(f"{ops} ops por thread, {universo} chaves possiveis")
+    print("vazao em ops/s; contencao e media de operacoes por lote entre parenteses")
+    print(f"{'threads':>7} {'leituras':>8} {'trava global':>12}"
+          + "".join(f" {nome:>28}" for nome, _ in modos))
+    for fracao in fracoes:
+        for n in threads:
+            base, _ = _vazao(_MapaTravaGlobal, n, ops, fracao, universo)
+            linha = f"{n:7d} {fracao:8.0%} {base:12.0f}"
+            for _, fabrica in modos:
+                vazao, mapa = _vazao(fabrica, n, ops, fracao, universo)
+                m = mapa.metricas()
+                linha += f" {vazao:10.0f} ({m['contencao']:5.1%}, {m['media_lote']:6.1f})"
+            print(linha)
+
+
+if __name__ == "__main__":
+    benchmark_concorrencia(ops=int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
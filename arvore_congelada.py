@@ -0,0 +1,151 @@
+# arvore_congelada.py
+# Snapshot imutavel, so de leitura, de uma arvore de busca em layout de
+# Eytzinger (ordem de busca em largura): o no i tem filhos 2i e 2i+1, entao a
+# descida acessa o vetor de forma previsivel e sem ponteiros.
+# Requisitos: pip install numpy
+
+import random
+import sys
+import time
+
+import numpy as np
+
+
+class FrozenTree:
+    """
+    Snapshot de leitura criado por `freeze()` / `congelar()`.
+    `keys` guarda as chaves em layout de Eytzinger com indice 1 na raiz
+    (a posicao 0 nao e usada); `values`, se existir, segue o mesmo layout.
+    """
+    def __init__(self, sorted_keys, sorted_values=None):
+        n = len(sorted_keys)
+        order = _eytzinger_order(n)
+        keys = np.asarray(sorted_keys)
+        self.keys = np.empty(n + 1, dtype=keys.dtype)
+        if n:
+            self.keys[0] = keys[0]  # posicao 0 nunca e consultada
+            self.keys[order] = keys
+        self.values = None
+        if sorted_values is not None:
+            values = np.asarray(sorted_values)
+            self.values = np.empty(n + 1, dtype=values.dtype)
+            if n:
+                self.values[order] = values
+        self.n = n
+        self.depth = n.bit_length()  # niveis da arvore implicita
+
+    def __len__(self):
+        return self.n
+
+    def __contains__(self, key):
+        return self.search(key)
+
+    # Busca de uma chave (descida escalar pelo vetor)
+    def search(self, key):
+        keys = self.keys
+        k = 1
+        while k <= self.n:
+            v = keys[k]
+            if v == key:
+                return True
+            k = 2 * k + (v < key)
+        return False
+
+    # Indice (no layout) da menor chave >= q para cada consulta, 0 se nao houver.
+    # Descida sem desvios: cada nivel e uma unica operacao vetorizada.
+    def _lower_bound(self, queries):
+        keys = self.keys
+        n = self.n
+        k = np.ones(len(queries), dtype=np.int64)
+        for _ in range(self.depth):
+            ativo = k <= n
+            passo = 2 * k + (keys[np.minimum(k, n)] < queries)
+            k = np.where(ativo, passo, k)
+        # remove os passos finais para a direita e o ultimo para a esquerda:
+        # k >> (zeros... ) -> k // (2 * menor bit zero de k)
+        return k // (2 * (~k & (k + 1)))
+
+    def search_many(self, queries):
+        """Retorna um vetor booleano: queries[i] esta na arvore?"""
+        queries = np.asarray(queries)
+        if self.n == 0:
+            return np.zeros(len(queries), dtype=bool)
+        pos = self._lower_bound(queries)
+        return (pos > 0) & (self.keys[pos] == queries)
+
+    def lookup_many(self, queries, default=None):
+        """Valores associados as chaves consultadas (`default` se ausente)."""
+        if self.values is None:
+            raise ValueError("Snapshot sem valores associados")
+        queries = np.asarray(queries)
+        if self.n == 0:
+            return np.full(len(queries), default)
+        pos = self._lower_bound(queries)
+        found = (pos > 0) & (self.keys[pos] == queries)
+        if default is None:
+            out = np.empty(len(queries), dtype=object)
+        else:
+            out = np.full(len(queries), default, dtype=np.result_type(self.values, np.asarray(default)))
+        out[found] = self.values[pos[found]]
+        return out
+
+
+# Posicoes de Eytzinger (indice 1 na raiz) na ordem do percurso em ordem:
+# a i-esima menor chave vai para order[i]
+def _eytzinger_order(n):
+    order = np.empty(n, dtype=np.int64)
+    i = 0
+    stack = []
+    k = 1
+    while stack or k <= n:
+        while k <= n:
+            stack.append(k)
+            k = 2 * k
+        k = stack.pop()
+        order[i] = k
+        i += 1
+        k = 2 * k + 1
+    return order
+
+
+# -------------------------------
+# Benchmark: search_many x search por chave
+# -------------------------------
+def benchmark_freeze(n=10**6, queries=10**6, seed=0):
+    import Atividade_2
+    import Atividade_5
+
+    rng = random.Random(seed)
+    keys = sorted(rng.sample(range(n * 4), n))
+    consultas = np.array([rng.randrange(n * 4) for _ in range(queries)], dtype=np.int64)
+    consultas_py = consultas.tolist()
+
+    bst = Atividade_2.BinarySearchTree.from_sorted(keys)
+    avl = Atividade_5.ArvoreAVL.de_ordenados(keys)
+
+    t0 = time.perf_counter()
+    frozen = bst.freeze()
+    t_freeze = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    esperado = [bst.search(q) is not None for q in consultas_py]
+    t_bst = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for q in consultas_py:
+        avl.obter_profundidade_no(q)
+    t_avl = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    achados = frozen.search_many(consultas)
+    t_many = time.perf_counter() - t0
+
+    print(f"n={n} chaves, {queries} consultas (freeze em {t_freeze:.2f} s)")
+    print(f"BinarySearchTree.search       {t_bst:7.2f} s")
+    print(f"ArvoreAVL.obter_profundidade  {t_avl:7.2f} s")
+    print(f"FrozenTree.search_many        {t_many:7.3f} s  ({t_bst / t_many:.0f}x)")
+    print("Resultados iguais:", achados.tolist() == esperado)
+
+
+if __name__ == "__main__":
+    benchmark_freeze(int(sys.argv[1]) if len(sys.argv) > 1 else 10**6)
@@ -0,0 +1,216 @@
+# arvore_persistente.py
+# Árvore AVL persistente (cópia de caminho): os nós nunca são alterados.
+# Cada inserir/deletar cria cópias só dos O(log n) nós do caminho percorrido
+# e compartilha o resto com a versão anterior, então snapshot() é O(1) e as
+# versões antigas continuam consultáveis enquanto o escritor segue alterando.
+
+import copy
+import random
+import sys
+import time
+import tracemalloc
+
+
+class NoPersistente:
+    """Nó imutável: altura e tamanho são calculados na criação."""
+    __slots__ = ("chave", "esquerda", "direita", "altura", "tamanho")
+
+    def __init__(self, chave, esquerda=None, direita=None):
+        self.chave = chave
+        self.esquerda = esquerda
+        self.direita = direita
+        he = esquerda.altura if esquerda else 0
+        hd = direita.altura if direita else 0
+        self.altura = 1 + (he if he > hd else hd)
+        self.tamanho = 1 + (esquerda.tamanho if esquerda else 0) + (direita.tamanho if direita else 0)
+
+
+def _altura(no):
+    return no.altura if no else 0
+
+
+def _balancear(chave, esquerda, direita):
+    """Cria o nó (chave, esquerda, direita) já balanceado, com nós novos."""
+    he = _altura(esquerda)
+    hd = _altura(direita)
+    if he > hd + 1:
+        if _altura(esquerda.esquerda) >= _altura(esquerda.direita):
+            # Esquerda-Esquerda: rotação simples à direita
+            return NoPersistente(esquerda.chave, esquerda.esquerda,
+                                 NoPersistente(chave, esquerda.direita, direita))
+        # Esquerda-Direita: rotação dupla
+        meio = esquerda.direita
+        return NoPersistente(meio.chave,
+                             NoPersistente(esquerda.chave, esquerda.esquerda, meio.esquerda),
+                             NoPersistente(chave, meio.direita, direita))
+    if hd > he + 1:
+        if _altura(direita.direita) >= _altura(direita.esquerda):
+            # Direita-Direita: rotação simples à esquerda
+            return NoPersistente(direita.chave,
+                                 NoPersistente(chave, esquerda, direita.esquerda),
+                                 direita.direita)
+        # Direita-Esquerda: rotação dupla
+        meio = direita.esquerda
+        return NoPersistente(meio.chave,
+                             NoPersistente(chave, esquerda, meio.esquerda),
+                             NoPersistente(direita.chave, meio.direita, direita.direita))
+    return NoPersistente(chave, esquerda, direita)
+
+
+def _inserir(no, chave):
+    if not no:
+        return NoPersistente(chave)
+    if chave < no.chave:
+        return _balancear(no.chave, _inserir(no.esquerda, chave), no.direita)
+    if chave > no.chave:
+        return _balancear(no.chave, no.esquerda, _inserir(no.direita, chave))
+    raise ValueError("Chave duplicada não permitida na AVL.")
+
+
+def _remover_minimo(no):
+    """Retorna (menor chave, subárvore sem ela)."""
+    if not no.esquerda:
+        return no.chave, no.direita
+    minimo, resto = _remover_minimo(no.esquerda)
+    return minimo, _balancear(no.chave, resto, no.direita)
+
+
+def _deletar(no, chave):
+    # se a chave não existir devolve o próprio nó: nada é copiado
+    if not no:
+        return no
+    if chave < no.chave:
+        esquerda = _deletar(no.esquerda, chave)
+        return no if esquerda is no.esquerda else _balancear(no.chave, esquerda, no.direita)
+    if chave > no.chave:
+        direita = _deletar(no.direita, chave)
+        return no if direita is no.direita else _balancear(no.chave, no.esquerda, direita)
+    if not no.esquerda:
+        return no.direita
+    if not no.direita:
+        return no.esquerda
+    sucessor, direita = _remover_minimo(no.direita)
+    return _balancear(sucessor, no.esquerda, direita)
+
+
+class VersaoAVL:
+    """
+    Versão imutável da árvore (devolvida por snapshot()). Pode ser lida por
+    qualquer número de threads sem travas: nenhum nó dela muda depois.
+    """
+    def __init__(self, raiz, numero):
+        self.raiz = raiz
+        self.numero = numero
+
+    def __len__(self):
+        return self.raiz.tamanho if self.raiz else 0
+
+    def __contains__(self, chave):
+        return self.obter_profundidade_no(chave) >= 0
+
+    def obter_profundidade_no(self, chave):
+        """Calcula a profundidade de um nó com a chave dada (-1 se ausente)."""
+        no = self.raiz
+        nivel = 0
+        while no:
+            if chave == no.chave:
+                return nivel
+            no = no.esquerda if chave < no.chave else no.direita
+            nivel += 1
+        return -1
+
+    def iterar_intervalo(self, chave1, chave2):
+        """Gera, em ordem, as chaves do intervalo [chave1, chave2]."""
+        pilha = []
+        no = self.raiz
+        while no:
+            if no.chave >= chave1:
+                pilha.append(no)
+                no = no.esquerda
+            else:
+                no = no.direita
+        while pilha:
+            no = pilha.pop()
+            if no.chave > chave2:
+                return
+            yield no.chave
+            no = no.direita
+            while no:
+                pilha.append(no)
+                no = no.esquerda
+
+    def encontrar_nos_intervalo(self, chave1, chave2):
+        """Retorna todas as chaves no intervalo [chave1, chave2]."""
+        return list(self.iterar_intervalo(chave1, chave2))
+
+
+class ArvoreAVLPersistente(VersaoAVL):
+    """
+    AVL com a interface de ArvoreAVL (inserir, deletar, consultas) em que
+    cada alteração gera uma nova versão. O escritor troca `raiz` por uma
+    atribuição única, então leitores concorrentes sempre veem uma versão
+    inteira; para uma visão estável durante várias leituras use snapshot().
+    """
+    def __init__(self):
+        super().__init__(None, 0)
+
+    def inserir(self, chave):
+        """Insere uma chave copiando apenas o caminho da raiz até ela."""
+        self.raiz = _inserir(self.raiz, chave)
+        self.numero += 1
+
+    def deletar(self, chave):
+        """Remove uma chave copiando apenas o caminho afetado."""
+        raiz = _deletar(self.raiz, chave)
+        if raiz is not self.raiz:
+            self.raiz = raiz
+            self.numero += 1
+
+    def snapshot(self):
+        """Versão atual, imutável, em O(1)."""
+        return VersaoAVL(self.raiz, self.numero)
+
+
+# -------------------------------
+# Benchmark: memoria por versao (tracemalloc) x copia profunda
+# -------------------------------
+def benchmark_versoes(n=100000, versoes=1000, seed=0):
+    from Atividade_5 import ArvoreAVL
+
+    rng = random.Random(seed)
+    chaves = rng.sample(range(n * 10), n + versoes)
+    arvore = ArvoreAVLPersistente()
+    for c in chaves[:n]:
+        arvore.inserir(c)
+
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    guardadas = []
+    for c in chaves[n:]:
+        arvore.inserir(c)
+        guardadas.append(arvore.snapshot())
+    elapsed = time.perf_counter() - t0
+    por_versao = (tracemalloc.get_traced_memory()[0] - antes) / versoes
+    tracemalloc.stop()
+
+    base = ArvoreAVL()
+    for c in chaves[:n]:
+        base.inserir(c)
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    copia = copy.deepcopy(base)
+    t_copia = time.perf_counter() - t0
+    mem_copia = tracemalloc.get_traced_memory()[0] - antes
+    tracemalloc.stop()
+
+    ok = all(len(v) == n + i + 1 for i, v in enumerate(guardadas))
+    print(f"n={n}, {versoes} versões guardadas (inserir + snapshot)")
+    print(f"persistente: {por_versao:8.0f} B/versão  {elapsed / versoes * 1e6:7.1f} us/versão")
+    print(f"deepcopy da ArvoreAVL: {mem_copia:10.0f} B/versão  {t_copia * 1e3:7.1f} ms/versão")
+    print("Versões antigas íntegras:", ok and len(copia) == n)
+
+
+if __name__ == "__main__":
+    benchmark_versoes(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,70 @@
+# arvores
+# Pacote com as estruturas de dados das atividades (arvores de busca e o
+# parser de expressoes), para uso como biblioteca. Os nomes sao resolvidos
+# sob demanda: `import arvores` nao carrega nenhum modulo, e cada modulo so
+# e importado no primeiro acesso a um nome dele. graphviz e numpy so sao
+# carregados quando uma visualizacao ou avaliacao vetorizada e usada.
+#
+#   import arvores
+#   avl = arvores.ArvoreAVL()
+#   python -m arvores --help        (linha de comando, ver arvores/cli.py)
+#
+# Fora do checkout, `pip install .` instala o pacote, os modulos da raiz e o
+# comando `arvores` (ver pyproject.toml).
+
+import importlib
+
+# nome exportado -> (modulo, atributo)
+_EXPORTS = {
+    # parser e arvores de expressao (Atividade_1)
+    "tokenize": ("Atividade_1", "tokenize"),
+    "iter_tokens": ("Atividade_1", "iter_tokens"),
+    "parse_tokens": ("Atividade_1", "parse_tokens"),
+    "evaluate_tree": ("Atividade_1", "evaluate_tree"),
+    "intern_tree": ("Atividade_1", "intern_tree"),
+    "evaluate_dag": ("Atividade_1", "evaluate_dag"),
+    "IncrementalExpression": ("Atividade_1", "IncrementalExpression"),
+    "CompiledExpression": ("Atividade_1", "CompiledExpression"),
+    "compile_tree": ("Atividade_1", "compile_tree"),
+    "generate_random_tree": ("Atividade_1", "generate_random_tree"),
+    "tree_to_expression": ("Atividade_1", "tree_to_expression"),
+    "visualize_tree": ("Atividade_1", "visualize_tree"),
+    # arvores de busca
+    "BinarySearchTree": ("Atividade_2", "BinarySearchTree"),
+    "AVLTree": ("Atividade_4", "AVLTree"),
+    "AVLMetrics": ("Atividade_4", "AVLMetrics"),
+    "ArvoreAVL": ("Atividade_5", "ArvoreAVL"),
+    "ArvoreAVLAgregada": ("Atividade_5", "ArvoreAVLAgregada"),
+    "MultiConjuntoAVL": ("Atividade_5", "MultiConjuntoAVL"),
+    "SortedMap": ("Atividade_5", "SortedMap"),
+    "ArrayBST": ("arvore_compacta", "ArrayBST"),
+    "ArrayAVL": ("arvore_compacta", "ArrayAVL"),
+    "ArvoreAVLPersistente": ("arvore_persistente", "ArvoreAVLPersistente"),
+    "MapaConcorrente": ("arvore_concorrente", "MapaConcorrente"),
+    "ArvoreBMais": ("arvore_bplus", "ArvoreBMais"),
+    "FrozenTree": ("arvore_congelada", "FrozenTree"),
+    "criar_conjunto": ("conjunto_ordenado", "criar_conjunto"),
+    "ESTRATEGIAS": ("conjunto_ordenado", "ESTRATEGIAS"),
+    # persistencia e visualizacao
+    "dump_tree": ("serializacao", "dump_tree"),
+    "load_tree": ("serializacao", "load_tree"),
+    "MappedTree": ("serializacao", "MappedTree"),
+    "escrever_dot": ("escritor_dot", "escrever_dot"),
+    "GravadorArvore": ("gravador_arvore", "GravadorArvore"),
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(nome):
+    try:
+        modulo, atributo = _EXPORTS[nome]
+    except KeyError:
+        raise AttributeError(f"module 'arvores' has no attribute {nome!r}") from None
+    valor = getattr(importlib.import_module(modulo), atributo)
+    globals()[nome] = valor  # proximos acessos nao passam por aqui
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,5 @@
+import sys
+
+from arvores.cli import main
+
+sys.exit(main())
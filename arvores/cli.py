@@ -0,0 +1,229 @@
+# arvores/cli.py
+# Linha de comando para operacoes em lote (python -m arvores ..., ou so
+# `arvores ...` depois de `pip install .`, ver pyproject.toml):
+#
+#   construir CHAVES -o ARQ.arvb [--tipo avl|bst]   le chaves (uma por linha,
+#                                                   "-" = stdin) e grava ARVB
+#   consultar ARQ.arvb [CHAVE ...] [--arquivo F]    busca via mmap, sem carregar
+#   despejar ARQ.arvb [-o SAIDA]                    chaves em ordem, uma por linha
+#   info ARQ.arvb                                   tipo, tamanho e altura
+#   tempo-inicio [--orcamento-ms N]                 mede o custo de importacao
+#
+# So importa o modulo de cada comando quando ele e executado, para que
+# processos curtos nao paguem pelo que nao usam.
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+
+def _ler_chaves(caminho):
+    arquivo = sys.stdin if caminho == "-" else open(caminho, encoding="utf-8")
+    try:
+        chaves = []
+        for numero, linha in enumerate(arquivo, 1):
+            texto = linha.strip()
+            if not texto or texto.startswith("#"):
+                continue
+            try:
+                chaves.append(int(texto))
+            except ValueError:
+                try:
+                    chaves.append(float(texto))
+                except ValueError:
+                    raise ValueError(f"{caminho}:{numero}: chave inválida {texto!r}") from None
+        return chaves
+    finally:
+        if arquivo is not sys.stdin:
+            arquivo.close()
+
+
+def _em_ordem(raiz):
+    # percurso em ordem iterativo para as duas familias de nos (BST e AVL)
+    if raiz is None:
+        return
+    esq, dir_, valor = (("left", "right", "value") if hasattr(raiz, "value")
+                        else ("esquerda", "direita", "chave"))
+    pilha = []
+    no = raiz
+    while pilha or no is not None:
+        while no is not None:
+            pilha.append(no)
+            no = getattr(no, esq)
+        no = pilha.pop()
+        yield getattr(no, valor)
+        no = getattr(no, dir_)
+
+
+def cmd_construir(args):
+    from serializacao import dump_tree
+
+    t0 = time.perf_counter()
+    chaves = _ler_chaves(args.chaves)
+    t_ler = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    ordenadas = sorted(set(chaves))
+    if args.tipo == "avl":
+        from Atividade_5 import ArvoreAVL
+        arvore = ArvoreAVL.de_ordenados(ordenadas)
+        altura = arvore.altura()
+    else:
+        from Atividade_2 import BinarySearchTree
+        arvore = BinarySearchTree.from_sorted(ordenadas)
+        altura = arvore.height() + 1
+    t_construir = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    dump_tree(arvore, args.saida)
+    t_gravar = time.perf_counter() - t0
+    print(f"{len(chaves)} chaves lidas ({len(chaves) - len(ordenadas)} repetidas descartadas)"
+          f" em {t_ler:.2f} s; {args.tipo} com {len(ordenadas)} nós e altura {altura}"
+          f" construída em {t_construir:.2f} s; {args.saida} gravado em {t_gravar:.2f} s")
+    return 0
+
+
+def cmd_consultar(args):
+    from serializacao import MappedTree
+
+    chaves = [_converter(c) for c in args.chave_lista]
+    if args.arquivo:
+        chaves.extend(_ler_chaves(args.arquivo))
+    achadas = 0
+    with MappedTree(args.arvore) as arvore:
+        for chave in chaves:
+            presente = chave in arvore
+            achadas += presente
+            if not args.resumo:
+                print(f"{chave}\t{int(presente)}")
+    if args.resumo:
+        print(f"{achadas} de {len(chaves)} chaves encontradas")
+    # codigo de saida util em scripts: 0 se todas as chaves existem
+    return 0 if achadas == len(chaves) else 1
+
+
+def _converter(texto):
+    try:
+        return int(texto)
+    except ValueError:
+        return float(texto)
+
+
+def cmd_despejar(args):
+    from serializacao import load_tree
+
+    arvore = load_tree(args.arvore)
+    raiz = arvore.raiz if hasattr(arvore, "raiz") else arvore.root
+    saida = sys.stdout if args.saida in (None, "-") else open(args.saida, "w", encoding="utf-8")
+    try:
+        saida.writelines(f"{chave}\n" for chave in _em_ordem(raiz))
+    finally:
+        if saida is not sys.stdout:
+            saida.close()
+    return 0
+
+
+def cmd_info(args):
+    from serializacao import MappedTree, load_tree
+
+    with MappedTree(args.arvore) as mapeada:
+        n, codigo = len(mapeada), mapeada.chaves.format
+        misto = mapeada.chaves_int is not None
+    arvore = load_tree(args.arvore)
+    nome = type(arvore).__name__
+    altura = arvore.altura() if hasattr(arvore, "raiz") else arvore.height() + 1
+    tipo_chaves = "int e float" if misto else ("int" if codigo == "q" else "float")
+    print(f"{args.arvore}: {nome}, {n} chaves ({tipo_chaves}),"
+          f" altura {altura}, {os.path.getsize(args.arvore)} bytes")
+    return 0
+
+
+# -------------------------------
+# Benchmark: custo de inicializacao
+# -------------------------------
+# importacao medida num interpretador novo: o pacote e os modulos das
+# estruturas, sem graphviz nem numpy
+_CODIGO_IMPORTACAO = """
+import sys, time
+t0 = time.perf_counter()
+import arvores
+arvores.ArvoreAVL, arvores.BinarySearchTree, arvores.AVLTree, arvores.parse_tokens
+arvores.criar_conjunto, arvores.load_tree
+elapsed = time.perf_counter() - t0
+pesados = [m for m in ("graphviz", "numpy") if m in sys.modules]
+print(elapsed, ",".join(pesados))
+"""
+
+
+def medir_importacao(repeticoes=5):
+    """
+    Melhor tempo (s) de importar o pacote e acessar as estruturas principais
+    num processo novo, e os modulos pesados que vieram junto.
+    """
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    ambiente = dict(os.environ, PYTHONPATH=raiz + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    melhor = None
+    pesados = ""
+    for _ in range(repeticoes):
+        saida = subprocess.run([sys.executable, "-c", _CODIGO_IMPORTACAO], env=ambiente,
+                               capture_output=True, text=True, check=True).stdout.split()
+        elapsed = float(saida[0])
+        pesados = saida[1] if len(saida) > 1 else ""
+        melhor = elapsed if melhor is None else min(melhor, elapsed)
+    return melhor, pesados
+
+
+def cmd_tempo_inicio(args):
+    elapsed, pesados = medir_importacao(args.repeticoes)
+    print(f"importação: {elapsed * 1e3:.1f} ms (orçamento {args.orcamento_ms:.0f} ms)")
+    if pesados:
+        print(f"FALHA: módulos pesados importados na inicialização: {pesados}")
+        return 1
+    if elapsed * 1e3 > args.orcamento_ms:
+        print("FALHA: importação acima do orçamento")
+        return 1
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m arvores",
+                                     description="Operações em lote com as árvores")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser("construir", help="lê chaves de um arquivo e grava a árvore (ARVB)")
+    p.add_argument("chaves", help='arquivo com uma chave por linha ("-" para stdin)')
+    p.add_argument("-o", "--saida", required=True)
+    p.add_argument("--tipo", choices=("avl", "bst"), default="avl")
+    p.set_defaults(funcao=cmd_construir)
+
+    p = sub.add_parser("consultar", help="busca chaves num arquivo ARVB via mmap")
+    p.add_argument("arvore")
+    p.add_argument("chave_lista", nargs="*", metavar="chave")
+    p.add_argument("--arquivo", help="arquivo com chaves a consultar")
+    p.add_argument("--resumo", action="store_true", help="só imprime o total encontrado")
+    p.set_defaults(funcao=cmd_consultar)
+
+    p = sub.add_parser("despejar", help="escreve as chaves em ordem")
+    p.add_argument("arvore")
+    p.add_argument("-o", "--saida")
+    p.set_defaults(funcao=cmd_despejar)
+
+    p = sub.add_parser("info", help="tipo, tamanho e altura da árvore gravada")
+    p.add_argument("arvore")
+    p.set_defaults(funcao=cmd_info)
+
+    p = sub.add_parser("tempo-inicio", help="mede o custo de importação do pacote")
+    p.add_argument("--orcamento-ms", type=float, default=150.0)
+    p.add_argument("--repeticoes", type=int, default=5)
+    p.set_defaults(funcao=cmd_tempo_inicio)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.funcao(args)
+    except (OSError, ValueError, TypeError) as erro:
+        print(f"erro: {erro}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,397 @@
+# benchmarks.py
+# Bateria reproduzivel de benchmarks para as arvores das atividades:
+# BinarySearchTree (Atividade_2 e 3), AVLTree (Atividade_4) e ArvoreAVL
+# (Atividade_5), em tamanhos de 10^3 a 10^7 e distribuicoes de chaves
+# ordenada, aleatoria, Zipf e com muitos duplicados.
+#
+# Para cada combinacao mede ops/s de insercao, busca e remocao, pico de
+# memoria da construcao (tracemalloc, numa execucao separada para nao
+# distorcer os tempos), rotacoes e altura final. Os resultados vao para um
+# JSON que pode ser comparado com uma base salva para detectar regressoes:
+#
+#   python benchmarks.py --saida atual.json
+#   python benchmarks.py --saida atual.json --base base.json --tolerancia 0.25
+#
+# Mesma semente -> mesmas chaves, mesmas rotacoes e alturas; so os tempos
+# variam entre execucoes. Cada tempo e o melhor de --repeticoes (padrao 3), e
+# tamanhos abaixo de --minimo-n (padrao 10^4) nao entram na comparacao de
+# tempo: rodam em poucos milissegundos e oscilam mais que a tolerancia.
+
+import argparse
+import gc
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+DISTRIBUICOES = ("ordenada", "aleatoria", "zipf", "duplicados")
+TAMANHOS_PADRAO = (10**3, 10**4, 10**5)
+
+# BSTs sem balanceamento degeneram em listas com chaves ordenadas (e cadeias
+# de duplicados na Atividade_3): acima deste tamanho a combinacao e pulada
+LIMITE_DEGENERADO = 5000
+
+REPETICOES_PADRAO = 3
+# abaixo deste n os tempos sao curtos demais para comparar com a base
+MINIMO_N_TEMPO = 10**4
+
+
+# -------------------------------
+# Geracao de chaves
+# -------------------------------
+def gerar_chaves(distribuicao, n, seed):
+    """Lista de n chaves inteiras; deterministica para (distribuicao, n, seed)."""
+    rng = random.Random(f"{seed}-{distribuicao}-{n}")
+    if distribuicao == "ordenada":
+        return list(range(n))
+    if distribuicao == "aleatoria":
+        return rng.sample(range(n * 10), n)
+    if distribuicao == "zipf":
+        # Zipf (s = 1) sobre n chaves distintas embaralhadas
+        universo = rng.sample(range(n * 10), n)
+        acumulado = list(itertools.accumulate(1 / (i + 1) for i in range(n)))
+        return rng.choices(universo, cum_weights=acumulado, k=n)
+    if distribuicao == "duplicados":
+        distintas = max(1, int(n ** 0.5))
+        universo = rng.sample(range(n * 10), distintas)
+        return [rng.choice(universo) for _ in range(n)]
+    raise ValueError(f"Distribuição desconhecida: {distribuicao!r}")
+
+
+# -------------------------------
+# Adaptadores: mesma interface (inserir, buscar, remover, rotacoes, altura)
+# sobre cada implementacao, respeitando a regra de duplicados de cada uma
+# -------------------------------
+class _Adaptador:
+    nome = None
+    degenera = False  # sem balanceamento
+    operacoes = ("insercao", "busca", "remocao")
+
+    def rotacoes(self):
+        return None
+
+
+class _BST2(_Adaptador):
+    nome = "BinarySearchTree (Atividade_2)"
+    degenera = True
+
+    def __init__(self):
+        import Atividade_2
+        self.arvore = Atividade_2.BinarySearchTree()
+
+    def inserir(self, chave):
+        self.arvore.insert(chave)  # duplicados sao ignorados
+
+    def buscar(self, chave):
+        return self.arvore.search(chave) is not None
+
+    def remover(self, chave):
+        self.arvore.delete(chave)
+
+    def altura(self):
+        return self.arvore.height() + 1  # Atividade_2 conta arestas
+
+
+class _BST3(_Adaptador):
+    nome = "BinarySearchTree (Atividade_3)"
+    degenera = True
+    operacoes = ("insercao", "busca")  # Atividade_3 nao tem remocao
+
+    def __init__(self):
+        import Atividade_3
+        self.arvore = Atividade_3.BinarySearchTree()
+
+    def inserir(self, chave):
+        self.arvore.insert(chave)  # duplicados viram nos a direita
+
+    def buscar(self, chave):
+        no = self.arvore.root
+        while no:
+            if chave == no.value:
+                return True
+            no = no.left if chave < no.value else no.right
+        return False
+
+    def altura(self):
+        altura = 0
+        nivel = [self.arvore.root] if self.arvore.root else []
+        while nivel:
+            altura += 1
+            nivel = [f for no in nivel for f in (no.left, no.right) if f]
+        return altura
+
+
+class _AVL4(_Adaptador):
+    nome = "AVLTree (Atividade_4)"
+
+    def __init__(self):
+        import Atividade_4
+
+        # contador na subclasse, como em _AVL5: com um listener (AVLMetrics)
+        # a vazao mediria tambem o custo das notificacoes
+        contador = [0]
+
+        class ArvoreContada(Atividade_4.AVLTree):
+            def rotate_right(self, y):
+                contador[0] += 1
+                return super().rotate_right(y)
+
+            def rotate_left(self, x):
+                contador[0] += 1
+                return super().rotate_left(x)
+
+        self._contador = contador
+        self.arvore = ArvoreContada()
+
+    def inserir(self, chave):
+        self.arvore.insert_iterative(chave)  # duplicados sao rejeitados
+
+    def buscar(self, chave):
+        return self.arvore.search(chave) is not None
+
+    def remover(self, chave):
+        self.arvore.delete(chave)
+
+    def rotacoes(self):
+        return self._contador[0]
+
+    def altura(self):
+        return self.arvore.get_height(self.arvore.root)
+
+
+class _AVL5(_Adaptador):
+    nome = "ArvoreAVL (Atividade_5)"
+
+    def __init__(self):
+        import Atividade_5
+
+        contador = [0]
+
+        class ArvoreContada(Atividade_5.ArvoreAVL):
+            def _rotacao_direita(self, y):
+                contador[0] += 1
+                return super()._rotacao_direita(y)
+
+            def _rotacao_esquerda(self, x):
+                contador[0] += 1
+                return super()._rotacao_esquerda(x)
+
+        self._contador = contador
+        self.arvore = ArvoreContada()
+
+    def inserir(self, chave):
+        try:
+            self.arvore.inserir(chave)
+        except ValueError:
+            pass  # chave duplicada
+
+    def buscar(self, chave):
+        return self.arvore.obter_profundidade_no(chave) >= 0
+
+    def remover(self, chave):
+        self.arvore.deletar(chave)
+
+    def rotacoes(self):
+        return self._contador[0]
+
+    def altura(self):
+        return self.arvore.altura()
+
+
+IMPLEMENTACOES = {"bst2": _BST2, "bst3": _BST3, "avl4": _AVL4, "avl5": _AVL5}
+
+
+# -------------------------------
+# Execucao
+# -------------------------------
+def _cronometrar(funcao):
+    gc.collect()
+    gc.disable()
+    try:
+        t0 = time.perf_counter()
+        funcao()
+        return time.perf_counter() - t0
+    finally:
+        gc.enable()
+
+
+def medir(nome_impl, distribuicao, n, seed=0, repeticoes=REPETICOES_PADRAO, memoria=True):
+    """Mede uma combinacao e devolve um dicionario pronto para o JSON."""
+    cls = IMPLEMENTACOES[nome_impl]
+    resultado = {"implementacao": nome_impl, "distribuicao": distribuicao, "n": n}
+    if cls.degenera and n > LIMITE_DEGENERADO and (
+            distribuicao == "ordenada"
+            or (nome_impl == "bst3" and distribuicao in ("zipf", "duplicados"))):
+        resultado["pulado"] = f"degenerada acima de {LIMITE_DEGENERADO} chaves"
+        return resultado
+
+    chaves = gerar_chaves(distribuicao, n, seed)
+    rng = random.Random(f"{seed}-consultas-{n}")
+    consultas = [rng.choice(chaves) if rng.random() < 0.5 else rng.randrange(n * 10)
+                 for _ in range(n)]
+    remocoes = chaves[: n // 2]
+
+    melhores = {}
+    for _ in range(repeticoes):
+        impl = cls()
+        tempos = {"insercao": _cronometrar(lambda: [impl.inserir(c) for c in chaves])}
+        achados = None
+        if "busca" in cls.operacoes:
+            tempos["busca"] = _cronometrar(
+                lambda: [impl.buscar(c) for c in consultas])
+            achados = sum(impl.buscar(c) for c in consultas[:1000])
+        rotacoes_insercao = impl.rotacoes()
+        altura = impl.altura()
+        if "remocao" in cls.operacoes:
+            tempos["remocao"] = _cronometrar(lambda: [impl.remover(c) for c in remocoes])
+        for op, t in tempos.items():
+            melhores[op] = min(melhores.get(op, t), t)
+        del impl
+
+    totais = {"insercao": n, "busca": len(consultas), "remocao": len(remocoes)}
+    for op, t in melhores.items():
+        resultado[f"{op}_ops_s"] = round(totais[op] / t, 1) if t > 0 else None
+    resultado["rotacoes_insercao"] = rotacoes_insercao
+    resultado["altura"] = altura
+    resultado["achados_1000"] = achados  # verificacao de consistencia entre execucoes
+
+    if memoria:
+        gc.collect()
+        tracemalloc.start()
+        impl = cls()
+        for c in chaves:
+            impl.inserir(c)
+        resultado["pico_memoria_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        del impl
+    return resultado
+
+
+def executar(implementacoes, distribuicoes, tamanhos, seed=0, repeticoes=REPETICOES_PADRAO,
+             memoria=True, mostrar=print):
+    resultados = []
+    for n in tamanhos:
+        for distribuicao in distribuicoes:
+            for nome in implementacoes:
+                r = medir(nome, distribuicao, n, seed, repeticoes, memoria)
+                resultados.append(r)
+                if mostrar:
+                    mostrar(_linha(r))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementacao_python": platform.python_implementation(),
+            "plataforma": platform.platform(),
+            "seed": seed,
+            "repeticoes": repeticoes,
+            "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "resultados": resultados,
+    }
+
+
+def _linha(r):
+    cabeca = f"{r['implementacao']:5s} {r['distribuicao']:10s} n={r['n']:<9d}"
+    if "pulado" in r:
+        return f"{cabeca} pulado ({r['pulado']})"
+    partes = []
+    for op in ("insercao", "busca", "remocao"):
+        v = r.get(f"{op}_ops_s")
+        partes.append(f"{op} {v:>10.0f}/s" if v else f"{op} {'-':>10s}  ")
+    mem = r.get("pico_memoria_bytes")
+    partes.append(f"pico {mem / 2**20:7.1f} MiB" if mem is not None else "")
+    rot = r["rotacoes_insercao"]
+    partes.append(f"rot {rot if rot is not None else '-':>8} alt {r['altura']}")
+    return cabeca + "  " + "  ".join(partes)
+
+
+# -------------------------------
+# Comparacao com a base
+# -------------------------------
+def _chave_resultado(r):
+    return (r["implementacao"], r["distribuicao"], r["n"])
+
+
+def ausentes_na_base(atual, base):
+    """Combinacoes medidas em `atual` que a `base` nao tem (nao comparadas)."""
+    na_base = {_chave_resultado(r) for r in base["resultados"]}
+    return ["/".join(str(x) for x in _chave_resultado(r)) for r in atual["resultados"]
+            if _chave_resultado(r) not in na_base]
+
+
+def comparar(atual, base, tolerancia=0.2, minimo_n=MINIMO_N_TEMPO):
+    """
+    Lista de regressoes de `atual` em relacao a `base` (dicionarios no
+    formato de executar). Vazao menor ou memoria maior que a tolerancia
+    relativa contam como regressao; a vazao so e comparada a partir de
+    `minimo_n` chaves. Rotacoes, altura e achados devem ser identicos, pois
+    dependem apenas da semente.
+    """
+    if atual["meta"]["seed"] != base["meta"]["seed"]:
+        return [f"sementes diferentes: {atual['meta']['seed']} x {base['meta']['seed']}"]
+    indice = {_chave_resultado(r): r for r in base["resultados"]}
+    regressoes = []
+    for r in atual["resultados"]:
+        b = indice.get(_chave_resultado(r))
+        if b is None or "pulado" in r or "pulado" in b:
+            continue
+        nome = "/".join(str(x) for x in _chave_resultado(r))
+        for op in ("insercao", "busca", "remocao") if r["n"] >= minimo_n else ():
+            campo = f"{op}_ops_s"
+            if r.get(campo) and b.get(campo) and r[campo] < b[campo] * (1 - tolerancia):
+                regressoes.append(f"{nome}: {op} {b[campo]:.0f} -> {r[campo]:.0f} ops/s"
+                                  f" ({r[campo] / b[campo] - 1:+.0%})")
+        mem_a, mem_b = r.get("pico_memoria_bytes"), b.get("pico_memoria_bytes")
+        if mem_a and mem_b and mem_a > mem_b * (1 + tolerancia):
+            regressoes.append(f"{nome}: pico de memória {mem_b} -> {mem_a} bytes"
+                              f" ({mem_a / mem_b - 1:+.0%})")
+        for campo in ("rotacoes_insercao", "altura", "achados_1000"):
+            if r.get(campo) != b.get(campo):
+                regressoes.append(f"{nome}: {campo} mudou {b.get(campo)} -> {r.get(campo)}")
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks reprodutíveis das árvores")
+    parser.add_argument("--implementacoes", nargs="+", default=list(IMPLEMENTACOES),
+                        choices=list(IMPLEMENTACOES))
+    parser.add_argument("--distribuicoes", nargs="+", default=list(DISTRIBUICOES),
+                        choices=list(DISTRIBUICOES))
+    parser.add_argument("--tamanhos", nargs="+", type=int, default=list(TAMANHOS_PADRAO),
+                        help="ex.: 1000 10000 100000 1000000 10000000")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeticoes", type=int, default=REPETICOES_PADRAO,
+                        help="repete a medição de tempo e guarda o melhor")
+    parser.add_argument("--sem-memoria", action="store_true",
+                        help="não mede o pico de memória (evita uma construção extra)")
+    parser.add_argument("--saida", help="grava os resultados neste JSON")
+    parser.add_argument("--base", help="JSON de base para detectar regressões")
+    parser.add_argument("--tolerancia", type=float, default=0.2)
+    parser.add_argument("--minimo-n", type=int, default=MINIMO_N_TEMPO,
+                        help="só compara tempos a partir deste número de chaves")
+    args = parser.parse_args(argv)
+
+    atual = executar(args.implementacoes, args.distribuicoes, sorted(args.tamanhos),
+                     args.seed, args.repeticoes, not args.sem_memoria)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(atual, f, indent=2, ensure_ascii=False)
+    if args.base:
+        with open(args.base, encoding="utf-8") as f:
+            base = json.load(f)
+        for nome in ausentes_na_base(atual, base):
+            print("SEM BASE:", nome, "(não comparado)")
+        regressoes = comparar(atual, base, args.tolerancia, args.minimo_n)
+        for r in regressoes:
+            print("REGRESSÃO:", r)
+        if regressoes:
+            return 1
+        print("Sem regressões em relação a", args.base)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
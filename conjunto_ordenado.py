@@ -0,0 +1,616 @@
+# conjunto_ordenado.py
+# Interface comum de conjunto ordenado com estrategias de balanceamento
+# intercambiaveis: AVL (Atividade_5), rubro-negra, treap e splay.
+# Todas seguem a mesma regra de duplicados (conjunto: inserir devolve False
+# se a chave ja existe) e contam rotacoes em `rotacoes`, entao podem ser
+# trocadas por nome com criar_conjunto("splay") etc.
+
+import random
+import sys
+import time
+from abc import ABC, abstractmethod
+
+from Atividade_5 import ArvoreAVL
+
+
+class ConjuntoOrdenado(ABC):
+    """
+    Base das estrategias. As subclasses implementam inserir, deletar e
+    `raiz`; os nos precisam ter `chave`, `esquerda` e `direita`, e o
+    restante (busca, iteracao, intervalos, altura) sai daqui.
+    """
+    nome = None
+
+    def __init__(self):
+        self.rotacoes = 0
+        self._n = 0
+
+    @abstractmethod
+    def inserir(self, chave):
+        """Insere a chave; retorna False se ela ja existia."""
+
+    @abstractmethod
+    def deletar(self, chave):
+        """Remove a chave; retorna False se ela nao existia."""
+
+    def __len__(self):
+        return self._n
+
+    def __contains__(self, chave):
+        no = self.raiz
+        while no:
+            if chave == no.chave:
+                return True
+            no = no.esquerda if chave < no.chave else no.direita
+        return False
+
+    def __iter__(self):
+        pilha = []
+        no = self.raiz
+        while pilha or no:
+            while no:
+                pilha.append(no)
+                no = no.esquerda
+            no = pilha.pop()
+            yield no.chave
+            no = no.direita
+
+    def iterar_intervalo(self, chave1, chave2):
+        """Gera, em ordem, as chaves do intervalo [chave1, chave2]."""
+        pilha = []
+        no = self.raiz
+        while no:
+            if no.chave >= chave1:
+                pilha.append(no)
+                no = no.esquerda
+            else:
+                no = no.direita
+        while pilha:
+            no = pilha.pop()
+            if no.chave > chave2:
+                return
+            yield no.chave
+            no = no.direita
+            while no:
+                pilha.append(no)
+                no = no.esquerda
+
+    def encontrar_nos_intervalo(self, chave1, chave2):
+        return list(self.iterar_intervalo(chave1, chave2))
+
+    def minimo(self):
+        no = self.raiz
+        if not no:
+            raise ValueError("minimo: conjunto vazio")
+        while no.esquerda:
+            no = no.esquerda
+        return no.chave
+
+    def maximo(self):
+        no = self.raiz
+        if not no:
+            raise ValueError("maximo: conjunto vazio")
+        while no.direita:
+            no = no.direita
+        return no.chave
+
+    def altura(self):
+        """Altura em nos (vazio = 0, folha = 1, como Atividade_4/5), O(n)."""
+        altura = 0
+        nivel = [self.raiz] if self.raiz else []
+        while nivel:
+            altura += 1
+            nivel = [f for no in nivel for f in (no.esquerda, no.direita) if f]
+        return altura
+
+
+# -------------------------------
+# AVL: adaptador para a ArvoreAVL da Atividade_5
+# -------------------------------
+class _ArvoreAVLContada(ArvoreAVL):
+    # conta as rotacoes no conjunto dono
+    def __init__(self, conjunto):
+        super().__init__()
+        self._conjunto = conjunto
+
+    def _rotacao_direita(self, y):
+        self._conjunto.rotacoes += 1
+        return super()._rotacao_direita(y)
+
+    def _rotacao_esquerda(self, x):
+        self._conjunto.rotacoes += 1
+        return super()._rotacao_esquerda(x)
+
+
+class ConjuntoAVL(ConjuntoOrdenado):
+    nome = "avl"
+
+    def __init__(self):
+        super().__init__()
+        self._arvore = _ArvoreAVLContada(self)
+
+    @property
+    def raiz(self):
+        return self._arvore.raiz
+
+    def __len__(self):
+        return len(self._arvore)
+
+    def inserir(self, chave):
+        try:
+            self._arvore.inserir(chave)
+        except ValueError:
+            return False
+        return True
+
+    def deletar(self, chave):
+        antes = len(self._arvore)
+        self._arvore.deletar(chave)
+        return len(self._arvore) != antes
+
+    def altura(self):
+        return self._arvore.altura()
+
+
+# -------------------------------
+# Rubro-negra (CLRS, com ponteiro para o pai): no maximo 2 rotacoes por
+# insercao e 3 por remocao
+# -------------------------------
+class _NoRN:
+    __slots__ = ("chave", "esquerda", "direita", "pai", "vermelho")
+
+    def __init__(self, chave, pai):
+        self.chave = chave
+        self.esquerda = None
+        self.direita = None
+        self.pai = pai
+        self.vermelho = True
+
+
+def _vermelho(no):
+    return no is not None and no.vermelho
+
+
+class ConjuntoRubroNegro(ConjuntoOrdenado):
+    nome = "rubro-negra"
+
+    def __init__(self):
+        super().__init__()
+        self.raiz = None
+
+    def _rotacao_esquerda(self, x):
+        y = x.direita
+        x.direita = y.esquerda
+        if y.esquerda:
+            y.esquerda.pai = x
+        y.pai = x.pai
+        if x.pai is None:
+            self.raiz = y
+        elif x is x.pai.esquerda:
+            x.pai.esquerda = y
+        else:
+            x.pai.direita = y
+        y.esquerda = x
+        x.pai = y
+        self.rotacoes += 1
+
+    def _rotacao_direita(self, x):
+        y = x.esquerda
+        x.esquerda = y.direita
+        if y.direita:
+            y.direita.pai = x
+        y.pai = x.pai
+        if x.pai is None:
+            self.raiz = y
+        elif x is x.pai.direita:
+            x.pai.direita = y
+        else:
+            x.pai.esquerda = y
+        y.direita = x
+        x.pai = y
+        self.rotacoes += 1
+
+    def inserir(self, chave):
+        pai = None
+        no = self.raiz
+        while no:
+            pai = no
+            if chave < no.chave:
+                no = no.esquerda
+            elif chave > no.chave:
+                no = no.direita
+            else:
+                return False
+        z = _NoRN(chave, pai)
+        if pai is None:
+            self.raiz = z
+        elif chave < pai.chave:
+            pai.esquerda = z
+        else:
+            pai.direita = z
+        self._n += 1
+        self._corrigir_insercao(z)
+        return True
+
+    def _corrigir_insercao(self, z):
+        while _vermelho(z.pai):
+            p = z.pai
+            g = p.pai  # existe: a raiz e sempre preta
+            if p is g.esquerda:
+                tio = g.direita
+                if _vermelho(tio):
+                    p.vermelho = tio.vermelho = False
+                    g.vermelho = True
+                    z = g
+                    continue
+                if z is p.direita:
+                    z = p
+                    self._rotacao_esquerda(z)
+                    p = z.pai
+                p.vermelho = False
+                g.vermelho = True
+                self._rotacao_direita(g)
+            else:
+                tio = g.esquerda
+                if _vermelho(tio):
+                    p.vermelho = tio.vermelho = False
+                    g.vermelho = True
+                    z = g
+                    continue
+                if z is p.esquerda:
+                    z = p
+                    self._rotacao_direita(z)
+                    p = z.pai
+                p.vermelho = False
+                g.vermelho = True
+                self._rotacao_esquerda(g)
+        self.raiz.vermelho = False
+
+    def deletar(self, chave):
+        z = self.raiz
+        while z and z.chave != chave:
+            z = z.esquerda if chave < z.chave else z.direita
+        if z is None:
+            return False
+        if z.esquerda and z.direita:
+            # copia o sucessor e remove o no dele
+            s = z.direita
+            while s.esquerda:
+                s = s.esquerda
+            z.chave = s.chave
+            z = s
+        filho = z.esquerda or z.direita
+        pai = z.pai
+        if filho:
+            filho.pai = pai
+        if pai is None:
+            self.raiz = filho
+        elif z is pai.esquerda:
+            pai.esquerda = filho
+        else:
+            pai.direita = filho
+        self._n -= 1
+        if not z.vermelho:
+            self._corrigir_remocao(filho, pai)
+        return True
+
+    def _corrigir_remocao(self, x, pai):
+        # x (talvez None) carrega um preto extra; `pai` e o pai dele
+        while x is not self.raiz and not _vermelho(x):
+            if x is pai.esquerda:
+                w = pai.direita  # existe: o lado de x perdeu um preto
+                if w.vermelho:
+                    w.vermelho = False
+                    pai.vermelho = True
+                    self._rotacao_esquerda(pai)
+                    w = pai.direita
+                if not _vermelho(w.esquerda) and not _vermelho(w.direita):
+                    w.vermelho = True
+                    x = pai
+                    pai = x.pai
+                    continue
+                if not _vermelho(w.direita):
+                    w.esquerda.vermelho = False
+                    w.vermelho = True
+                    self._rotacao_direita(w)
+                    w = pai.direita
+                w.vermelho = pai.vermelho
+                pai.vermelho = False
+                w.direita.vermelho = False
+                self._rotacao_esquerda(pai)
+            else:
+                w = pai.esquerda
+                if w.vermelho:
+                    w.vermelho = False
+                    pai.vermelho = True
+                    self._rotacao_direita(pai)
+                    w = pai.esquerda
+                if not _vermelho(w.esquerda) and not _vermelho(w.direita):
+                    w.vermelho = True
+                    x = pai
+                    pai = x.pai
+                    continue
+                if not _vermelho(w.esquerda):
+                    w.direita.vermelho = False
+                    w.vermelho = True
+                    self._rotacao_esquerda(w)
+                    w = pai.esquerda
+                w.vermelho = pai.vermelho
+                pai.vermelho = False
+                w.esquerda.vermelho = False
+                self._rotacao_direita(pai)
+            x = self.raiz
+        if x:
+            x.vermelho = False
+
+
+# -------------------------------
+# Treap: BST pelas chaves e heap (maximo no topo) por prioridades aleatorias
+# -------------------------------
+class _NoTreap:
+    __slots__ = ("chave", "prioridade", "esquerda", "direita")
+
+    def __init__(self, chave, prioridade):
+        self.chave = chave
+        self.prioridade = prioridade
+        self.esquerda = None
+        self.direita = None
+
+
+class ConjuntoTreap(ConjuntoOrdenado):
+    nome = "treap"
+
+    def __init__(self, seed=None):
+        super().__init__()
+        self.raiz = None
+        self._aleatorio = random.Random(seed).random
+
+    def inserir(self, chave):
+        # desce guardando o caminho e sobe rotacionando enquanto a
+        # prioridade do novo no for maior que a do pai
+        caminho = []
+        no = self.raiz
+        while no:
+            if chave == no.chave:
+                return False
+            caminho.append(no)
+            no = no.esquerda if chave < no.chave else no.direita
+        novo = _NoTreap(chave, self._aleatorio())
+        self._n += 1
+        if not caminho:
+            self.raiz = novo
+            return True
+        pai = caminho[-1]
+        if chave < pai.chave:
+            pai.esquerda = novo
+        else:
+            pai.direita = novo
+        while caminho and caminho[-1].prioridade < novo.prioridade:
+            pai = caminho.pop()
+            if chave < pai.chave:
+                pai.esquerda = novo.direita
+                novo.direita = pai
+            else:
+                pai.direita = novo.esquerda
+                novo.esquerda = pai
+            self.rotacoes += 1
+        self._religar(caminho, novo)
+        return True
+
+    def _religar(self, caminho, filho):
+        # liga `filho` ao ultimo no de `caminho` (ou a raiz)
+        if not caminho:
+            self.raiz = filho
+        elif filho.chave < caminho[-1].chave:
+            caminho[-1].esquerda = filho
+        else:
+            caminho[-1].direita = filho
+
+    def deletar(self, chave):
+        caminho = []
+        no = self.raiz
+        while no and no.chave != chave:
+            caminho.append(no)
+            no = no.esquerda if chave < no.chave else no.direita
+        if no is None:
+            return False
+        # desce o no rotacionando com o filho de maior prioridade
+        while no.esquerda and no.direita:
+            if no.esquerda.prioridade > no.direita.prioridade:
+                filho = no.esquerda
+                no.esquerda = filho.direita
+                filho.direita = no
+            else:
+                filho = no.direita
+                no.direita = filho.esquerda
+                filho.esquerda = no
+            self.rotacoes += 1
+            self._religar(caminho, filho)
+            caminho.append(filho)
+        resto = no.esquerda or no.direita
+        if not caminho:
+            self.raiz = resto
+        elif caminho[-1].esquerda is no:
+            caminho[-1].esquerda = resto
+        else:
+            caminho[-1].direita = resto
+        self._n -= 1
+        return True
+
+
+# -------------------------------
+# Splay (top-down, Sleator-Tarjan): cada acesso traz a chave para a raiz,
+# entao chaves consultadas com frequencia ficam perto do topo. A busca
+# tambem reestrutura a arvore.
+# -------------------------------
+class _NoSplay:
+    __slots__ = ("chave", "esquerda", "direita")
+
+    def __init__(self, chave):
+        self.chave = chave
+        self.esquerda = None
+        self.direita = None
+
+
+class ConjuntoSplay(ConjuntoOrdenado):
+    nome = "splay"
+
+    def __init__(self):
+        super().__init__()
+        self.raiz = None
+
+    def _splay(self, chave):
+        t = self.raiz
+        if t is None:
+            return
+        cabeca = _NoSplay(None)
+        menores = maiores = cabeca
+        while True:
+            if chave < t.chave:
+                if t.esquerda is None:
+                    break
+                if chave < t.esquerda.chave:
+                    y = t.esquerda
+                    t.esquerda = y.direita
+                    y.direita = t
+                    t = y
+                    self.rotacoes += 1
+                    if t.esquerda is None:
+                        break
+                maiores.esquerda = t
+                maiores = t
+                t = t.esquerda
+            elif chave > t.chave:
+                if t.direita is None:
+                    break
+                if chave > t.direita.chave:
+                    y = t.direita
+                    t.direita = y.esquerda
+                    y.esquerda = t
+                    t = y
+                    self.rotacoes += 1
+                    if t.direita is None:
+                        break
+                menores.direita = t
+                menores = t
+                t = t.direita
+            else:
+                break
+        menores.direita = t.esquerda
+        maiores.esquerda = t.direita
+        t.esquerda = cabeca.direita
+        t.direita = cabeca.esquerda
+        self.raiz = t
+
+    def __contains__(self, chave):
+        self._splay(chave)
+        return self.raiz is not None and self.raiz.chave == chave
+
+    def inserir(self, chave):
+        self._splay(chave)
+        raiz = self.raiz
+        if raiz is not None and raiz.chave == chave:
+            return False
+        novo = _NoSplay(chave)
+        if raiz is not None:
+            if chave < raiz.chave:
+                novo.esquerda = raiz.esquerda
+                novo.direita = raiz
+                raiz.esquerda = None
+            else:
+                novo.direita = raiz.direita
+                novo.esquerda = raiz
+                raiz.direita = None
+        self.raiz = novo
+        self._n += 1
+        return True
+
+    def deletar(self, chave):
+        self._splay(chave)
+        raiz = self.raiz
+        if raiz is None or raiz.chave != chave:
+            return False
+        if raiz.esquerda is None:
+            self.raiz = raiz.direita
+        else:
+            direita = raiz.direita
+            self.raiz = raiz.esquerda
+            self._splay(chave)  # maior chave da esquerda sobe, sem filho direito
+            self.raiz.direita = direita
+        self._n -= 1
+        return True
+
+
+# Estrategias disponiveis por nome
+ESTRATEGIAS = {cls.nome: cls for cls in
+               (ConjuntoAVL, ConjuntoRubroNegro, ConjuntoTreap, ConjuntoSplay)}
+
+
+def criar_conjunto(nome, *args, **kwargs):
+    """Cria um conjunto ordenado vazio da estrategia `nome` (ver ESTRATEGIAS)."""
+    try:
+        cls = ESTRATEGIAS[nome]
+    except KeyError:
+        raise ValueError(f"Estratégia desconhecida: {nome!r} "
+                         f"(opções: {', '.join(ESTRATEGIAS)})") from None
+    return cls(*args, **kwargs)
+
+
+# -------------------------------
+# Benchmark: cada estrategia em cargas diferentes
+# -------------------------------
+def _cargas(n, rng):
+    chaves = rng.sample(range(n * 10), n)
+    populares = rng.sample(chaves, max(1, n // 100))
+    pesos = [1 / (i + 1) for i in range(len(populares))]
+    consultas = rng.choices(populares, weights=pesos, k=n)
+    mistura = [(rng.random() < 0.5, rng.randrange(n * 10)) for _ in range(n)]
+
+    def insercao_aleatoria(conjunto):
+        for c in chaves:
+            conjunto.inserir(c)
+
+    def insercao_ordenada(conjunto):
+        for c in range(n):
+            conjunto.inserir(c)
+
+    def escrita_intensa(conjunto):
+        for c in chaves[: n // 2]:
+            conjunto.inserir(c)
+        for insere, c in mistura:
+            if insere:
+                conjunto.inserir(c)
+            else:
+                conjunto.deletar(c)
+
+    def leitura_enviesada(conjunto):
+        for c in chaves:
+            conjunto.inserir(c)
+        conjunto.rotacoes = 0  # conta apenas a fase de leitura
+        for c in consultas:
+            c in conjunto
+
+    return [("inserção aleatória", insercao_aleatoria),
+            ("inserção ordenada", insercao_ordenada),
+            ("escrita intensa", escrita_intensa),
+            ("leitura enviesada", leitura_enviesada)]
+
+
+def benchmark_estrategias(n=100000, seed=0):
+    rng = random.Random(seed)
+    print(f"n={n}: tempo (s) e rotações por estratégia")
+    print(f"{'carga':20s}" + "".join(f" {nome:>22s}" for nome in ESTRATEGIAS) + "  mais rápida")
+    for carga, executar in _cargas(n, rng):
+        linha = f"{carga:20s}"
+        tempos = {}
+        for nome in ESTRATEGIAS:
+            conjunto = criar_conjunto(nome)
+            t0 = time.perf_counter()
+            executar(conjunto)
+            tempos[nome] = time.perf_counter() - t0
+            linha += f" {tempos[nome]:8.2f} {conjunto.rotacoes:9d} rot"
+        print(linha + "  " + min(tempos, key=tempos.get))
+
+
+if __name__ == "__main__":
+    benchmark_estrategias(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
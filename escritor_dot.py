@@ -0,0 +1,193 @@
+# escritor_dot.py
+# Escrita iterativa de DOT direto para arquivo, para arvores grandes demais
+# para montar um graphviz.Digraph em memoria. Cada no recebe um id unico
+# (n0, n1, ...), entao valores repetidos nao se fundem no desenho.
+#
+# Nivel de detalhe:
+#   profundidade_maxima  nos abaixo dessa profundidade viram um no-resumo
+#                        por subarvore, com tamanho e altura
+#   amostra              probabilidade (0, 1] de expandir cada filho (ao
+#                        menos um por no); os demais viram resumos.
+#                        Semente fixa: a mesma amostra a cada chamada
+#   max_nos              limite (aproximado) de nos desenhados; ao
+#                        atingi-lo o resto vira resumo
+
+import io
+import os
+import random
+import sys
+import time
+
+# nomes dos campos em cada familia de nos do repositorio
+_CAMPOS = (("value", "left", "right"), ("chave", "esquerda", "direita"))
+
+
+def _campos(no):
+    for campos in _CAMPOS:
+        if hasattr(no, campos[0]):
+            return campos
+    raise TypeError(f"Nó sem campos reconhecidos: {type(no).__name__}")
+
+
+def _resumo(no, esq, dir_):
+    """(quantidade de nos, altura em niveis) da subarvore de `no`."""
+    # usa os campos aumentados quando a convencao e conhecida; no
+    # MultiConjuntoAVL (com `contagem`) `tamanho` soma ocorrencias, nao nos
+    if hasattr(no, "tamanho") and hasattr(no, "altura") and not hasattr(no, "contagem"):
+        return no.tamanho, no.altura                # Atividade_5: folha = 1
+    if hasattr(no, "size") and hasattr(no, "height"):
+        return no.size, no.height + 1               # Atividade_2: folha = 0
+    tamanho = 0
+    altura = 0
+    pilha = [(no, 1)]
+    while pilha:
+        n, nivel = pilha.pop()
+        tamanho += 1
+        if nivel > altura:
+            altura = nivel
+        for filho in (getattr(n, esq), getattr(n, dir_)):
+            if filho is not None:
+                pilha.append((filho, nivel + 1))
+    return tamanho, altura
+
+
+def _escapar(texto):
+    return texto.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def escrever_dot(raiz, destino, profundidade_maxima=None, amostra=None, max_nos=None,
+                 seed=0, rotulo=str, forma="circle"):
+    """
+    Escreve o DOT da arvore em `destino` (caminho ou arquivo texto aberto),
+    sem recursao e sem guardar o grafo em memoria. Retorna a quantidade de
+    nos desenhados (resumos incluidos).
+    """
+    if amostra is not None and not 0 < amostra <= 1:
+        raise ValueError("amostra deve estar em (0, 1]")
+    if isinstance(destino, (str, bytes)) or hasattr(destino, "__fspath__"):
+        with open(destino, "w", encoding="utf-8", buffering=1 << 16) as f:
+            return _escrever(raiz, f, profundidade_maxima, amostra, max_nos, seed, rotulo, forma)
+    return _escrever(raiz, destino, profundidade_maxima, amostra, max_nos, seed, rotulo, forma)
+
+
+def dot_texto(raiz, **opcoes):
+    """Mesmo que escrever_dot, devolvendo o texto."""
+    buffer = io.StringIO()
+    escrever_dot(raiz, buffer, **opcoes)
+    return buffer.getvalue()
+
+
+def _escrever(raiz, f, profundidade_maxima, amostra, max_nos, seed, rotulo, forma):
+    escrever = f.write
+    escrever("digraph {\n")
+    escrever(f"\tnode [shape={forma}]\n")
+    desenhados = 0
+    if raiz is not None:
+        valor, esq, dir_ = _campos(raiz)
+        sortear = random.Random(seed).random if amostra is not None else None
+        # (no, profundidade, id do pai ou -1, resumir?)
+        pilha = [(raiz, 0, -1, False)]
+        while pilha:
+            no, profundidade, pai, resumir = pilha.pop()
+            i = desenhados
+            desenhados += 1
+            if pai >= 0:
+                escrever(f"\tn{pai} -> n{i}\n")
+            if resumir or (max_nos is not None and desenhados >= max_nos and
+                           (getattr(no, esq) is not None or getattr(no, dir_) is not None)):
+                tamanho, altura = _resumo(no, esq, dir_)
+                ocorrencias = (f"\\n{no.tamanho} ocorrências"
+                               if hasattr(no, "contagem") else "")
+                escrever(f'\tn{i} [label="{tamanho} nós{ocorrencias}\\naltura {altura}",'
+                         f' shape=box, style="rounded,dashed"]\n')
+                continue
+            escrever(f'\tn{i} [label="{_escapar(rotulo(getattr(no, valor)))}"]\n')
+            filhos = [f for f in (getattr(no, esq), getattr(no, dir_)) if f is not None]
+            if not filhos:
+                continue
+            if profundidade_maxima is not None and profundidade + 1 > profundidade_maxima:
+                resumir_filhos = [True] * len(filhos)
+            elif sortear is not None:
+                # cada filho e expandido com probabilidade `amostra`, mas ao
+                # menos um sempre e, para a amostra chegar as folhas
+                resumir_filhos = [sortear() >= amostra for _ in filhos]
+                if all(resumir_filhos):
+                    resumir_filhos[int(sortear() * len(filhos))] = False
+            else:
+                resumir_filhos = [False] * len(filhos)
+            # empilhados da direita para a esquerda: pre-ordem esquerda primeiro
+            for filho, resumir_filho in zip(reversed(filhos), reversed(resumir_filhos)):
+                if resumir_filho and getattr(filho, esq) is None and getattr(filho, dir_) is None:
+                    resumir_filho = False  # uma folha e mais legivel que um resumo de 1 no
+                pilha.append((filho, profundidade + 1, i, resumir_filho))
+    escrever("}\n")
+    return desenhados
+
+
+def renderizar_dot(raiz, filename, formato="png", **opcoes):
+    """
+    Escreve `filename`.gv com escrever_dot e renderiza `filename`.`formato`
+    com o Graphviz, apagando o .gv no fim (como render(cleanup=True)).
+    """
+    import graphviz
+
+    fonte = f"{filename}.gv"
+    escrever_dot(raiz, fonte, **opcoes)
+    try:
+        return graphviz.render("dot", formato, fonte, outfile=f"{filename}.{formato}")
+    finally:
+        os.remove(fonte)
+
+
+# -------------------------------
+# Benchmark: Digraph recursivo x escrita em fluxo
+# -------------------------------
+def benchmark_escritor(n=200000, seed=0):
+    import tempfile
+    import tracemalloc
+    from Atividade_4 import AVLTree
+
+    valores = random.Random(seed).sample(range(n * 10), n)
+    arvore = AVLTree()
+    for v in valores:
+        arvore.insert_iterative(v)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        from graphviz import Digraph
+
+        def via_digraph():
+            dot = Digraph()
+            arvore._add_nodes(dot, arvore.root)
+            with open(os.path.join(pasta, "digraph.gv"), "w", encoding="utf-8") as f:
+                f.write(dot.source)
+
+        t0 = time.perf_counter()
+        via_digraph()
+        t_digraph = time.perf_counter() - t0
+        tracemalloc.start()
+        via_digraph()
+        pico_digraph = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        casos = [("fluxo completo", {}),
+                 ("profundidade_maxima=8", {"profundidade_maxima": 8}),
+                 ("amostra=0.3", {"amostra": 0.3}),
+                 ("max_nos=2000", {"max_nos": 2000})]
+        print(f"n={n} (AVLTree)")
+        print(f"{'Digraph + _add_nodes':24s} {t_digraph:6.2f} s  pico {pico_digraph / 2**20:7.1f} MiB")
+        for nome, opcoes in casos:
+            caminho = os.path.join(pasta, "fluxo.gv")
+            t0 = time.perf_counter()
+            desenhados = escrever_dot(arvore.root, caminho, **opcoes)
+            elapsed = time.perf_counter() - t0
+            # memoria medida a parte: tracemalloc encarece cada alocacao
+            tracemalloc.start()
+            escrever_dot(arvore.root, caminho, **opcoes)
+            pico = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{nome:24s} {elapsed:6.2f} s  pico {pico / 2**20:7.1f} MiB"
+                  f"  {desenhados} nós, {os.path.getsize(caminho) / 2**20:.1f} MiB de DOT")
+
+
+if __name__ == "__main__":
+    benchmark_escritor(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,374 @@
+# gravador_arvore.py
+# Gravador de snapshots para os visualizadores Graphviz (Atividade_1 a 4).
+# Durante as operacoes, `capturar` guarda so a diferenca estrutural em
+# relacao ao quadro anterior (nos cujo rotulo/filhos mudaram), visitando
+# so o caminho da operacao quando recebe a chave operada; no fim,
+# `renderizar` gera o DOT de cada quadro, renderiza cada texto DOT distinto
+# uma unica vez (cache por hash, inclusive entre execucoes) num pool de
+# processos, e `animar` junta os quadros num GIF.
+# Requisitos: Graphviz (`dot` no PATH); animacao: pip install pillow
+
+import hashlib
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# nomes dos campos em cada familia de nos do repositorio
+_CAMPOS = (("value", "left", "right"), ("chave", "esquerda", "direita"))
+
+
+def _campos(no):
+    for campos in _CAMPOS:
+        if hasattr(no, campos[0]):
+            return campos
+    raise TypeError(f"Nó sem campos reconhecidos: {type(no).__name__}")
+
+
+class GravadorArvore:
+    """
+    Guarda a sequencia de estados de uma arvore como diferencas.
+    Cada no recebe um id estavel pela identidade do objeto; o estado de um
+    quadro e {id: (rotulo, id_esquerda, id_direita)} mais o id da raiz.
+    O gravador so referencia os nos presentes no ultimo estado: um no que
+    sai da arvore e esquecido (se voltar, ganha um id novo).
+    """
+    def __init__(self):
+        self._ids = {}        # id(objeto) -> id estavel
+        self._objetos = {}    # id estavel -> objeto (impede reuso de id(objeto))
+        self._proximo = 0
+        self._estado = {}
+        self._raiz = None
+        self.diferencas = []  # por quadro: (raiz, alterados, removidos)
+        self.titulos = []
+
+    def __len__(self):
+        return len(self.diferencas)
+
+    def _id(self, no):
+        k = self._ids.get(id(no))
+        if k is None:
+            k = self._ids[id(no)] = self._proximo
+            self._objetos[k] = no
+            self._proximo += 1
+        return k
+
+    def _esquecer(self, k):
+        no = self._objetos.pop(k)
+        del self._ids[id(no)]
+
+    def capturar(self, raiz, titulo=None, chaves=None):
+        """
+        Registra o estado atual da arvore com raiz `raiz`.
+
+        Sem `chaves`, percorre a arvore inteira (O(n)). Com `chaves` (as
+        chaves da operacao que acabou de acontecer numa arvore de busca) so
+        desce pelo caminho de busca de cada chave e pelos nos novos ou
+        alterados: O(altura) numa insercao ou remocao com rotacoes, em que
+        todo no alterado esta nesses caminhos ou pendurado neles por outros
+        nos alterados. Um rotulo novo (sucessor copiado na remocao) tambem
+        e seguido para baixo.
+        """
+        anterior = self._estado
+        if raiz is None or chaves is None or not anterior:
+            alterados, removidos = self._capturar_tudo(raiz)
+        else:
+            alterados, removidos = self._capturar_caminhos(raiz, tuple(chaves))
+        for k in removidos:
+            del anterior[k]
+            self._esquecer(k)
+        anterior.update(alterados)
+        self._raiz = self._id(raiz) if raiz is not None else None
+        self.diferencas.append((self._raiz, alterados, removidos))
+        self.titulos.append(titulo if titulo is not None else f"quadro {len(self.titulos)}")
+
+    def _registro(self, no, esq, dir_, valor):
+        filho_esq = getattr(no, esq)
+        filho_dir = getattr(no, dir_)
+        return (str(getattr(no, valor)),
+                self._id(filho_esq) if filho_esq is not None else None,
+                self._id(filho_dir) if filho_dir is not None else None)
+
+    def _capturar_tudo(self, raiz):
+        estado = {}
+        if raiz is not None:
+            valor, esq, dir_ = _campos(raiz)
+            pilha = [raiz]
+            while pilha:
+                no = pilha.pop()
+                estado[self._id(no)] = self._registro(no, esq, dir_, valor)
+                filho_dir = getattr(no, dir_)
+                filho_esq = getattr(no, esq)
+                if filho_dir is not None:
+                    pilha.append(filho_dir)
+                if filho_esq is not None:
+                    pilha.append(filho_esq)
+        anterior = self._estado
+        alterados = {k: v for k, v in estado.items() if anterior.get(k) != v}
+        removidos = [k for k in anterior if k not in estado]
+        return alterados, removidos
+
+    def _capturar_caminhos(self, raiz, chaves):
+        anterior = self._estado
+        valor, esq, dir_ = _campos(raiz)
+        alterados = {}
+        # (no, chaves cujo caminho de busca passa por ele)
+        pilha = [(raiz, chaves)]
+        while pilha:
+            no, buscadas = pilha.pop()
+            k = self._id(no)
+            registro = self._registro(no, esq, dir_, valor)
+            antigo = anterior.get(k)
+            if registro != antigo:
+                alterados[k] = registro
+                if antigo is None or antigo[0] != registro[0]:
+                    buscadas += (getattr(no, valor),)
+            elif not buscadas:
+                continue  # fora dos caminhos e inalterado: subarvore igual
+            rotulo = getattr(no, valor)
+            filho_dir = getattr(no, dir_)
+            filho_esq = getattr(no, esq)
+            # chave igual ao rotulo segue pelos dois lados (antecessor/sucessor)
+            if filho_dir is not None:
+                pilha.append((filho_dir, tuple(c for c in buscadas if not c < rotulo)))
+            if filho_esq is not None:
+                pilha.append((filho_esq, tuple(c for c in buscadas if not rotulo < c)))
+
+        # nos que sairam: filhos antigos de nos alterados (e a raiz antiga)
+        # que nenhum registro novo referencia, e recursivamente os filhos deles
+        referenciados = {self._id(raiz)}
+        for registro in alterados.values():
+            referenciados.update(registro[1:])
+        candidatos = [f for k, registro in alterados.items() if k in anterior
+                      for f in anterior[k][1:] if f is not None]
+        if self._raiz is not None:
+            candidatos.append(self._raiz)
+        removidos = []
+        vistos = set()
+        while candidatos:
+            k = candidatos.pop()
+            if k in referenciados or k in vistos or k not in anterior:
+                continue
+            vistos.add(k)
+            removidos.append(k)
+            candidatos.extend(f for f in anterior[k][1:] if f is not None)
+        return alterados, removidos
+
+    def ouvinte(self, arvore, repassar=None):
+        """
+        Listener para AVLTree (Atividade_4): captura um quadro ao fim de cada
+        operacao, descendo so pelo caminho da chave operada, e repassa os
+        eventos a outro listener, se houver.
+        """
+        return _OuvinteGravador(self, arvore, repassar)
+
+    def _iterar_estados(self):
+        # o mesmo dicionario, atualizado a cada quadro (uso interno)
+        estado = {}
+        for raiz, alterados, removidos in self.diferencas:
+            for k in removidos:
+                del estado[k]
+            estado.update(alterados)
+            yield raiz, estado
+
+    def iterar_quadros(self):
+        """
+        Reconstroi os estados (raiz, nos) reaplicando as diferencas. Cada
+        quadro e um dicionario proprio, que pode ser guardado.
+        """
+        for raiz, estado in self._iterar_estados():
+            yield raiz, dict(estado)
+
+    def iterar_dot(self):
+        for raiz, estado in self._iterar_estados():
+            yield dot_do_estado(raiz, estado)
+
+    def renderizar(self, pasta, formato="png", processos=None, cache=None, comando="dot"):
+        """
+        Renderiza todos os quadros em `pasta` (quadro_00000.png, ...) e
+        grava `quadros.json` com titulo e arquivo de cada um. Textos DOT
+        iguais sao renderizados uma vez; `cache` (padrao: pasta/.cache)
+        guarda os resultados por hash e pode ser compartilhado entre
+        execucoes. Retorna (lista de arquivos, quantidade renderizada).
+        """
+        if shutil.which(comando) is None:
+            raise RuntimeError(f"Graphviz não encontrado: `{comando}` não está no PATH")
+        cache = cache or os.path.join(pasta, ".cache")
+        os.makedirs(cache, exist_ok=True)
+
+        hashes = []
+        pendentes = {}  # hash -> texto DOT ainda sem arquivo em cache
+        for texto in self.iterar_dot():
+            h = hashlib.sha1(texto.encode("utf-8")).hexdigest()
+            hashes.append(h)
+            if h not in pendentes and not os.path.exists(os.path.join(cache, f"{h}.{formato}")):
+                pendentes[h] = texto
+
+        if pendentes:
+            tarefas = [(texto, os.path.join(cache, f"{h}.{formato}"), formato, comando)
+                       for h, texto in pendentes.items()]
+            if processos == 1 or len(tarefas) == 1:
+                for tarefa in tarefas:
+                    _executar_dot(tarefa)
+            else:
+                with ProcessPoolExecutor(max_workers=processos) as pool:
+                    # chunksize alto reduz o custo de IPC com muitos quadros pequenos
+                    list(pool.map(_executar_dot, tarefas,
+                                  chunksize=max(1, len(tarefas) // (4 * (os.cpu_count() or 1)))))
+
+        arquivos = []
+        for i, h in enumerate(hashes):
+            destino = os.path.join(pasta, f"quadro_{i:05d}.{formato}")
+            _ligar(os.path.join(cache, f"{h}.{formato}"), destino)
+            arquivos.append(destino)
+        with open(os.path.join(pasta, "quadros.json"), "w", encoding="utf-8") as f:
+            json.dump([{"arquivo": os.path.basename(a), "titulo": t}
+                       for a, t in zip(arquivos, self.titulos)], f, indent=1, ensure_ascii=False)
+        return arquivos, len(pendentes)
+
+
+class _OuvinteGravador:
+    def __init__(self, gravador, arvore, repassar):
+        self.gravador = gravador
+        self.arvore = arvore
+        self.repassar = repassar
+        self._chaves = None
+
+    def on_value(self, op, value):
+        self._chaves = (value,)
+        if self.repassar is not None and hasattr(self.repassar, "on_value"):
+            self.repassar.on_value(op, value)
+
+    def on_rotation(self, direction, value):
+        if self.repassar is not None:
+            self.repassar.on_rotation(direction, value)
+
+    def on_operation(self, op, path_length, comparisons, rotations, rebalances):
+        if self.repassar is not None:
+            self.repassar.on_operation(op, path_length, comparisons, rotations, rebalances)
+        # insert_value avisa depois de atualizar a raiz; no motor iterativo
+        # a raiz ja esta religada quando _report e chamado
+        chaves, self._chaves = self._chaves, None
+        self.gravador.capturar(self.arvore.root, f"{op} #{len(self.gravador)}", chaves)
+
+
+def dot_do_estado(raiz, estado):
+    """
+    Texto DOT de um quadro. Os ids do DOT seguem a pre-ordem, entao arvores
+    com a mesma forma e rotulos geram exatamente o mesmo texto (e o mesmo
+    hash no cache), independente dos objetos que as compoem.
+    """
+    linhas = ["digraph {"]
+    if raiz is not None:
+        numero = {}
+        pilha = [(raiz, None)]
+        while pilha:
+            k, pai = pilha.pop()
+            i = numero[k] = len(numero)
+            rotulo, esq, dir_ = estado[k]
+            rotulo = rotulo.replace("\\", "\\\\").replace('"', '\\"')
+            linhas.append(f'\tn{i} [label="{rotulo}"]')
+            if pai is not None:
+                linhas.append(f"\tn{pai} -> n{i}")
+            if dir_ is not None:
+                pilha.append((dir_, i))
+            if esq is not None:
+                pilha.append((esq, i))
+    linhas.append("}")
+    return "\n".join(linhas) + "\n"
+
+
+def _executar_dot(tarefa):
+    # roda no processo do pool: grava num temporario e renomeia, para que
+    # um arquivo em cache nunca fique pela metade
+    texto, caminho, formato, comando = tarefa
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    subprocess.run([comando, f"-T{formato}", "-o", temporario],
+                   input=texto.encode("utf-8"), check=True)
+    os.replace(temporario, caminho)
+
+
+def _ligar(origem, destino):
+    # hard link quando possivel (sem copiar bytes); senao copia
+    if os.path.exists(destino):
+        os.remove(destino)
+    try:
+        os.link(origem, destino)
+    except OSError:
+        shutil.copyfile(origem, destino)
+
+
+def animar(arquivos, saida, duracao_ms=500):
+    """Junta os quadros (PNG) num GIF animado. Requer Pillow."""
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ImportError("animar requer Pillow: pip install pillow") from None
+    imagens = [Image.open(a).convert("RGB") for a in arquivos]
+    if not imagens:
+        raise ValueError("animar: nenhum quadro")
+    largura = max(im.width for im in imagens)
+    altura = max(im.height for im in imagens)
+    quadros = []
+    for im in imagens:
+        # quadros de tamanhos diferentes ficam centralizados num fundo branco
+        fundo = Image.new("RGB", (largura, altura), "white")
+        fundo.paste(im, ((largura - im.width) // 2, (altura - im.height) // 2))
+        quadros.append(fundo)
+    quadros[0].save(saida, save_all=True, append_images=quadros[1:],
+                    duration=duracao_ms, loop=0)
+    return saida
+
+
+# -------------------------------
+# Benchmark: visualize() a cada passo x gravador + pool + cache
+# -------------------------------
+def benchmark_gravador(operacoes=500, chaves=40, seed=0):
+    import tempfile
+    from Atividade_4 import AVLTree
+
+    rng = random.Random(seed)
+    gravador = GravadorArvore()
+    arvore = AVLTree()
+    arvore.listener = gravador.ouvinte(arvore)
+    t0 = time.perf_counter()
+    for _ in range(operacoes):
+        # poucas chaves: muitas operacoes nao mudam nada (chave ja presente
+        # ou ausente) e o quadro repete a arvore anterior
+        chave = rng.randrange(chaves)
+        if rng.random() < 0.5:
+            arvore.insert_iterative(chave)
+        else:
+            arvore.delete(chave)
+    t_captura = time.perf_counter() - t0
+    textos = list(gravador.iterar_dot())
+    print(f"{operacoes} operações, captura {t_captura * 1e3:.1f} ms;"
+          f" {len(set(textos))} árvores distintas em {len(textos)} quadros")
+
+    if shutil.which("dot") is None:
+        print("Graphviz (dot) não encontrado: renderização não medida")
+        return
+    with tempfile.TemporaryDirectory() as pasta:
+        t0 = time.perf_counter()
+        for i, texto in enumerate(textos):
+            _executar_dot((texto, os.path.join(pasta, f"seq_{i}.png"), "png", "dot"))
+        t_seq = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        _, renderizados = gravador.renderizar(os.path.join(pasta, "pool"))
+        t_pool = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        gravador.renderizar(os.path.join(pasta, "pool"))
+        t_cache = time.perf_counter() - t0
+    print(f"dot a cada quadro      {t_seq:7.2f} s")
+    print(f"pool + cache           {t_pool:7.2f} s  ({renderizados} renderizações, {t_seq / t_pool:.1f}x)")
+    print(f"de novo, cache cheio   {t_cache:7.2f} s")
+
+
+if __name__ == "__main__":
+    benchmark_gravador(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
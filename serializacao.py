@@ -0,0 +1,527 @@
+# serializacao.py
+# Formato binario versionado para BinarySearchTree (Atividade_2), ArvoreAVL,
+# ArvoreAVLAgregada e MultiConjuntoAVL (Atividade_5), com carga em O(n) ou
+# consulta direta via mmap.
+#
+# Layout (little-endian):
+#   cabecalho (24 bytes): magic b"ARVB", versao u16, tipo u8 (1=BST, 2=AVL),
+#                         tipo da chave u8 ('q' ou 'd'), flags u8,
+#                         tipo do valor u8 (0 = o mesmo da chave), n u64
+#   chaves      n x 8 bytes, em pre-ordem
+#   chaves_int  1 bit por no (so com FLAG_CHAVES_INT): numa coluna 'd' que
+#               mistura int e float, marca as chaves que eram int
+#   valores     n x 8 bytes, em pre-ordem (so AVL com valores diferentes das
+#               chaves)
+#   valores_int 1 bit por no (so com FLAG_VALORES_INT), como chaves_int
+#   contagens   n x u32 (so MultiConjuntoAVL: ocorrencias de cada chave)
+#   tam_esq     n x u32, nos (nao ocorrencias) da subarvore esquerda de cada no
+#   alturas     n x u8 (so AVL; permitem inspecionar o balanceamento sem
+#               reconstruir, a carga recalcula alturas e resumos)
+#   forma       2 bits por no (tem filho esquerdo, tem filho direito)
+#
+# Tipos: uma coluna so de int usa 'q' (64 bits); com algum float usa 'd', e
+# os int dela precisam ter |x| <= 2^53 para voltarem exatos (senao
+# ValueError). A classe da arvore vai nas flags; subclasses que o formato
+# nao representa sao recusadas.
+#
+# Em pre-ordem, o filho esquerdo do no i esta em i + 1 e o direito em
+# i + 1 + tam_esq[i]: isso permite buscar sem desserializar (MappedTree).
+
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+from array import array
+
+MAGIC = b"ARVB"
+VERSAO = 1
+TIPO_BST = 1
+TIPO_AVL = 2
+FLAG_VALORES = 1
+FLAG_CONTAGENS = 2      # MultiConjuntoAVL
+FLAG_CHAVES_INT = 4
+FLAG_VALORES_INT = 8
+FLAG_AGREGADA = 16      # ArvoreAVLAgregada
+_FLAGS_CONHECIDAS = (FLAG_VALORES | FLAG_CONTAGENS | FLAG_CHAVES_INT | FLAG_VALORES_INT
+                     | FLAG_AGREGADA)
+
+_CABECALHO = struct.Struct("<4sHBBBB2xQ4x")
+
+# maior inteiro que um double representa sem perda (e todos abaixo dele)
+_INT_EXATO = 2**53
+
+
+def _coluna(itens, nome):
+    """
+    Converte chaves ou valores numa coluna: (codigo, array, bitmap dos int
+    ou None). So int -> 'q'; com algum float -> 'd' e, se tambem houver
+    int, um bitmap marcando quais eram int para a carga devolve-los como int.
+    """
+    tem_int = tem_float = False
+    for x in itens:
+        if isinstance(x, bool) or not isinstance(x, (int, float)):
+            raise TypeError(f"Formato binario suporta apenas {nome} int ou float,"
+                            f" recebeu {type(x).__name__}")
+        if isinstance(x, float):
+            tem_float = True
+        else:
+            tem_int = True
+    if not tem_float:
+        try:
+            return "q", array("q", itens), None
+        except OverflowError:
+            raise ValueError(f"Formato binario suporta apenas {nome} inteiras de 64 bits") from None
+    bitmap = None
+    if tem_int:
+        bitmap = bytearray((len(itens) + 7) // 8)
+        for i, x in enumerate(itens):
+            if not isinstance(x, float):
+                if not -_INT_EXATO <= x <= _INT_EXATO:
+                    raise ValueError(f"{nome}: o inteiro {x} nao pode ser gravado exato junto"
+                                     " de floats (|x| > 2^53)")
+                bitmap[i >> 3] |= 1 << (i & 7)
+    return "d", array("d", itens), bitmap
+
+
+def _restaurar_int(buf, bitmap):
+    # lista com os int de volta nas posicoes marcadas no bitmap
+    itens = buf.tolist()
+    for i in range(len(itens)):
+        if bitmap[i >> 3] >> (i & 7) & 1:
+            itens[i] = int(itens[i])
+    return itens
+
+
+def _classe_e_flags(tree):
+    # (tipo, flags da classe); so classes que a carga sabe reconstruir
+    from Atividade_2 import BinarySearchTree
+    from Atividade_5 import ArvoreAVL, ArvoreAVLAgregada, MultiConjuntoAVL
+    classes = {BinarySearchTree: (TIPO_BST, 0), ArvoreAVL: (TIPO_AVL, 0),
+               ArvoreAVLAgregada: (TIPO_AVL, FLAG_AGREGADA),
+               MultiConjuntoAVL: (TIPO_AVL, FLAG_CONTAGENS)}
+    try:
+        return classes[type(tree)]
+    except KeyError:
+        raise ValueError(f"dump_tree: {type(tree).__name__} nao e suportada pelo formato"
+                         " (use BinarySearchTree, ArvoreAVL, ArvoreAVLAgregada ou"
+                         " MultiConjuntoAVL)") from None
+
+
+def _secoes(tipo, flags, n):
+    # deslocamento e tamanho de cada secao, na ordem do arquivo
+    pos = _CABECALHO.size
+    secoes = {}
+    bits = (n + 7) // 8
+    for nome, tamanho in (("chaves", 8 * n),
+                          ("chaves_int", bits if flags & FLAG_CHAVES_INT else 0),
+                          ("valores", 8 * n if flags & FLAG_VALORES else 0),
+                          ("valores_int", bits if flags & FLAG_VALORES_INT else 0),
+                          ("contagens", 4 * n if flags & FLAG_CONTAGENS else 0),
+                          ("tam_esq", 4 * n),
+                          ("alturas", n if tipo == TIPO_AVL else 0),
+                          ("forma", (2 * n + 7) // 8)):
+        secoes[nome] = (pos, tamanho)
+        pos += tamanho
+    return secoes, pos
+
+
+def _nos_por_subarvore(raiz):
+    # id(no) -> quantidade de nos da subarvore, em pos-ordem iterativa; usado
+    # no multiconjunto, onde `tamanho` conta ocorrencias
+    tamanhos = {}
+    pilha = [(raiz, False)]
+    while pilha:
+        no, visitado = pilha.pop()
+        if visitado:
+            tamanhos[id(no)] = (1 + tamanhos.get(id(no.esquerda), 0)
+                                + tamanhos.get(id(no.direita), 0))
+            continue
+        pilha.append((no, True))
+        for filho in (no.esquerda, no.direita):
+            if filho is not None:
+                pilha.append((filho, False))
+    return tamanhos
+
+
+def dump_tree(tree, path):
+    """
+    Grava uma BinarySearchTree, ArvoreAVL, ArvoreAVLAgregada ou
+    MultiConjuntoAVL no formato binario (no multiconjunto, um registro por
+    chave distinta com a contagem). Outras classes geram ValueError.
+    """
+    tipo, flags_classe = _classe_e_flags(tree)
+    com_contagens = bool(flags_classe & FLAG_CONTAGENS)
+    if tipo == TIPO_AVL:
+        raiz = tree.raiz
+        chave, esq, dir_ = "chave", "esquerda", "direita"
+    else:
+        raiz = tree.root
+        chave, esq, dir_ = "value", "left", "right"
+    if com_contagens:
+        tamanhos = _nos_por_subarvore(raiz) if raiz is not None else {}
+        tamanho = lambda no: tamanhos[id(no)]
+    elif tipo == TIPO_AVL:
+        tamanho = lambda no: no.tamanho
+    else:
+        tamanho = lambda no: no.size
+    n = tamanho(raiz) if raiz is not None else 0
+    if n >= 2**32:
+        raise ValueError("Formato binario suporta no maximo 2^32 - 1 nos")
+
+    # chaves e valores ficam em listas ate o fim: o tipo de cada coluna
+    # depende de todos os itens, nao so da raiz
+    chaves = []
+    valores = []
+    contagens = array("I")
+    tam_esq = array("I")
+    alturas = array("B")
+    forma = bytearray((2 * n + 7) // 8)
+    com_valores = False
+    i = 0
+    pilha = [raiz] if raiz is not None else []
+    while pilha:
+        no = pilha.pop()
+        k = getattr(no, chave)
+        chaves.append(k)
+        filho_esq = getattr(no, esq)
+        filho_dir = getattr(no, dir_)
+        tam_esq.append(tamanho(filho_esq) if filho_esq is not None else 0)
+        if tipo == TIPO_AVL:
+            alturas.append(no.altura)
+            valores.append(no.valor)
+            com_valores = com_valores or no.valor != k or type(no.valor) is not type(k)
+            if com_contagens:
+                contagens.append(no.contagem)
+        bits = (filho_esq is not None) << 1 | (filho_dir is not None)
+        forma[i >> 2] |= bits << (2 * (i & 3))
+        i += 1
+        if filho_dir is not None:
+            pilha.append(filho_dir)
+        if filho_esq is not None:
+            pilha.append(filho_esq)
+
+    codigo, chaves, chaves_int = _coluna(chaves, "chaves")
+    flags = flags_classe | (FLAG_CHAVES_INT if chaves_int is not None else 0)
+    codigo_valor = 0
+    valores_int = None
+    if com_valores:
+        codigo_valor, valores, valores_int = _coluna(valores, "valores")
+        flags |= FLAG_VALORES | (FLAG_VALORES_INT if valores_int is not None else 0)
+        codigo_valor = ord(codigo_valor)
+    if sys.byteorder != "little":
+        for buf in (chaves, contagens, tam_esq) + ((valores,) if com_valores else ()):
+            buf.byteswap()
+    with open(path, "wb") as f:
+        f.write(_CABECALHO.pack(MAGIC, VERSAO, tipo, ord(codigo), flags, codigo_valor, n))
+        f.write(chaves.tobytes())
+        if chaves_int is not None:
+            f.write(bytes(chaves_int))
+        if com_valores:
+            f.write(valores.tobytes())
+            if valores_int is not None:
+                f.write(bytes(valores_int))
+        f.write(contagens.tobytes())
+        f.write(tam_esq.tobytes())
+        f.write(alturas.tobytes())
+        f.write(bytes(forma))
+
+
+def _ler_cabecalho(dados):
+    if len(dados) < _CABECALHO.size:
+        raise ValueError("Arquivo truncado: cabecalho incompleto")
+    magic, versao, tipo, codigo, flags, codigo_valor, n = _CABECALHO.unpack_from(dados, 0)
+    if magic != MAGIC:
+        raise ValueError("Arquivo nao esta no formato ARVB")
+    if versao != VERSAO:
+        raise ValueError(f"Versao de formato nao suportada: {versao}")
+    if tipo not in (TIPO_BST, TIPO_AVL):
+        raise ValueError(f"Tipo de arvore desconhecido: {tipo}")
+    if flags & ~_FLAGS_CONHECIDAS:
+        raise ValueError(f"Flags desconhecidas no cabecalho: {flags:#x}")
+    codigo = chr(codigo)
+    codigo_valor = chr(codigo_valor) if codigo_valor else codigo
+    if codigo not in "qd" or codigo_valor not in "qd":
+        raise ValueError(f"Tipo de chave/valor desconhecido: {codigo!r}/{codigo_valor!r}")
+    secoes, total = _secoes(tipo, flags, n)
+    if len(dados) < total:
+        raise ValueError("Arquivo truncado")
+    return tipo, codigo, codigo_valor, flags, n, secoes
+
+
+def _secao(dados, secoes, nome, codigo):
+    inicio, tamanho = secoes[nome]
+    buf = array(codigo)
+    buf.frombytes(dados[inicio:inicio + tamanho])
+    if sys.byteorder != "little" and codigo != "B":
+        buf.byteswap()
+    return buf
+
+
+def _coluna_lida(dados, secoes, nome, codigo, com_bitmap):
+    buf = _secao(dados, secoes, nome, codigo)
+    if not com_bitmap:
+        return buf
+    inicio, tamanho = secoes[f"{nome}_int"]
+    return _restaurar_int(buf, dados[inicio:inicio + tamanho])
+
+
+def load_tree(path):
+    """Reconstroi a arvore gravada por dump_tree em O(n), sem reinsercoes."""
+    with open(path, "rb") as f:
+        dados = f.read()
+    tipo, codigo, codigo_valor, flags, n, secoes = _ler_cabecalho(dados)
+    chaves = _coluna_lida(dados, secoes, "chaves", codigo, flags & FLAG_CHAVES_INT)
+    if flags & FLAG_VALORES:
+        valores = _coluna_lida(dados, secoes, "valores", codigo_valor, flags & FLAG_VALORES_INT)
+    else:
+        valores = chaves
+    inicio, tamanho = secoes["forma"]
+    forma = dados[inicio:inicio + tamanho]
+
+    if tipo == TIPO_AVL and flags & FLAG_CONTAGENS:
+        from Atividade_5 import MultiConjuntoAVL
+        arvore = MultiConjuntoAVL()
+        contagens = _secao(dados, secoes, "contagens", "I")
+
+        def novo(i):
+            no = arvore.classe_no(chaves[i], valores[i])
+            no.contagem = contagens[i]
+            return no
+        esq, dir_ = "esquerda", "direita"
+        atualizar = arvore._atualizar_altura
+    elif tipo == TIPO_AVL:
+        from Atividade_5 import ArvoreAVL, ArvoreAVLAgregada
+        arvore = ArvoreAVLAgregada() if flags & FLAG_AGREGADA else ArvoreAVL()
+        novo = lambda i: arvore.classe_no(chaves[i], valores[i])
+        esq, dir_ = "esquerda", "direita"
+        atualizar = arvore._atualizar_altura
+    else:
+        from Atividade_2 import BinarySearchTree, _update
+        arvore = BinarySearchTree()
+        novo = lambda i: arvore.node_class(chaves[i])
+        esq, dir_ = "left", "right"
+        atualizar = _update
+
+    if n == 0:
+        return arvore
+    # pre-ordem: cada no entra na pilha ate receber os filhos indicados na forma
+    nos = [None] * n
+    pendentes = []  # (pai, lado) que ainda esperam um filho
+    for i in range(n):
+        no = novo(i)
+        nos[i] = no
+        if pendentes:
+            pai, lado = pendentes[-1]
+            setattr(pai, lado, no)
+            pendentes.pop()
+        bits = (forma[i >> 2] >> (2 * (i & 3))) & 3
+        if bits & 1:
+            pendentes.append((no, dir_))
+        if bits & 2:
+            pendentes.append((no, esq))
+    # todo filho aparece depois do pai na pre-ordem: percorrer de tras para
+    # frente atualiza altura/tamanho dos filhos antes dos pais
+    for no in reversed(nos):
+        atualizar(no)
+    if tipo == TIPO_AVL:
+        arvore.raiz = nos[0]
+    else:
+        arvore.root = nos[0]
+    return arvore
+
+
+class MappedTree:
+    """
+    Consulta somente leitura direto do arquivo via mmap, sem desserializar:
+    abrir e O(1) e cada busca le O(altura) entradas do arquivo.
+    """
+    def __init__(self, path):
+        self._arquivo = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._arquivo.close()
+            raise
+        try:
+            tipo, codigo, codigo_valor, flags, n, secoes = _ler_cabecalho(self._mmap)
+            if sys.byteorder != "little":
+                raise NotImplementedError("MappedTree requer uma maquina little-endian")
+        except BaseException:
+            self._mmap.close()
+            self._arquivo.close()
+            raise
+        self.tipo = tipo
+        self.n = n
+        visao = memoryview(self._mmap)
+        self._visoes = [visao]
+
+        def fatia(nome, fmt):
+            inicio, tamanho = secoes[nome]
+            v = visao[inicio:inicio + tamanho].cast(fmt)
+            self._visoes.append(v)
+            return v
+
+        self.chaves = fatia("chaves", codigo)
+        self.chaves_int = fatia("chaves_int", "B") if flags & FLAG_CHAVES_INT else None
+        self.valores = fatia("valores", codigo_valor) if flags & FLAG_VALORES else None
+        self.valores_int = fatia("valores_int", "B") if flags & FLAG_VALORES_INT else None
+        self.contagens = fatia("contagens", "I") if flags & FLAG_CONTAGENS else None
+        self.tam_esq = fatia("tam_esq", "I")
+        self.forma = fatia("forma", "B")
+
+    def __len__(self):
+        return self.n
+
+    def _indice(self, chave):
+        chaves, tam_esq, forma = self.chaves, self.tam_esq, self.forma
+        i = 0
+        while self.n:
+            k = chaves[i]
+            if chave == k:
+                return i
+            bits = (forma[i >> 2] >> (2 * (i & 3))) & 3
+            if chave < k:
+                if not bits & 2:
+                    return -1
+                i += 1
+            else:
+                if not bits & 1:
+                    return -1
+                i += 1 + tam_esq[i]
+        return -1
+
+    def search(self, chave):
+        return self._indice(chave) >= 0
+
+    __contains__ = search
+
+    def get(self, chave, default=None):
+        """Valor associado (a propria chave se o arquivo nao tiver valores)."""
+        i = self._indice(chave)
+        if i < 0:
+            return default
+        if self.valores is None:
+            coluna, bitmap = self.chaves, self.chaves_int
+        else:
+            coluna, bitmap = self.valores, self.valores_int
+        valor = coluna[i]
+        if bitmap is not None and bitmap[i >> 3] >> (i & 7) & 1:
+            valor = int(valor)
+        return valor
+
+    def contagem(self, chave):
+        """Ocorrencias da chave (0 se ausente; 1 fora do multiconjunto)."""
+        i = self._indice(chave)
+        if i < 0:
+            return 0
+        return self.contagens[i] if self.contagens is not None else 1
+
+    def close(self):
+        for v in reversed(self._visoes):
+            v.release()
+        self._mmap.close()
+        self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# -------------------------------
+# Benchmark: reconstruir por insercao x load_tree x MappedTree
+# -------------------------------
+def benchmark_serializacao(n=10**6, consultas=10**4, seed=0):
+    from Atividade_5 import ArvoreAVL
+
+    rng = random.Random(seed)
+    chaves = rng.sample(range(n * 4), n)
+    buscas = [rng.randrange(n * 4) for _ in range(consultas)]
+
+    t0 = time.perf_counter()
+    arvore = ArvoreAVL()
+    for c in chaves:
+        arvore.inserir(c)
+    t_inserir = time.perf_counter() - t0
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "arvore.arvb")
+        t0 = time.perf_counter()
+        dump_tree(arvore, caminho)
+        t_dump = time.perf_counter() - t0
+        tamanho = os.path.getsize(caminho)
+
+        t0 = time.perf_counter()
+        carregada = load_tree(caminho)
+        t_load = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        with MappedTree(caminho) as mapeada:
+            t_abrir = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            achados = [mapeada.search(q) for q in buscas]
+            t_buscas = time.perf_counter() - t0
+
+    esperado = [arvore.obter_profundidade_no(q) >= 0 for q in buscas]
+    print(f"n={n}  arquivo {tamanho / 2**20:.1f} MiB ({tamanho / n:.1f} B/no)")
+    print(f"inserção chave a chave  {t_inserir:7.2f} s")
+    print(f"dump_tree               {t_dump:7.2f} s")
+    print(f"load_tree               {t_load:7.2f} s  ({t_inserir / t_load:.1f}x)")
+    print(f"MappedTree (abrir)      {t_abrir * 1e3:7.3f} ms;"
+          f" {consultas} buscas em {t_buscas * 1e3:.1f} ms")
+    print("Resultados iguais:", achados == esperado and len(carregada) == n)
+
+    # ida e volta do multiconjunto: contagens preservadas, tam_esq em nos
+    from Atividade_5 import MultiConjuntoAVL
+    multi = MultiConjuntoAVL()
+    for c in chaves[:consultas]:
+        multi.inserir(c % 1000, vezes=1 + c % 3)
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "multi.arvb")
+        dump_tree(multi, caminho)
+        copia = load_tree(caminho)
+        with MappedTree(caminho) as mapeada:
+            contagens_ok = all(mapeada.contagem(k) == multi.contagem(k) for k in range(1000))
+    print("Multiconjunto (ida e volta):",
+          contagens_ok and list(copia.iterar_intervalo(0, 999)) == list(multi.iterar_intervalo(0, 999)))
+
+    # ida e volta com int e float misturados e inteiros grandes: tipos e
+    # valores exatos, e a classe agregada preservada
+    from Atividade_5 import ArvoreAVL, ArvoreAVLAgregada
+    mista = ArvoreAVL()
+    for k, v in ((1, 0.5), (3, 7), (2**60 + 1, -3), (-(2**53), 2**53), (4, 4.0)):
+        mista.inserir(k, v)
+    chaves_mistas = ArvoreAVL.de_ordenados([-2, 1, 1.5, 2**53])
+    agregada = ArvoreAVLAgregada.de_ordenados([1, 2, 3, 2**60 + 1])
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "mista.arvb")
+        dump_tree(mista, caminho)
+        copia = load_tree(caminho)
+        with MappedTree(caminho) as mapeada:
+            mapeada_ok = all(type(mapeada.get(k)) is type(v) and mapeada.get(k) == v
+                             for k, v in mista.iterar_intervalo(-(2**60), 2**61, com_valores=True))
+        dump_tree(chaves_mistas, caminho)
+        copia_mistas = list(load_tree(caminho).iterar_intervalo(-10, 2**53))
+        dump_tree(agregada, caminho)
+        copia_agregada = load_tree(caminho)
+    pares = list(mista.iterar_intervalo(-(2**60), 2**61, com_valores=True))
+    copiados = list(copia.iterar_intervalo(-(2**60), 2**61, com_valores=True))
+    tipos_ok = ([tuple(map(type, p)) for p in pares] == [tuple(map(type, p)) for p in copiados]
+                and list(map(type, copia_mistas)) == [int, int, float, int])
+    try:
+        dump_tree(ArvoreAVL.de_ordenados([0.5, 2**60 + 1]), os.devnull)
+        recusa_ok = False
+    except ValueError:
+        recusa_ok = True
+    print("Int/float misturados (ida e volta):",
+          pares == copiados and tipos_ok and mapeada_ok and recusa_ok
+          and type(copia_agregada) is ArvoreAVLAgregada
+          and copia_agregada.soma_intervalo(1, 2**61) == agregada.soma_intervalo(1, 2**61))
+
+
+if __name__ == "__main__":
+    benchmark_serializacao(int(sys.argv[1]) if len(sys.argv) > 1 else 10**6)